@@ -7,6 +7,10 @@ pages = [
     st.Page("pages/01_dashboard.py", title="Início", icon="🏠"),
     st.Page("pages/02_analise_exploratoria.py", title="Análise Exploratória", icon="🔎"),
     st.Page("pages/03_analise_agregada.py", title="Análise Agregada", icon="📊"),
+    st.Page("pages/04_escalacao.py", title="Escalação Ideal", icon="🧠"),
+    st.Page("pages/05_desempenho.py", title="Desempenho do Pipeline", icon="⏱️"),
+    st.Page("pages/06_consultas.py", title="Consultas", icon="🧮"),
+    st.Page("pages/07_similares.py", title="Atletas Parecidos", icon="🔁"),
 ]
 
 pg = st.navigation(pages)
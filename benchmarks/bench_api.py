@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Mede o cliente da API contra o servidor fake, sem rede. O cache vai para um diretório temporário.
+os.environ['ESCALAI_API_CACHE'] = tempfile.mkdtemp(prefix='escalai_cache_api_')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import requests
+from src.cartola_api import fetch_json, fetch_many
+from src.cartola_fake import start_server
+
+def timed(label, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<45} {elapsed * 1000 / repeat:8.1f} ms/iteração")
+    return elapsed / repeat
+
+def main(latency=0.02, repeat=5):
+    server = start_server(latency=latency)
+    base_url = server.base_url
+    endpoints = [f"/partidas/{rodada}" for rodada in range(1, 39)]
+    print(f"Servidor fake em {base_url} (latência {latency * 1000:.0f} ms por requisição)")
+
+    print("\n1. /atletas/mercado")
+    timed("requests.get sem sessão (antes)", lambda: requests.get(f"{base_url}/atletas/mercado").json(), repeat)
+    timed("cliente, ttl=0 (revalidação com 304)", lambda: fetch_json('/atletas/mercado', ttl=0, base_url=base_url), repeat)
+    timed("cliente, dentro do ttl (cache em disco)", lambda: fetch_json('/atletas/mercado', ttl=3600, base_url=base_url), repeat)
+
+    print(f"\n2. Lote de {len(endpoints)} endpoints (/partidas/N)")
+    timed("requests.get sequencial sem sessão (antes)",
+          lambda: [requests.get(f"{base_url}{e}").json() for e in endpoints], 1)
+    timed("cliente assíncrono, ttl=0",
+          lambda: fetch_many(endpoints, ttl=0, base_url=base_url), repeat)
+    timed("cliente assíncrono, dentro do ttl",
+          lambda: fetch_many(endpoints, ttl=3600, base_url=base_url), repeat)
+
+    print(f"\nRequisições recebidas pelo servidor: {sum(server.request_counts.values())}")
+    server.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do cliente da API do Cartola contra o servidor fake.")
+    parser.add_argument('--latencia', type=float, default=0.02, help="Latência simulada por requisição (segundos).")
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+    main(latency=args.latencia, repeat=args.repeticoes)
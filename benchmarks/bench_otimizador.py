@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Mede o tempo de solução do otimizador de escalação num mercado sintético do tamanho do real
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.config import FORMATIONS, OPTIMIZER_OBJECTIVES
+from src.cartola_fake import build_market
+from src.otimizador import market_frame, lineup_candidates, optimize_lineup
+
+def synthetic_aggregated(market, seed=0):
+    """Histórico agregado fictício para os atletas de linha do mercado."""
+    rng = np.random.default_rng(seed)
+    jogadores = market[market['posicao'] != 'tec']
+    return pd.DataFrame({
+        'atleta_id': jogadores['atleta_id'].to_numpy(),
+        'media_pontos': jogadores['media_num'].to_numpy() + rng.normal(0, 0.5, len(jogadores)),
+        'std_pontos': rng.uniform(1, 6, len(jogadores)),
+        'jogos_disputados': rng.integers(1, 200, len(jogadores)),
+    })
+
+def main(n_clubs=25, budgets=(100.0, 140.0, 200.0), limit=1.0):
+    market = market_frame(build_market(n_clubs=n_clubs)['atletas'])
+    aggregated = synthetic_aggregated(market)
+    print(f"Mercado sintético: {len(market)} atletas")
+
+    times = []
+    for objective in OPTIMIZER_OBJECTIVES:
+        candidates = lineup_candidates(aggregated, market, objective=objective)
+        for formation in FORMATIONS:
+            for budget in budgets:
+                start = time.perf_counter()
+                lineup = optimize_lineup(candidates, budget, formation)
+                elapsed = time.perf_counter() - start
+                times.append(elapsed)
+                custo = lineup['preco_num'].sum() if lineup is not None else float('nan')
+                print(f"  {objective:<7} {formation}  C$ {budget:6.1f}  {elapsed * 1000:7.1f} ms  (custo C$ {custo:6.2f})")
+
+    print(f"\nTempo de solução: médio {np.mean(times) * 1000:.1f} ms | máximo {np.max(times) * 1000:.1f} ms")
+    if np.max(times) > limit:
+        print(f"ERRO: O tempo máximo passou do limite de {limit:.2f} s.")
+        return False
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do otimizador de escalação.")
+    parser.add_argument('--clubes', type=int, default=25, help="Clubes do mercado sintético (32 atletas por clube).")
+    parser.add_argument('--limite', type=float, default=1.0, help="Tempo máximo aceito por solução (segundos).")
+    args = parser.parse_args()
+    if not main(n_clubs=args.clubes, limit=args.limite):
+        sys.exit(1)
@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Benchmark do pipeline completo com dados sintéticos no formato do caRtola.
+# - Gera arquivos brutos de rodada (mesmas colunas de dados_cartola/raw/2025/rodada-*.csv) em escalas 1x, 10x, 100x.
+# - Roda cada etapa do pipeline e os carregadores das páginas num processo separado, medindo tempo,
+#   pico de memória (RSS) e tamanho das saídas.
+# - Compara com o baseline salvo e falha se alguma medida piorar além do limite.
+#
+#   python benchmarks/bench_pipeline.py --salvar-baseline     # grava o baseline
+#   python benchmarks/bench_pipeline.py                       # compara com ele
+#   python benchmarks/bench_pipeline.py --escalas 1 10 100    # inclui a escala 100x
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'resultados')
+BASELINE_FILE = os.path.join(RESULTS_DIR, 'baseline_pipeline.json')
+LAST_RUN_FILE = os.path.join(RESULTS_DIR, 'ultima_execucao_pipeline.json')
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, 'scripts'))
+
+# Volume real: ~700 atletas por rodada, 38 rodadas, 4 temporadas na janela do pipeline
+SEASONS = [2022, 2023, 2024, 2025]
+ROUNDS = 38
+PLAYERS_PER_ROUND = 700
+CLUBS = ['FLA', 'PAL', 'SAO', 'COR', 'FLU', 'BOT', 'VAS', 'GRE', 'INT', 'CAM',
+         'CRU', 'BAH', 'FOR', 'CEA', 'SAN', 'SPT', 'JUV', 'MIR', 'VIT', 'RBB']
+SCOUTS = ['CA', 'DS', 'FC', 'FD', 'FF', 'FS', 'G', 'SG', 'A', 'I', 'PS', 'FT', 'V', 'CV', 'DE', 'DP', 'GS', 'PP', 'PC', 'GC']
+# Média de cada scout por jogo (os arquivos brutos trazem o acumulado da temporada)
+SCOUT_RATES = [0.1, 1.2, 1.3, 0.5, 0.6, 1.2, 0.1, 0.3, 0.1, 0.2, 0.05, 0.05, 0.02, 0.01, 0.05, 0.02, 0.2, 0.01, 0.02, 0.01]
+RAW_COLUMNS = [
+    '', 'atletas.posicao_id', 'atletas.jogos_num', 'atletas.entrou_em_campo', 'atletas.media_num', 'atletas.apelido',
+    'atletas.variacao_num', 'atletas.clube_id', 'atletas.foto', 'atletas.clube.id.full.name', 'atletas.status_id',
+    'atletas.pontos_num', 'atletas.rodada_id', 'atletas.apelido_abreviado', 'atletas.slug', 'atletas.atleta_id',
+    'atletas.preco_num', 'atletas.nome', *SCOUTS,
+]
+
+# Carregadores usados pelas páginas: (função de src.dados, constante de src.config com o arquivo).
+# As constantes são resolvidas no processo da etapa, depois de ESCALAI_DATA_DIR apontar para os dados sintéticos.
+PAGE_LOADERS = [
+    ('load_parquet_data', 'AGGREGATED_OUTPUT_FILE'),
+    ('load_visualization_table', 'OUTLIERS_OUTPUT_FILE'),
+    ('load_visualization_table', 'BOXPLOT_STATS_FILE'),
+    ('load_visualization_table', 'BOXPLOT_OUTLIERS_FILE'),
+    ('load_visualization_table', 'DENSITY_FILE'),
+    ('load_visualization_table', 'REGRESSION_FILE'),
+]
+PAGE_LOADERS_STEP = 'carregadores_paginas'
+
+# Tolerâncias da comparação: relativa e absoluta (diferenças menores que a absoluta são ruído)
+DEFAULT_THRESHOLD = 0.25
+MIN_TIME_DELTA = 0.25
+MIN_RSS_DELTA_MB = 20
+
+def generate_raw(raw_dir, scale, seed=0):
+    """Gera os arquivos brutos de rodada de SEASONS na escala pedida (scale * PLAYERS_PER_ROUND atletas por rodada)."""
+    rng = np.random.default_rng(seed)
+    n = PLAYERS_PER_ROUND * scale
+    for ano in SEASONS:
+        ids = 100000 + np.arange(n)
+        posicao = rng.choice([1, 2, 3, 4, 5, 6], size=n, p=[0.1, 0.15, 0.18, 0.3, 0.22, 0.05])
+        clube = rng.integers(0, len(CLUBS), size=n)
+        habilidade = rng.gamma(2.0, 1.5, size=n)
+        preco = np.round(2 + habilidade * 2.5 + rng.uniform(0, 3, size=n), 2)
+        jogou = rng.random((ROUNDS, n)) < 0.55
+        pontos = np.round(np.where(jogou, rng.normal(habilidade, 3.5, size=(ROUNDS, n)), 0), 2)
+        incrementos = rng.poisson(np.array(SCOUT_RATES)[None, None, :] * jogou[:, :, None]).astype(np.int16)
+        acumulados = incrementos.cumsum(axis=0)
+        jogos = jogou.cumsum(axis=0)
+        medias = np.round(pontos.cumsum(axis=0) / np.maximum(jogos, 1), 2)
+
+        season_dir = os.path.join(raw_dir, str(ano))
+        os.makedirs(season_dir, exist_ok=True)
+        apelido = np.char.add('Atleta ', ids.astype(str))
+        for r in range(ROUNDS):
+            df = pd.DataFrame({
+                '': np.arange(n),
+                'atletas.posicao_id': posicao,
+                'atletas.jogos_num': jogos[r],
+                'atletas.entrou_em_campo': jogou[r],
+                'atletas.media_num': medias[r],
+                'atletas.apelido': apelido,
+                'atletas.variacao_num': np.round(rng.normal(0, 0.8, size=n), 2),
+                'atletas.clube_id': 262 + clube,
+                'atletas.foto': [f"https://s3.glbimg.com/v1/AUTH_cartola/atletas/{i}_FORMATO.png" for i in ids],
+                'atletas.clube.id.full.name': np.array(CLUBS)[clube],
+                'atletas.status_id': rng.choice([2, 3, 5, 6, 7], size=n, p=[0.1, 0.05, 0.1, 0.15, 0.6]),
+                'atletas.pontos_num': pontos[r],
+                'atletas.rodada_id': r + 1,
+                'atletas.apelido_abreviado': apelido,
+                'atletas.slug': np.char.add('atleta-', ids.astype(str)),
+                'atletas.atleta_id': ids,
+                'atletas.preco_num': preco,
+                'atletas.nome': np.char.add('Nome Completo do Atleta ', ids.astype(str)),
+            })
+            # Como nos arquivos reais, scouts zerados ficam em branco
+            scouts = pd.DataFrame(acumulados[r], columns=SCOUTS).astype(float)
+            df = pd.concat([df, scouts.where(scouts != 0)], axis=1)[RAW_COLUMNS]
+            df.to_csv(os.path.join(season_dir, f"rodada-{r + 1}.csv"), index=False)
+
+def ensure_data(scale):
+    """Diretório de dados da escala; os arquivos brutos são gerados uma vez e reaproveitados."""
+    data_dir = os.path.join(RESULTS_DIR, f"dados_{scale}x")
+    raw_dir = os.path.join(data_dir, 'raw')
+    marker = os.path.join(raw_dir, '.completo')
+    if not os.path.exists(marker):
+        shutil.rmtree(raw_dir, ignore_errors=True)
+        print(f"  - Gerando dados sintéticos {scale}x em '{raw_dir}'...")
+        # Em outro processo: o pico de RSS medido nas etapas herda a memória do processo pai no fork
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--gerar', str(scale), raw_dir], check=True)
+        open(marker, 'w').close()
+    # Execução a frio: descarta as saídas da rodada anterior do benchmark
+    for name in os.listdir(data_dir):
+        if name != 'raw':
+            path = os.path.join(data_dir, name)
+            shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+    return data_dir
+
+def path_size(path):
+    """Tamanho em bytes de um arquivo ou de todos os arquivos de um diretório."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+def run_step(step):
+    """Executa uma etapa (ou os carregadores das páginas) neste processo e imprime o tamanho das saídas em JSON."""
+    if step == PAGE_LOADERS_STEP:
+        import src.config as config
+        import src.dados as dados
+        total = 0
+        for func, constant in PAGE_LOADERS:
+            df = getattr(dados, func)(getattr(config, constant))
+            total += 0 if df is None else int(df.memory_usage(deep=True).sum())
+        print(json.dumps({'ok': True, 'saida_bytes': total}))
+        return True
+
+    import importlib
+    module = importlib.import_module(step)
+    ok = module.run()
+    outputs = [path for path in getattr(module, 'OUTPUTS', []) if os.path.exists(path)]
+    print(json.dumps({'ok': bool(ok), 'saida_bytes': sum(path_size(path) for path in outputs)}))
+    return ok
+
+def measure(step, data_dir):
+    """Roda a etapa num processo novo e mede tempo de parede e pico de RSS (incluindo subprocessos)."""
+    env = {**os.environ, 'ESCALAI_DATA_DIR': data_dir}
+    cmd = [sys.executable, os.path.abspath(__file__), '--executar-etapa', step]
+    with tempfile.TemporaryFile('w+') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT, text=True)
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        log.seek(0)
+        output = log.read()
+
+    result = None
+    for line in reversed(output.splitlines()):
+        if line.startswith('{'):
+            result = json.loads(line)
+            break
+    if proc.returncode != 0 or result is None or not result['ok']:
+        print(output)
+        return None
+    return {'tempo_s': round(elapsed, 3), 'pico_rss_mb': round(usage.ru_maxrss / 1024, 1), 'saida_bytes': result['saida_bytes']}
+
+def compare(results, baseline, threshold):
+    """Lista as medidas que pioraram além do limite em relação ao baseline."""
+    regressions = []
+    for scale, steps in results.items():
+        for step, current in steps.items():
+            base = baseline.get(scale, {}).get(step)
+            if base is None:
+                continue
+            for key, min_delta in (('tempo_s', MIN_TIME_DELTA), ('pico_rss_mb', MIN_RSS_DELTA_MB)):
+                delta = current[key] - base[key]
+                if delta > min_delta and current[key] > base[key] * (1 + threshold):
+                    regressions.append(f"{scale} {step}: {key} {base[key]} -> {current[key]} (+{delta / base[key]:.0%})")
+    return regressions
+
+def main(scales, save_baseline=False, threshold=DEFAULT_THRESHOLD):
+    from run_pipeline import PIPELINE_SCRIPTS
+    steps = [PIPELINE_SCRIPTS[0], f"{PIPELINE_SCRIPTS[0]} (incremental)", *PIPELINE_SCRIPTS[1:], PAGE_LOADERS_STEP]
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    results = {}
+    for scale in scales:
+        label = f"{scale}x"
+        print(f"\n=== Escala {label} ===")
+        data_dir = ensure_data(scale)
+        results[label] = {}
+        for step in steps:
+            result = measure(step.split(' ')[0], data_dir)
+            if result is None:
+                print(f"ERRO: A etapa '{step}' falhou na escala {label}.")
+                return False
+            results[label][step] = result
+            print(f"  {step:<30} {result['tempo_s']:8.2f} s  {result['pico_rss_mb']:8.1f} MB  "
+                  f"{result['saida_bytes'] / 2**20:8.1f} MB de saída")
+
+    with open(LAST_RUN_FILE, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    if save_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline salvo em '{BASELINE_FILE}'.")
+        return True
+
+    if not os.path.exists(BASELINE_FILE):
+        print("\nAVISO: Nenhum baseline salvo; rode com --salvar-baseline para criar um.")
+        return True
+    with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+        regressions = compare(results, json.load(f), threshold)
+    if regressions:
+        print(f"\nERRO: Regressões acima de {threshold:.0%} em relação ao baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return False
+    print(f"\nNenhuma regressão acima de {threshold:.0%} em relação ao baseline.")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline com dados sintéticos.")
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10], help="Escalas do volume real (ex.: 1 10 100).")
+    parser.add_argument('--salvar-baseline', action='store_true', help="Grava os resultados como o novo baseline.")
+    parser.add_argument('--limite', type=float, default=DEFAULT_THRESHOLD, help="Piora relativa tolerada (0.25 = 25%%).")
+    parser.add_argument('--executar-etapa', help=argparse.SUPPRESS)
+    parser.add_argument('--gerar', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.gerar:
+        generate_raw(args.gerar[1], int(args.gerar[0]))
+        ok = True
+    elif args.executar_etapa:
+        ok = run_step(args.executar_etapa)
+    else:
+        ok = main(args.escalas, save_baseline=args.salvar_baseline, threshold=args.limite)
+    if not ok:
+        sys.exit(1)
@@ -18,6 +18,10 @@ Use o menu na barra lateral para navegar entre as diferentes seções da aplica
 
 - **Análise Exploratória (O Processo):** Entenda o passo a passo de como os dados são limpos, processados e analisados.
 - **Análise Agregada (Jogadores):** Explore o desempenho consolidado dos jogadores ao longo de todas as temporadas, com filtros interativos.
+- **Escalação Ideal:** Monte o time de maior pontuação esperada dentro do orçamento, na formação escolhida.
+- **Desempenho do Pipeline:** Acompanhe tempo, memória e volume de dados de cada etapa ao longo das execuções.
+- **Consultas:** Monte rankings por clube, posição e rodadas ou escreva consultas SQL sobre os dados processados.
+- **Atletas Parecidos:** Encontre os atletas de perfil de scouts mais parecido com um jogador, inclusive os mais baratos.
 """)
 
 st.info("Os dados utilizados neste projeto são obtidos do repositório público [caRtola](https://github.com/henriquepgomide/caRtola), que consolida informações históricas do Cartola FC.")
\ No newline at end of file
@@ -1,38 +1,53 @@
 import streamlit as st
-from src.dados import load_parquet_data, get_current_season_players
+from src.dados import load_player_index, load_aggregated_summary, load_top_aggregated, list_query_views
 
 st.set_page_config(page_title="Análise Agregada - EscalAI", layout="wide")
 
 st.header("📊 Análise Agregada (Jogadores Ativos)")
 
-df_agg_historico = load_parquet_data('dados_agregados_por_atleta.parquet')
-atletas_atuais = get_current_season_players()
-
-if df_agg_historico is None:
+if 'agregado' not in list_query_views():
+    st.error("Tabela agregada não encontrada. Execute o pipeline de processamento.")
     st.stop()
 
-if not atletas_atuais:
-    st.warning("Não foi possível buscar a lista de atletas da temporada atual. A análise pode incluir jogadores inativos.")
-    df_agg_filtrado = df_agg_historico
-else:    
-    apelidos_atuais = {atleta['apelido'] for atleta in atletas_atuais}
-    
-    df_agg_filtrado = df_agg_historico[df_agg_historico['apelido'].isin(apelidos_atuais)]
-    st.info(f"A análise considera o histórico de todos os tempos, mas exibe apenas os **{len(df_agg_filtrado)}** jogadores que estão ativos na temporada atual.")
+# O índice de atletas só fornece os atleta_ids ativos e o preço atual das linhas exibidas;
+# filtro por jogos e top-k rodam no DuckDB sobre a tabela agregada
+indice = load_player_index()
+ativos = indice['ativos'] if indice is not None else None
 
+colunas = ['apelido', 'total_pontos', 'media_pontos', 'std_pontos', 'jogos_disputados', 'media_preco', 'ultimo_clube',
+           'posicao', 'custo_beneficio_medio']
+if ativos is None or ativos.empty:
+    st.warning("Não foi possível buscar a lista de atletas da temporada atual. A análise pode incluir jogadores inativos.")
+    atleta_ids = None
+    resumo = load_aggregated_summary()
+else:
+    # Só atletas com histórico entram nas tabelas (estreantes do mercado não têm jogos agregados)
+    atleta_ids = ativos.index[ativos['jogos_disputados'].notna()]
+    resumo = load_aggregated_summary(atleta_ids)
+    if resumo['atletas'] == 0:
+        st.warning("Nenhum atleta do mercado atual tem histórico na tabela agregada.")
+        st.stop()
+    st.info(f"A análise considera o histórico de todos os tempos, mas exibe apenas os **{resumo['atletas']}** jogadores que estão ativos na temporada atual.")
+    colunas.append('preco_atual')
+
+def top_jogadores(ordem, min_jogos):
+    """Top 20 pela coluna `ordem`, com apelido e preço atuais do mercado (busca por atleta_id no índice)."""
+    top = load_top_aggregated(ordem, min_jogos, atleta_ids, k=20)
+    if atleta_ids is not None:
+        atual = ativos.reindex(top['atleta_id'])
+        top = top.assign(apelido=atual['apelido'].to_numpy(), preco_atual=atual['preco_atual'].to_numpy())
+    return top[colunas]
 
 st.markdown("Use os filtros para encontrar os jogadores mais consistentes e com o melhor custo-benefício ao longo do tempo.")
-min_jogos = st.slider("Filtrar por número mínimo de jogos disputados (histórico):", 
-                    min_value=1, 
-                    max_value=int(df_agg_filtrado['jogos_disputados'].max()), 
+min_jogos = st.slider("Filtrar por número mínimo de jogos disputados (histórico):",
+                    min_value=1,
+                    max_value=int(resumo['max_jogos']),
                     value=10)
 
-df_final = df_agg_filtrado[df_agg_filtrado['jogos_disputados'] >= min_jogos]
-
 st.markdown("--- ")
 
 st.subheader("🏆 Top 20 Jogadores por Média de Pontos")
-st.dataframe(df_final.nlargest(20, 'media_pontos'))
+st.dataframe(top_jogadores('media_pontos', min_jogos))
 
 st.subheader("💰 Top 20 Jogadores por Custo-Benefício Médio")
-st.dataframe(df_final.nlargest(20, 'custo_beneficio_medio'))
\ No newline at end of file
+st.dataframe(top_jogadores('custo_beneficio_medio', min_jogos))
@@ -0,0 +1,64 @@
+import streamlit as st
+from src.config import FORMATIONS, RISK_AVERSION
+from src.dados import load_table, get_market_frame
+from src.otimizador import HISTORY_COLS, lineup_candidates, optimize_lineup
+
+st.set_page_config(page_title="Escalação Ideal - EscalAI", layout="wide")
+
+st.header("🧠 Escalação Ideal")
+
+mercado, _ = get_market_frame()
+
+if mercado.empty:
+    st.warning("Não foi possível buscar os preços do mercado atual. A escalação precisa dos dados ao vivo.")
+    st.stop()
+
+# Só as colunas do otimizador e as linhas dos atletas do mercado saem da tabela agregada mapeada em memória
+df_agg_historico = load_table('dados_agregados_por_atleta', columns=HISTORY_COLS,
+                              filters=[('atleta_id', 'in', mercado.index.tolist())])
+if df_agg_historico is None:
+    st.error("Tabela agregada não encontrada. Execute o pipeline de processamento.")
+    st.stop()
+
+st.markdown("Monta o time (11 jogadores + técnico) de maior pontuação esperada que cabe no orçamento, usando o histórico agregado de cada atleta e os preços do mercado atual. Só entram atletas com status **Provável**.")
+
+col1, col2, col3 = st.columns(3)
+formacao = col1.selectbox("Formação:", list(FORMATIONS), index=list(FORMATIONS).index('4-3-3'))
+orcamento = col2.number_input("Orçamento (C$):", min_value=0.0, value=100.0, step=1.0)
+objetivos = {
+    'pontos': "Pontos esperados",
+    'risco': "Pontos ajustados ao risco",
+    'valor': "Custo-benefício",
+    'previsao': "Pontos previstos (próxima rodada)",
+}
+previsoes = load_table('previsao_pontos', columns=['atleta_id', 'pontos_previstos'])
+if previsoes is None:
+    del objetivos['previsao']
+objetivo = col3.radio("Objetivo:", list(objetivos), format_func=objetivos.get)
+
+aversao = RISK_AVERSION
+if objetivo == 'risco':
+    aversao = st.slider("Aversão ao risco (desvios padrão descontados da média):", min_value=0.0, max_value=2.0, value=RISK_AVERSION, step=0.1)
+
+candidatos = lineup_candidates(df_agg_historico, mercado.reset_index(), objective=objetivo, risk_aversion=aversao,
+                               predictions=previsoes)
+escalacao = optimize_lineup(candidatos, orcamento, formacao)
+
+st.markdown("--- ")
+
+if escalacao is None:
+    st.error("Não há escalação possível nessa formação com esse orçamento.")
+    st.stop()
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Custo total", f"C$ {escalacao['preco_num'].sum():.2f}")
+col2.metric("Sobra do orçamento", f"C$ {orcamento - escalacao['preco_num'].sum():.2f}")
+if objetivo == 'previsao':
+    col3.metric("Pontos previstos", f"{escalacao['nota'].sum():.2f}")
+else:
+    col3.metric("Pontos esperados", f"{escalacao['media_pontos'].fillna(escalacao['media_num']).sum():.2f}")
+
+st.dataframe(
+    escalacao[['posicao', 'apelido', 'preco_num', 'media_pontos', 'std_pontos', 'media_num', 'nota']],
+    hide_index=True,
+)
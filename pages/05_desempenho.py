@@ -0,0 +1,53 @@
+import streamlit as st
+from src.dados import load_run_report
+from src.artefatos import cache_stats
+from src.graficos import build_run_metric
+
+st.set_page_config(page_title="Desempenho do Pipeline - EscalAI", layout="wide")
+
+st.header("⏱️ Desempenho do Pipeline")
+
+relatorio = load_run_report()
+if relatorio is None or relatorio.empty:
+    st.warning("Nenhuma execução registrada ainda. Execute `python scripts/run_pipeline.py` para gerar o relatório.")
+    st.stop()
+
+st.markdown("Métricas de cada etapa registradas pelo orquestrador a cada execução do pipeline. Etapas puladas pelo cache (entradas inalteradas) não entram nos gráficos.")
+
+execucoes = relatorio['execucao'].drop_duplicates().sort_values()
+ultima = relatorio[relatorio['execucao'] == execucoes.iloc[-1]]
+resumo = ultima[ultima['etapa'] == 'pipeline'].iloc[0]
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Execuções registradas", len(execucoes))
+col2.metric("Tempo da última execução", f"{resumo['tempo_s']:.2f} s")
+col3.metric("Etapas puladas (cache) na última", f"{int(resumo['etapas_puladas'])} de {int(resumo['etapas_puladas'] + resumo['etapas_executadas'])}")
+
+st.markdown("--- ")
+
+metricas = {
+    'tempo_s': "Tempo de parede (s)",
+    'cpu_s': "Tempo de CPU (s)",
+    'pico_rss_mb': "Pico de memória (MB)",
+    'linhas_saida': "Linhas de saída",
+    'bytes_lidos': "Bytes lidos",
+    'bytes_escritos': "Bytes escritos",
+}
+metrica = st.selectbox("Métrica:", [m for m in metricas if m in relatorio.columns], format_func=metricas.get)
+n_execucoes = st.slider("Execuções mais recentes:", min_value=1, max_value=len(execucoes), value=min(30, len(execucoes)))
+
+recentes = relatorio[relatorio['execucao'].isin(execucoes.iloc[-n_execucoes:])]
+executadas = recentes[(recentes['status'] == 'executada') & (recentes['etapa'] != 'pipeline')]
+st.plotly_chart(build_run_metric(executadas, metrica, metricas[metrica]), use_container_width=True)
+
+st.subheader("Última execução")
+st.dataframe(ultima.drop(columns=['execucao']).dropna(axis=1, how='all'), hide_index=True)
+
+st.subheader("Cache de artefatos das páginas")
+st.markdown("Arquivos do pipeline lidos pelas páginas ficam em memória até mudarem em disco; acima do orçamento, os usados há mais tempo são descartados.")
+cache = cache_stats()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Artefatos em memória", cache['entradas'])
+col2.metric("Memória usada", f"{cache['bytes'] / 2**20:.1f} MB")
+col3.metric("Acertos / faltas", f"{cache['acertos']} / {cache['faltas']}")
+col4.metric("Invalidações / descartes", f"{cache['invalidacoes']} / {cache['descartes']}")
@@ -0,0 +1,58 @@
+import duckdb
+import streamlit as st
+from src.config import QUERY_ROW_LIMIT
+from src.consultas import RANKING_GROUPS, RANKING_METRICS, RANKING_AGGREGATIONS
+from src.dados import list_query_views, rank_players, query_sql
+
+st.set_page_config(page_title="Consultas - EscalAI", layout="wide")
+
+st.header("🧮 Consultas")
+
+views = list_query_views()
+if 'rodadas' not in views:
+    st.warning("Dataset consolidado não encontrado. Execute `python scripts/run_pipeline.py` para habilitar as consultas.")
+    st.stop()
+
+st.markdown("Consultas rodadas pelo DuckDB direto sobre os arquivos parquet do pipeline: só o resultado é carregado na página.")
+
+# --- Ranking guiado ---
+st.subheader("Ranking por grupo")
+anos = query_sql("SELECT DISTINCT ano FROM rodadas ORDER BY ano")['ano'].tolist()
+
+col1, col2, col3, col4 = st.columns(4)
+ano = col1.selectbox("Temporada:", anos, index=len(anos) - 1)
+metrica = col2.selectbox("Métrica:", RANKING_METRICS, index=RANKING_METRICS.index('G'))
+agregacoes = {'soma': "Soma", 'media': "Média", 'maximo': "Máximo"}
+agregacao = col3.selectbox("Agregação:", list(RANKING_AGGREGATIONS), format_func=agregacoes.get)
+grupos = {'clube': "Clube", 'posicao': "Posição", 'ano': "Temporada", 'geral': "Sem grupo (geral)"}
+agrupar_por = col4.selectbox("Agrupar por:", [*RANKING_GROUPS, 'geral'], format_func=grupos.get)
+
+col1, col2 = st.columns([3, 1])
+rodada_max = int(query_sql("SELECT max(rodada_id) AS r FROM rodadas WHERE ano = $ano", {'ano': ano})['r'].iloc[0])
+rodadas = col1.slider("Rodadas:", min_value=1, max_value=max(rodada_max, 2), value=(1, max(rodada_max, 2)))
+k = col2.number_input("Top-k por grupo:", min_value=1, max_value=100, value=3)
+
+resultado = rank_players(metrica=metrica, agregacao=agregacao, agrupar_por=None if agrupar_por == 'geral' else agrupar_por, ano=ano, rodadas=rodadas, k=k)
+st.dataframe(resultado, hide_index=True)
+
+st.markdown("--- ")
+
+# --- Consulta livre ---
+st.subheader("Consulta SQL")
+st.markdown(f"Views disponíveis: {', '.join(f'`{v}`' for v in views)}. A view `rodadas` traz os scouts da rodada (não os acumulados da temporada). Apenas `SELECT`, sem acesso a arquivos fora do diretório de dados; no máximo {QUERY_ROW_LIMIT} linhas.")
+
+incluir_brutos = st.checkbox("Incluir os CSVs brutos (view `bruto`, todas as colunas como texto; a primeira consulta leva alguns segundos)")
+exemplo = """-- Artilheiros por clube nas rodadas 10 a 20 de 2023
+SELECT clube, apelido, sum(G) AS gols
+FROM rodadas
+WHERE ano = 2023 AND rodada_id BETWEEN 10 AND 20
+GROUP BY clube, apelido
+QUALIFY row_number() OVER (PARTITION BY clube ORDER BY gols DESC) <= 3
+ORDER BY clube, gols DESC"""
+sql = st.text_area("SQL:", value=exemplo, height=200)
+
+if st.button("Executar"):
+    try:
+        st.dataframe(query_sql(sql, include_raw=incluir_brutos), hide_index=True)
+    except (ValueError, duckdb.Error) as e:
+        st.error(f"Erro na consulta: {e}")
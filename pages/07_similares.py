@@ -0,0 +1,40 @@
+import time
+import streamlit as st
+from src.dados import load_similarity_search, get_market_frame
+from src.similaridade import similar_players
+
+st.set_page_config(page_title="Atletas Parecidos - EscalAI", layout="wide")
+
+st.header("🔁 Atletas Parecidos")
+
+busca = load_similarity_search()
+if busca is None:
+    st.warning("Índice de similaridade não encontrado. Execute `python scripts/run_pipeline.py` para gerá-lo.")
+    st.stop()
+
+st.markdown("Encontre substitutos para um atleta: o perfil de cada um são os scouts por jogo no histórico, comparados apenas com atletas da mesma posição.")
+
+mercado, _ = get_market_frame()
+precos = None
+if not mercado.empty:
+    precos = mercado['preco_num']
+else:
+    st.info("Mercado atual indisponível: os preços usados são as médias históricas.")
+
+indice = busca['linhas'].sort_values('apelido')
+rotulos = {row.atleta_id: f"{row.apelido} ({row.posicao}, {row.ultimo_clube})" for row in indice.itertuples()}
+
+col1, col2, col3 = st.columns([3, 1, 1])
+atleta_id = col1.selectbox("Atleta:", list(rotulos), format_func=rotulos.get)
+k = col2.number_input("Quantidade:", min_value=1, max_value=50, value=10)
+mais_baratos = col3.checkbox("Só mais baratos")
+
+inicio = time.perf_counter()
+resultado = similar_players(busca, atleta_id, k=k, cheaper=mais_baratos, prices=precos)
+tempo_ms = (time.perf_counter() - inicio) * 1000
+
+if resultado is None or resultado.empty:
+    st.info("Nenhum atleta encontrado com esses critérios.")
+else:
+    st.dataframe(resultado, hide_index=True)
+st.caption(f"Busca em {tempo_ms:.1f} ms sobre {len(busca['linhas'])} atletas do índice.")
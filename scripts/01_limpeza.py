@@ -1,98 +1,224 @@
-import pandas as pd
+import argparse
 import glob
+import json
 import os
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Adiciona o diretório raiz ao path para a importação funcionar tanto em execução direta quanto via orquestrador
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.config import ROOT_DIR, RAW_DATA_PATH, INTERMEDIATE_DATA_PATH, CONSOLIDATED_OUTPUT_FILE, NUMERIC_COLS, SCOUT_COLS
+from src.config import (ROOT_DIR, RAW_DATA_PATH, INTERMEDIATE_DATA_PATH, CONSOLIDATED_DATASET_PATH,
+                        RAW_MANIFEST_FILE, MEMORY_REPORT_FILE, INGESTION_WORKERS, INGESTION_YEARS,
+                        CLEANING_SAMPLE, CLEANING_SAMPLE_FILE, ARROW_CONSOLIDATED_FILE, VALIDATION_REPORT_FILE,
+                        QUARANTINE_PATH)
+from src.manifesto import load_manifest, save_manifest, diff_files, MANIFEST_VERSION
+from src.ingestao import ingest_file, read_raw_file, clean_frame
+from src.esquemas import raw_patterns
+from src.validacao import build_report, save_report
+from src.armazenamento import load_consolidated, memory_report, combine_memory_reports, publish_consolidated_arrow
 
-def run():
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [RAW_DATA_PATH]
+OUTPUTS = [CONSOLIDATED_DATASET_PATH, RAW_MANIFEST_FILE, MEMORY_REPORT_FILE, CLEANING_SAMPLE_FILE, ARROW_CONSOLIDATED_FILE,
+           VALIDATION_REPORT_FILE]
+# Parâmetros que mudam a saída sem mudar código nem entradas (entram na impressão digital da etapa)
+PARAMS = {'anos': INGESTION_YEARS}
+
+def select_years(anos, janela):
     """
-    Coleta, consolida e limpa os dados brutos do Cartola FC.
-    - Lê arquivos CSV de múltiplos anos.
-    - Renomeia colunas.
-    - Padroniza nomes de times.
-    - Preenche valores numéricos e de scouts ausentes com 0.
-    - Mapeia posições e ajusta tipos de dados.
-    - Salva o DataFrame limpo em formato parquet.
+    Seleciona as temporadas (lista ordenada de 'AAAA') segundo a janela:
+    'todos', um número N (as N mais recentes) ou um intervalo 'AAAA-AAAA'.
     """
-    print("--- INICIANDO: [1/4] Limpeza de Dados ---")
+    janela = str(janela).strip().lower()
+    if janela == 'todos':
+        return anos
+    if janela.isdigit() and int(janela) > 0:
+        return anos[-int(janela):]
+    inicio, _, fim = janela.partition('-')
+    if inicio.isdigit() and fim.isdigit():
+        return [ano for ano in anos if int(inicio) <= int(ano) <= int(fim)]
+    raise ValueError(f"Janela de anos inválida: '{janela}'. Use 'todos', um número (ex.: 4) ou um intervalo (ex.: 2018-2025).")
+
+def list_raw_files(years):
+    """Lista os arquivos brutos dos anos informados, segundo os layouts de cada temporada (src/esquemas.py)."""
+    files = []
+    for year in years:
+        for pattern in raw_patterns(year):
+            files.extend(glob.glob(os.path.join(RAW_DATA_PATH, year, pattern)))
+    return sorted(files)
+
+def remove_outputs(entry):
+    """Remove as partições (ou a quarentena) geradas anteriormente por um arquivo bruto (e os diretórios que ficarem vazios)."""
+    quarentena = os.path.join(QUARANTINE_PATH, entry['quarentena']) if entry.get('quarentena') else None
+    if quarentena and os.path.exists(quarentena):
+        os.remove(quarentena)
+        if not os.listdir(os.path.dirname(quarentena)):
+            os.rmdir(os.path.dirname(quarentena))
+    for output in entry.get('saidas', []):
+        path = os.path.join(CONSOLIDATED_DATASET_PATH, output)
+        if os.path.exists(path):
+            os.remove(path)
+        for directory in (os.path.dirname(path), os.path.dirname(os.path.dirname(path))):
+            if os.path.isdir(directory) and not os.listdir(directory):
+                os.rmdir(directory)
+
+def write_memory_report():
+    """
+    Gera o relatório de economia de memória por coluna do schema compacto sobre o dataset consolidado.
+    Lê uma temporada por vez: a memória usada não cresce com o número de temporadas.
+    """
+    years = sorted(int(d.split('=', 1)[1]) for d in os.listdir(CONSOLIDATED_DATASET_PATH) if d.startswith('ano='))
+    if not years:
+        return
+    report = combine_memory_reports([memory_report(load_consolidated(filters=[('ano', '==', year)])) for year in years])
+    report.to_json(MEMORY_REPORT_FILE, orient='records', indent=2, force_ascii=False)
+    antes, depois = report['bytes_antes'].sum(), report['bytes_depois'].sum()
+    print(f"  - Memória do dataset em RAM: {antes / 2**20:.1f} MB -> {depois / 2**20:.1f} MB "
+          f"(relatório por coluna em '{MEMORY_REPORT_FILE}')")
+
+def write_cleaning_sample():
+    """
+    Grava o exemplo de limpeza da página de análise exploratória (CLEANING_SAMPLE): as colunas escolhidas de um
+    atleta em um arquivo bruto, antes e depois de clean_frame. A página lê esse JSON minúsculo, e não o CSV bruto.
+    """
+    path = os.path.join(RAW_DATA_PATH, CLEANING_SAMPLE['arquivo'])
+    if not os.path.exists(path):
+        print(f"  - AVISO: Arquivo do exemplo de limpeza não encontrado ('{path}'). Exemplo não gerado.")
+        return
+    raw = read_raw_file(path)
+    raw = raw[raw['atleta_id'].astype(float) == CLEANING_SAMPLE['atleta_id']]
+    clean = clean_frame(raw, os.path.basename(os.path.dirname(path)))
+
+    def records(df):
+        df = df[CLEANING_SAMPLE['colunas']].astype(object)
+        return df.where(df.notna(), None).to_dict(orient='records')
+
+    sample = {**CLEANING_SAMPLE, 'antes': records(raw), 'depois': records(clean)}
+    os.makedirs(os.path.dirname(CLEANING_SAMPLE_FILE), exist_ok=True)
+    with open(CLEANING_SAMPLE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(sample, f, ensure_ascii=False, indent=2)
+
+def write_validation_report(manifest):
+    """Grava o relatório de validação (resultados por arquivo guardados no manifesto + verificações por temporada)."""
+    report = build_report(manifest['arquivos'])
+    save_report(report, VALIDATION_REPORT_FILE)
+    resumo = report['resumo']
+    print(f"  - Validação: {resumo['ok']} arquivo(s) ok, {resumo['aviso']} com avisos, {resumo['quarentena']} em quarentena "
+          f"(relatório em '{VALIDATION_REPORT_FILE}')")
+
+def run(completo=False, anos=INGESTION_YEARS):
+    """
+    Coleta, consolida e limpa os dados brutos do Cartola FC de forma incremental.
+    - Seleciona as temporadas pela janela `anos` (ver select_years; padrão INGESTION_YEARS).
+    - Compara os arquivos brutos com o manifesto (tamanho, mtime e hash do conteúdo).
+    - Lê, limpa e valida apenas os arquivos novos ou alterados, em paralelo (um processo por núcleo).
+      Arquivos com erros de validação vão para a quarentena em vez de interromper a execução.
+    - Cada arquivo é lido, limpo e gravado sozinho nas partições ano/rodada_id do dataset consolidado:
+      o pico de memória é o do maior arquivo (por processo), qualquer que seja o número de temporadas.
+    - Remove partições de arquivos que deixaram de existir (ou saíram da janela de anos).
+    - Gera o relatório de validação, o relatório de economia de memória do schema compacto e o exemplo de limpeza das páginas.
+    - Publica o dataset inteiro em um arquivo Arrow IPC, que as páginas mapeiam em memória.
+    - Com `completo=True`, descarta o manifesto e reconstrói o dataset do zero.
+    """
+    print("--- INICIANDO: [1/9] Limpeza de Dados ---")
 
     all_year_dirs = [d for d in os.listdir(RAW_DATA_PATH) if os.path.isdir(os.path.join(RAW_DATA_PATH, d)) and d.isdigit()]
     if not all_year_dirs:
         print(f"ERRO: Nenhum diretório de ano encontrado em '{RAW_DATA_PATH}'. Abortando.")
         return False
 
-    # Ordena os anos e seleciona apenas os últimos 4
-    anos_encontrados = sorted([d for d in all_year_dirs])
-    anos_a_processar = anos_encontrados[-4:]
-    
-    print(f"  - Total de anos encontrados: {len(anos_encontrados)}. Processando os últimos 4: {anos_a_processar}")
-    
-    df_list = []
-    for year in anos_a_processar:
-        rodada_files = glob.glob(os.path.join(RAW_DATA_PATH, year, 'rodada-*.csv'))
-        rodada_files.extend(glob.glob(os.path.join(RAW_DATA_PATH, year, 'Mercado_*.txt')))
-
-        for file in rodada_files:
-            # Imprime o caminho relativo do arquivo para dar feedback ao usuário
-            relative_path = os.path.relpath(file, ROOT_DIR)
-            # Usa ljust para preencher com espaços e limpar a linha anterior
-            print(f"    - Lendo: {relative_path.ljust(80)}", end='\r')
-            try:
-                df_rodada = pd.read_csv(file, encoding='utf-8', low_memory=False)
-            except UnicodeDecodeError:
-                df_rodada = pd.read_csv(file, encoding='latin-1', low_memory=False)
-            df_rodada['ano'] = int(year)
-            df_list.append(df_rodada)
-    # Limpa a linha de progresso antes de continuar
-    print(" " * 100, end="\r")
-
-
-    if not df_list:
+    anos_encontrados = sorted(all_year_dirs)
+    try:
+        anos_a_processar = select_years(anos_encontrados, anos)
+    except ValueError as e:
+        print(f"ERRO: {e}")
+        return False
+
+    print(f"  - Total de anos encontrados: {len(anos_encontrados)}. Processando (janela '{anos}'): {anos_a_processar}")
+
+    rodada_files = list_raw_files(anos_a_processar)
+    if not rodada_files:
         print("ERRO: Nenhum arquivo de dado bruto foi encontrado. Abortando.")
         return False
+    anos_sem_arquivos = sorted(set(anos_a_processar) - {os.path.basename(os.path.dirname(f)) for f in rodada_files})
+    if anos_sem_arquivos:
+        print(f"  - AVISO: Temporadas sem arquivos de rodada reconhecidos (ignoradas): {anos_sem_arquivos}")
+
+    manifest = load_manifest(RAW_MANIFEST_FILE)
+    if completo or not manifest['arquivos']:
+        print("  - Reconstrução completa do dataset consolidado.")
+        shutil.rmtree(CONSOLIDATED_DATASET_PATH, ignore_errors=True)
+        shutil.rmtree(QUARANTINE_PATH, ignore_errors=True)
+        manifest = {'versao': MANIFEST_VERSION, 'arquivos': {}}
+
+    changed, removed, touched = diff_files(manifest, rodada_files, ROOT_DIR)
+    # Partições apagadas manualmente também forçam o reprocessamento do arquivo de origem
+    for rel, entry in manifest['arquivos'].items():
+        if rel not in changed and rel not in removed:
+            if not all(os.path.exists(os.path.join(CONSOLIDATED_DATASET_PATH, o)) for o in entry['saidas']):
+                changed.append(rel)
+
+    print(f"  - Arquivos no manifesto: {len(manifest['arquivos'])} | novos/alterados: {len(changed)} | removidos: {len(removed)}")
+    if not changed and not removed:
+        if not os.path.exists(RAW_MANIFEST_FILE):
+            save_manifest(manifest, RAW_MANIFEST_FILE)
+        if not os.path.exists(VALIDATION_REPORT_FILE):
+            write_validation_report(manifest)
+        if not os.path.exists(MEMORY_REPORT_FILE):
+            write_memory_report()
+        if not os.path.exists(CLEANING_SAMPLE_FILE):
+            write_cleaning_sample()
+        if not os.path.exists(ARROW_CONSOLIDATED_FILE):
+            publish_consolidated_arrow(ARROW_CONSOLIDATED_FILE)
+        print("  - Nenhuma alteração nos dados brutos. Dataset consolidado mantido.")
+        print("--- SUCESSO: [1/9] Limpeza de Dados Concluída ---")
+        return True
+
+    for rel in removed:
+        remove_outputs(manifest['arquivos'].pop(rel))
+
+    for rel in changed:
+        if rel in manifest['arquivos']:
+            remove_outputs(manifest['arquivos'].pop(rel))
+
+    # Cada processo lê, limpa e grava a partição do seu arquivo; só as entradas do manifesto voltam
+    workers = min(INGESTION_WORKERS, len(changed))
+    print(f"  - Lendo {len(changed)} arquivo(s) com {max(workers, 1)} processo(s)...")
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(ingest_file, sorted(changed)))
+    else:
+        results = [ingest_file(rel) for rel in sorted(changed)]
+
+    total_rows = 0
+    for rel, entry in results:
+        manifest['arquivos'][rel] = entry
+        total_rows += entry['linhas']
+    quarentena = sorted(rel for rel, entry in results if entry['validacao']['status'] == 'quarentena')
+    if quarentena:
+        print(f"  - AVISO: {len(quarentena)} arquivo(s) em quarentena (fora do dataset), ex.: {quarentena[0]}")
 
-    df = pd.concat(df_list, ignore_index=True)
-    print(f"  - Dados brutos consolidados. Shape: {df.shape}")
-
-    print("  - Simplificando nomes de colunas...")
-    df.columns = [col.replace('atletas.', '').replace('id.full.name', 'nome') for col in df.columns]
-
-    print("  - Padronizando nomes de times...")
-    if 'clube.nome' in df.columns:
-        df['clube.nome'] = df['clube.nome'].str.replace('AmÃ©rica-MG', 'América-MG', regex=False)
-
-    print("  - Tratando valores ausentes (NaN -> 0)...")
-    all_numeric_cols = NUMERIC_COLS + SCOUT_COLS
-    for col in all_numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-
-    print("  - Mapeando posições...")
-    if 'posicao_id' in df.columns:
-        pos_map = {
-            '1': 'gol', 'gol': 'gol',
-            '2': 'lat', 'lat': 'lat',
-            '3': 'zag', 'zag': 'zag',
-            '4': 'mei', 'mei': 'mei',
-            '5': 'ata', 'ata': 'ata',
-            '6': 'tec', 'tec': 'tec'
-        }
-        df['posicao_id'] = df['posicao_id'].astype(str).str.lower().map(pos_map).fillna('desconhecida').astype('category')
-
-    print("  - Ajustando tipos de dados...")
-    if 'clube_id' in df.columns:
-        df['clube_id'] = pd.to_numeric(df['clube_id'], errors='coerce').fillna(0).astype(int)
-    if 'status_id' in df.columns:
-        df['status_id'] = pd.to_numeric(df['status_id'], errors='coerce').fillna(0).astype('category')
+    # Entradas cujo conteúdo não mudou (apenas o mtime) só são persistidas junto com alterações reais
+    manifest['arquivos'].update({rel: entry for rel, entry in touched.items() if rel in manifest['arquivos']})
 
     os.makedirs(INTERMEDIATE_DATA_PATH, exist_ok=True)
-    df.to_parquet(CONSOLIDATED_OUTPUT_FILE, index=False)
-    print(f"  - Dados limpos salvos em: '{CONSOLIDATED_OUTPUT_FILE}'")
-    print("--- SUCESSO: [1/4] Limpeza de Dados Concluída ---")
+    save_manifest(manifest, RAW_MANIFEST_FILE)
+    print(f"  - {len(changed)} arquivo(s) processado(s), {total_rows} linhas gravadas.")
+    print(f"  - Dados limpos salvos em: '{CONSOLIDATED_DATASET_PATH}'")
+    write_validation_report(manifest)
+    write_memory_report()
+    write_cleaning_sample()
+    publish_consolidated_arrow(ARROW_CONSOLIDATED_FILE)
+    print(f"  - Dataset publicado em Arrow (mapeável em memória) em '{ARROW_CONSOLIDATED_FILE}'")
+    print("--- SUCESSO: [1/9] Limpeza de Dados Concluída ---")
     return True
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Limpeza incremental dos dados brutos do Cartola FC.")
+    parser.add_argument('--completo', action='store_true', help="Ignora o manifesto e reconstrói todo o dataset.")
+    parser.add_argument('--anos', default=INGESTION_YEARS,
+                        help="Janela de temporadas: 'todos', um número N (as N mais recentes) ou 'AAAA-AAAA'.")
+    args = parser.parse_args()
+    if not run(completo=args.completo, anos=args.anos):
+        sys.exit(1)
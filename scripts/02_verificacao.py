@@ -1,51 +1,62 @@
-import pandas as pd
 import os
 import sys
 
 # Adiciona o diretório raiz ao path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.config import CONSOLIDATED_OUTPUT_FILE, NUMERIC_COLS, SCOUT_COLS
+from src.config import VALIDATION_REPORT_FILE
+from src.validacao import load_report
+
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [VALIDATION_REPORT_FILE]
+OUTPUTS = []
 
 def run():
     """
-    Verifica a qualidade do conjunto de dados limpo.
-    - Checa se o arquivo existe.
-    - Valida se não há NaNs em colunas numéricas/scouts.
-    - Valida as categorias da coluna de posição.
-    - Retorna True se todas as verificações passarem, senão False.
+    Verifica a qualidade do conjunto de dados limpo pelo relatório de validação da etapa 01.
+    - As regras (nulos, duplicados, faixas, categorias, colunas obrigatórias) já foram aplicadas a cada arquivo
+      bruto durante a ingestão (src/validacao.py); esta etapa só lê o relatório, sem reler o dataset.
+    - Lista os arquivos em quarentena e os avisos por arquivo e por temporada (rodadas faltando ou repetidas).
+    - Retorna False se o relatório não existir ou se nenhum arquivo tiver sido aceito, senão True.
     """
-    print("\n--- INICIANDO: [2/4] Verificação de Dados ---")
+    print("\n--- INICIANDO: [2/9] Verificação de Dados ---")
 
-    if not os.path.exists(CONSOLIDATED_OUTPUT_FILE):
-        print(f"ERRO: Arquivo de dados consolidados não encontrado em '{CONSOLIDATED_OUTPUT_FILE}'.")
+    report = load_report(VALIDATION_REPORT_FILE)
+    if report is None:
+        print(f"ERRO: Relatório de validação não encontrado em '{VALIDATION_REPORT_FILE}'.")
         print("Execute o script de limpeza (01_limpeza.py) primeiro.")
         return False
+    resumo = report['resumo']
+    print(f"  - Relatório de '{report['gerado_em']}': {resumo['arquivos']} arquivo(s), {resumo['linhas_aceitas']} linhas aceitas.")
 
-    df = pd.read_parquet(CONSOLIDATED_OUTPUT_FILE)
-    print(f"  - Arquivo '{CONSOLIDATED_OUTPUT_FILE}' carregado. Shape: {df.shape}")
-
-    # 1. Verificação de Nulos
-    print("  - Verificando valores nulos em colunas numéricas e de scouts...")
-    check_cols = NUMERIC_COLS + SCOUT_COLS
-    cols_with_nan = [col for col in check_cols if col in df.columns and df[col].isnull().any()]
-    
-    if cols_with_nan:
-        print(f"ERRO: As seguintes colunas contêm valores nulos (NaN): {cols_with_nan}")
+    # 1. Arquivos
+    print(f"  - Arquivos: {resumo['ok']} ok, {resumo['aviso']} com avisos, {resumo['quarentena']} em quarentena.")
+    avisos = {}
+    for rel, resultado in report['arquivos'].items():
+        if resultado['status'] == 'quarentena':
+            erros = ", ".join(f"{p['regra']} ({p['linhas']} linhas)" for p in resultado['problemas'] if p['severidade'] == 'erro')
+            print(f"    - QUARENTENA: {rel}: {erros}")
+        for problema in resultado['problemas']:
+            if problema['severidade'] == 'aviso':
+                avisos.setdefault(problema['regra'], []).append(rel)
+    for regra, arquivos in sorted(avisos.items()):
+        print(f"    - aviso '{regra}': {len(arquivos)} arquivo(s), ex.: {arquivos[0]}")
+    if resumo['ok'] + resumo['aviso'] == 0:
+        print("ERRO: Nenhum arquivo bruto passou na validação.")
         return False
-    print("    - OK: Nenhuma coluna numérica com valores nulos.")
-
-    # 2. Verificação de Categorias de Posição
-    print("  - Verificando categorias da coluna 'posicao_id'...")
-    if 'posicao_id' in df.columns:
-        expected_positions = {'gol', 'lat', 'zag', 'mei', 'ata', 'tec', 'desconhecida'}
-        actual_positions = set(df['posicao_id'].unique())
-        
-        if not actual_positions.issubset(expected_positions):
-            print(f"ERRO: Posições inesperadas encontradas: {actual_positions - expected_positions}")
-            return False
-        print("    - OK: Categorias de posição validadas.")
-
-    print("--- SUCESSO: [2/4] Verificação de Dados Concluída ---")
+
+    # 2. Temporadas
+    print("  - Verificando a completude das rodadas por temporada...")
+    for ano, temporada in report['temporadas'].items():
+        avisos = []
+        if temporada['rodadas_faltando']:
+            avisos.append(f"rodadas faltando {temporada['rodadas_faltando']}")
+        if temporada['rodadas_em_varios_arquivos']:
+            avisos.append(f"rodadas em mais de um arquivo {temporada['rodadas_em_varios_arquivos']} "
+                          f"({sum(temporada['linhas_duplicadas'].values())} linhas repetidas)")
+        andamento = f" (em andamento até a rodada {temporada['ultima_rodada']})" if temporada['em_andamento'] else ""
+        print(f"    - {ano}: {temporada['rodadas']} rodada(s){andamento}" + (f" | aviso: {'; '.join(avisos)}" if avisos else " | OK"))
+
+    print("--- SUCESSO: [2/9] Verificação de Dados Concluída ---")
     return True
 
 if __name__ == "__main__":
@@ -1,77 +1,123 @@
 import pandas as pd
+import argparse
 import os
 import sys
-import json
 
 # Adiciona o diretório raiz ao path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.config import CONSOLIDATED_OUTPUT_FILE, VISUALIZATION_DATA_PATH, NUMERIC_COLS
+from src.config import (CONSOLIDATED_DATASET_PATH, VISUALIZATION_DATA_PATH, OUTLIERS_OUTPUT_FILE, DESCRIPTIVE_STATS_FILE,
+                        NUMERIC_COLS, OUTLIER_METHOD, OUTLIER_METHODS, OUTLIER_GROUP_COLS)
+from src.armazenamento import load_consolidated
 
-def run():
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [CONSOLIDATED_DATASET_PATH]
+OUTPUTS = [
+    DESCRIPTIVE_STATS_FILE,
+    OUTLIERS_OUTPUT_FILE,
+]
+# Só roda depois que a verificação dos dados passar
+DEPENDS = ['02_verificacao']
+# Colunas do dataset consolidado usadas por esta etapa
+COLUMNS = NUMERIC_COLS + ['apelido', 'posicao_id', 'ano', 'rodada_id']
+
+def outlier_bounds(df, value_col, group_cols, method):
+    """
+    Calcula os limites inferior e superior de cada grupo para o método escolhido.
+    - 'iqr': Q1 - 1.5*IQR e Q3 + 1.5*IQR.
+    - 'mad': mediana ± 3.5 desvios absolutos medianos normalizados (z-score modificado). Grupos com MAD zero
+      (mais da metade dos valores igual à mediana, comum em posições com pouca atividade) usam os limites do IQR,
+      e ficam sem outliers se o IQR também for zero.
+    - 'zscore': média ± 3 desvios padrão.
+    """
+    grouped = df.groupby(group_cols, observed=True)[value_col]
+    if method == 'iqr':
+        q1, q3 = grouped.quantile(0.25), grouped.quantile(0.75)
+        return q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    if method == 'mad':
+        median = grouped.median()
+        # Desvio absoluto em relação à mediana do próprio grupo, sem laço por grupo
+        deviation = (df[value_col] - grouped.transform('median')).abs()
+        mad = deviation.groupby([df[col] for col in group_cols], observed=True).median() / 0.6745
+        # Com MAD zero os limites colapsariam na mediana e todo valor diferente dela viraria outlier
+        iqr_lower, iqr_upper = outlier_bounds(df, value_col, group_cols, 'iqr')
+        degenerate = (mad == 0) & (iqr_upper == iqr_lower)
+        lower = (median - 3.5 * mad).where(mad > 0, iqr_lower).mask(degenerate)
+        upper = (median + 3.5 * mad).where(mad > 0, iqr_upper).mask(degenerate)
+        return lower, upper
+    if method == 'zscore':
+        mean, std = grouped.mean(), grouped.std()
+        return mean - 3 * std, mean + 3 * std
+    raise ValueError(f"Método de outlier desconhecido: '{method}'. Use um de {OUTLIER_METHODS}.")
+
+def detect_outliers(df, value_col, group_cols, method='iqr'):
+    """
+    Identifica outliers de `value_col` por grupo, de forma vetorizada.
+    Os limites e a média de cada grupo são calculados uma vez e associados às linhas por um join.
+    Retorna as linhas fora dos limites com as colunas 'media_pontos_pos', 'limite_inferior' e 'limite_superior'.
+    """
+    lower, upper = outlier_bounds(df, value_col, group_cols, method)
+    stats = pd.DataFrame({
+        'media_pontos_pos': df.groupby(group_cols, observed=True)[value_col].mean(),
+        'limite_superior': upper,
+        'limite_inferior': lower,
+    })
+
+    df = df.join(stats, on=group_cols)
+    mask = (df[value_col] < df['limite_inferior']) | (df[value_col] > df['limite_superior'])
+    columns = ['apelido', 'posicao_id', *group_cols, value_col, 'media_pontos_pos', 'limite_superior', 'limite_inferior', 'ano', 'rodada_id']
+    return df.loc[mask, list(dict.fromkeys(columns))].reset_index(drop=True)
+
+def run(df=None, method=OUTLIER_METHOD, group_cols=OUTLIER_GROUP_COLS):
     """
     Calcula estatísticas descritivas e identifica outliers.
-    - Carrega os dados limpos.
+    - Carrega os dados limpos (ou usa o DataFrame recebido do orquestrador).
     - Calcula e salva estatísticas descritivas.
-    - Identifica e salva outliers de pontuação usando o método IQR.
+    - Identifica outliers de pontuação por grupo (padrão: posição) com o método escolhido
+      (IQR, MAD ou z-score) e salva o resultado em parquet.
     """
-    print("\n--- INICIANDO: [3/5] Análise Descritiva e Outliers ---")
+    print("\n--- INICIANDO: [3/9] Análise Descritiva e Outliers ---")
 
-    if not os.path.exists(CONSOLIDATED_OUTPUT_FILE):
-        print(f"ERRO: Arquivo de dados consolidados não encontrado em '{CONSOLIDATED_OUTPUT_FILE}'.")
-        print("Execute os scripts de limpeza (01) e verificação (02) primeiro.")
-        return False
+    if df is None:
+        if not os.path.exists(CONSOLIDATED_DATASET_PATH):
+            print(f"ERRO: Dataset consolidado não encontrado em '{CONSOLIDATED_DATASET_PATH}'.")
+            print("Execute os scripts de limpeza (01) e verificação (02) primeiro.")
+            return False
 
-    df = pd.read_parquet(CONSOLIDATED_OUTPUT_FILE)
+        df = load_consolidated(columns=COLUMNS)
+    else:
+        df = df[COLUMNS]
     os.makedirs(VISUALIZATION_DATA_PATH, exist_ok=True)
     print(f"  - Dados limpos carregados. Shape: {df.shape}")
 
     # 1. Estatísticas Descritivas
     print("  - Gerando estatísticas descritivas...")
     desc_stats = df[NUMERIC_COLS].describe()
-    desc_stats_path = os.path.join(VISUALIZATION_DATA_PATH, 'estatisticas_descritivas.json')
-    desc_stats.to_json(desc_stats_path, orient='table', indent=4)
-    print(f"    - Estatísticas salvas em: {desc_stats_path}")
+    desc_stats.to_json(DESCRIPTIVE_STATS_FILE, orient='table', indent=4)
+    print(f"    - Estatísticas salvas em: {DESCRIPTIVE_STATS_FILE}")
 
-    # 2. Detecção de Outliers com IQR
-    print("  - Identificando outliers de pontuação por posição...")
-    outliers_list = []
+    # 2. Detecção de Outliers (limites calculados por grupo em uma única passada)
+    print(f"  - Identificando outliers de pontuação (método: {method}, grupos: {group_cols})...")
     # Focar em posições de linha, onde a análise de pontos é mais comparável
     posicoes_analise = ['lat', 'zag', 'mei', 'ata']
-    
-    for pos in posicoes_analise:
-        df_pos = df[df['posicao_id'] == pos]
-        
-        Q1 = df_pos['pontos_num'].quantile(0.25)
-        Q3 = df_pos['pontos_num'].quantile(0.75)
-        IQR = Q3 - Q1
-        
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        pos_outliers = df_pos[(df_pos['pontos_num'] < lower_bound) | (df_pos['pontos_num'] > upper_bound)]
-        
-        for _, row in pos_outliers.iterrows():
-            outliers_list.append({
-                'apelido': row['apelido'],
-                'posicao': pos,
-                'pontos': row['pontos_num'],
-                'media_pontos_pos': df_pos['pontos_num'].mean(),
-                'limite_superior': upper_bound,
-                'limite_inferior': lower_bound,
-                'ano': row['ano'],
-                'rodada_id': row['rodada_id']
-            })
+    df_linha = df[df['posicao_id'].isin(posicoes_analise)]
+    df_outliers = detect_outliers(df_linha, 'pontos_num', group_cols, method)
+
+    df_outliers = df_outliers.rename(columns={'posicao_id': 'posicao', 'pontos_num': 'pontos'})
+    df_outliers['posicao'] = df_outliers['posicao'].astype(str)
+    df_outliers['metodo'] = method
+    print(f"    - Total de outliers de pontuação identificados: {len(df_outliers)}")
 
-    print(f"    - Total de outliers de pontuação identificados: {len(outliers_list)}")
-    
-    outliers_path = os.path.join(VISUALIZATION_DATA_PATH, 'outliers_pontuacao.json')
-    with open(outliers_path, 'w', encoding='utf-8') as f:
-        json.dump(outliers_list, f, ensure_ascii=False, indent=4)
-    print(f"    - Outliers salvos em: {outliers_path}")
+    df_outliers.to_parquet(OUTLIERS_OUTPUT_FILE, index=False)
+    print(f"    - Outliers salvos em: {OUTLIERS_OUTPUT_FILE}")
 
-    print("--- SUCESSO: [3/5] Análise Descritiva Concluída ---")
+    print("--- SUCESSO: [3/9] Análise Descritiva Concluída ---")
     return True
 
 if __name__ == "__main__":
-    if not run():
+    parser = argparse.ArgumentParser(description="Estatísticas descritivas e detecção de outliers de pontuação.")
+    parser.add_argument('--metodo', choices=OUTLIER_METHODS, default=OUTLIER_METHOD, help="Método de detecção de outliers.")
+    parser.add_argument('--agrupar', nargs='+', default=OUTLIER_GROUP_COLS, choices=['posicao_id', 'ano', 'rodada_id'],
+                        help="Colunas de agrupamento dos limites (ex.: posicao_id ano rodada_id).")
+    args = parser.parse_args()
+    if not run(method=args.metodo, group_cols=args.agrupar):
         sys.exit(1)
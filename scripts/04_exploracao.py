@@ -1,60 +1,128 @@
 import pandas as pd
+import numpy as np
 import os
 import sys
-import plotly.express as px
-import plotly.io as pio
 
 # Adiciona o diretório raiz ao path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.config import CONSOLIDATED_OUTPUT_FILE, VISUALIZATION_DATA_PATH
+from src.config import (CONSOLIDATED_DATASET_PATH, VISUALIZATION_DATA_PATH, BOXPLOT_STATS_FILE, BOXPLOT_OUTLIERS_FILE,
+                        DENSITY_FILE, REGRESSION_FILE)
+from src.armazenamento import load_consolidated
 
-def run():
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [CONSOLIDATED_DATASET_PATH]
+OUTPUTS = [BOXPLOT_STATS_FILE, BOXPLOT_OUTLIERS_FILE, DENSITY_FILE, REGRESSION_FILE]
+# Só roda depois que a verificação dos dados passar
+DEPENDS = ['02_verificacao']
+# Colunas do dataset consolidado usadas por esta etapa
+COLUMNS = ['posicao_id', 'pontos_num', 'preco_num']
+
+# Máximo de outliers guardados por posição no boxplot (os mais distantes da mediana)
+MAX_OUTLIERS_PER_POSITION = 50
+# Número de faixas de preço e de pontos do histograma 2D
+DENSITY_BINS = 40
+
+def box_stats(df):
+    """
+    Calcula as estatísticas do boxplot de pontos por posição, no mesmo critério do Plotly:
+    quartis, mediana, média e bigodes no último ponto dentro de 1.5*IQR.
+    Retorna (estatísticas por posição, outliers limitados a MAX_OUTLIERS_PER_POSITION por posição).
+    """
+    grouped = df.groupby('posicao_id', observed=True)['pontos_num']
+    stats = pd.DataFrame({
+        'q1': grouped.quantile(0.25),
+        'mediana': grouped.median(),
+        'q3': grouped.quantile(0.75),
+        'media': grouped.mean(),
+        'n': grouped.size(),
+    })
+    iqr = stats['q3'] - stats['q1']
+    df = df.join((stats['q1'] - 1.5 * iqr).rename('cerca_inferior'), on='posicao_id')
+    df = df.join((stats['q3'] + 1.5 * iqr).rename('cerca_superior'), on='posicao_id')
+    dentro = df['pontos_num'].between(df['cerca_inferior'], df['cerca_superior'])
+
+    dentro_grouped = df[dentro].groupby('posicao_id', observed=True)['pontos_num']
+    stats['bigode_inferior'] = dentro_grouped.min()
+    stats['bigode_superior'] = dentro_grouped.max()
+
+    outliers = df.loc[~dentro, ['posicao_id', 'pontos_num']]
+    outliers = outliers.join(stats['mediana'], on='posicao_id')
+    outliers['distancia'] = (outliers['pontos_num'] - outliers['mediana']).abs()
+    outliers = (outliers.sort_values('distancia', ascending=False)
+                .groupby('posicao_id', observed=True).head(MAX_OUTLIERS_PER_POSITION))
+    stats['n_outliers'] = (~dentro).groupby(df['posicao_id'], observed=True).sum()
+
+    stats.index = stats.index.astype(str)
+    outliers['posicao_id'] = outliers['posicao_id'].astype(str)
+    return stats.rename_axis('posicao').reset_index(), outliers.rename(columns={'posicao_id': 'posicao'})[['posicao', 'pontos_num']]
+
+def price_points_density(df):
     """
-    Gera as visualizações para a análise exploratória.
-    - Carrega os dados limpos.
-    - Gera e salva o boxplot de pontos por posição.
-    - Gera e salva o scatter plot de preço vs. pontos.
+    Histograma 2D de preço x pontos por posição, guardando só as células não vazias.
+    As faixas são as mesmas para todas as posições, então o total é a soma por célula.
     """
-    print("\n--- INICIANDO: [4/5] Geração de Gráficos de Exploração ---")
+    preco_edges = np.linspace(0, df['preco_num'].max(), DENSITY_BINS + 1)
+    pontos_edges = np.linspace(df['pontos_num'].min(), df['pontos_num'].max(), DENSITY_BINS + 1)
+    bin_preco = np.clip(np.searchsorted(preco_edges, df['preco_num'], side='right') - 1, 0, DENSITY_BINS - 1)
+    bin_pontos = np.clip(np.searchsorted(pontos_edges, df['pontos_num'], side='right') - 1, 0, DENSITY_BINS - 1)
 
-    if not os.path.exists(CONSOLIDATED_OUTPUT_FILE):
-        print(f"ERRO: Arquivo de dados consolidados não encontrado em '{CONSOLIDATED_OUTPUT_FILE}'.")
-        print("Execute os scripts anteriores primeiro.")
-        return False
+    density = (pd.DataFrame({'posicao': df['posicao_id'].astype(str).to_numpy(), 'bin_preco': bin_preco, 'bin_pontos': bin_pontos})
+               .groupby(['posicao', 'bin_preco', 'bin_pontos']).size().rename('n').reset_index())
+    density['preco'] = (preco_edges[density['bin_preco']] + preco_edges[density['bin_preco'] + 1]) / 2
+    density['pontos'] = (pontos_edges[density['bin_pontos']] + pontos_edges[density['bin_pontos'] + 1]) / 2
+    return density[['posicao', 'preco', 'pontos', 'n']]
 
-    df = pd.read_parquet(CONSOLIDATED_OUTPUT_FILE)
+def price_points_regression(df):
+    """Ajuste OLS (pontos = a + b*preço) sobre todas as linhas, sem amostragem."""
+    x, y = df['preco_num'].to_numpy(), df['pontos_num'].to_numpy()
+    slope, intercept = np.polyfit(x, y, 1)
+    residuals = y - (intercept + slope * x)
+    r2 = 1 - residuals.var() / y.var() if y.var() > 0 else 0.0
+    return pd.DataFrame([{
+        'intercepto': intercept, 'coeficiente': slope, 'r2': r2, 'n': len(df),
+        'preco_min': x.min(), 'preco_max': x.max(),
+    }])
+
+def run(df=None):
+    """
+    Gera os dados resumidos das visualizações da análise exploratória.
+    - Carrega os dados limpos (ou usa o DataFrame recebido do orquestrador).
+    - Boxplot de pontos por posição: quartis, bigodes e um conjunto limitado de outliers.
+    - Preço vs. pontos: histograma 2D por posição e a reta de regressão.
+    As tabelas têm tamanho fixo (não crescem com o número de temporadas); a página monta as figuras.
+    """
+    print("\n--- INICIANDO: [4/9] Geração de Gráficos de Exploração ---")
+
+    if df is None:
+        if not os.path.exists(CONSOLIDATED_DATASET_PATH):
+            print(f"ERRO: Dataset consolidado não encontrado em '{CONSOLIDATED_DATASET_PATH}'.")
+            print("Execute os scripts anteriores primeiro.")
+            return False
+
+        df = load_consolidated(columns=COLUMNS)
+    else:
+        df = df[COLUMNS]
     os.makedirs(VISUALIZATION_DATA_PATH, exist_ok=True)
     print(f"  - Dados limpos carregados. Shape: {df.shape}")
 
     # 1. Boxplot de Pontos por Posição
-    print("  - Gerando Boxplot de Pontos por Posição...")
-    fig_box_pos = px.box(df, x='posicao_id', y='pontos_num', color='posicao_id',
-                         title='Distribuição de Pontos por Posição',
-                         labels={'posicao_id': 'Posição', 'pontos_num': 'Pontos na Rodada'})
-    pio.write_json(fig_box_pos, os.path.join(VISUALIZATION_DATA_PATH, 'boxplot_pontos_posicao.json'))
-
-    # 2. Scatter Plot de Preço vs. Pontos
-    print("  - Gerando Scatter Plot de Preço vs. Pontos...")
+    print("  - Calculando estatísticas do Boxplot de Pontos por Posição...")
+    stats, outliers = box_stats(df)
+    stats.to_parquet(BOXPLOT_STATS_FILE, index=False)
+    outliers.to_parquet(BOXPLOT_OUTLIERS_FILE, index=False)
+
+    # 2. Densidade e Regressão de Preço vs. Pontos
+    print("  - Calculando densidade e regressão de Preço vs. Pontos...")
     df_com_pontos = df[df['pontos_num'] > 0]
     if not df_com_pontos.empty:
-        df_sample = df_com_pontos.sample(min(20000, len(df_com_pontos)))
-        fig_scatter_preco_pontos = px.scatter(
-            df_sample,
-            x='preco_num',
-            y='pontos_num',
-            color='posicao_id',
-            trendline="ols",
-            trendline_scope="overall",
-            title='Relação Preço vs. Pontos (Amostra com Linha de Tendência)',
-            labels={'preco_num': 'Preço (C$)', 'pontos_num': 'Pontos na Rodada'}
-        )
-        pio.write_json(fig_scatter_preco_pontos, os.path.join(VISUALIZATION_DATA_PATH, 'scatter_preco_pontos.json'))
+        price_points_density(df_com_pontos).to_parquet(DENSITY_FILE, index=False)
+        price_points_regression(df_com_pontos).to_parquet(REGRESSION_FILE, index=False)
     else:
         print("  - AVISO: Nenhum dado com pontos > 0 encontrado. Gráfico de dispersão não foi gerado.")
 
-    print("--- SUCESSO: [4/5] Geração de Gráficos Concluída ---")
+    print("--- SUCESSO: [4/9] Geração de Gráficos Concluída ---")
     return True
 
 if __name__ == "__main__":
     if not run():
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -1,52 +1,132 @@
-import pandas as pd
 import numpy as np
 import os
 import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.config import CONSOLIDATED_OUTPUT_FILE, AGGREGATED_OUTPUT_FILE
+from src.config import (CONSOLIDATED_DATASET_PATH, AGGREGATED_OUTPUT_FILE, AGGREGATED_SEASON_FILE,
+                        AGGREGATED_CLUB_FILE, AGGREGATED_POSITION_FILE)
+from src.armazenamento import load_consolidated, arrow_path, publish_arrow
 
-def run():
+# Tabelas do cubo (arquivo parquet de cada uma); todas também vão para o armazenamento Arrow
+CUBE_FILES = [AGGREGATED_OUTPUT_FILE, AGGREGATED_SEASON_FILE, AGGREGATED_CLUB_FILE, AGGREGATED_POSITION_FILE]
+
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [CONSOLIDATED_DATASET_PATH]
+OUTPUTS = CUBE_FILES + [arrow_path(path) for path in CUBE_FILES]
+# Só roda depois que a verificação dos dados passar
+DEPENDS = ['02_verificacao']
+# Colunas do dataset consolidado usadas por esta etapa
+ORDER_COLS = ['ano', 'rodada_id']
+COLUMNS = ['atleta_id', 'apelido', 'clube.nome', 'posicao_id', 'pontos_num', 'preco_num'] + ORDER_COLS
+
+def base_rows(df):
+    """
+    Prepara as linhas jogador-rodada para o cubo em uma única ordenação por (atleta_id, ano, rodada_id).
+    - Técnicos ficam de fora; rodadas repetidas em dois arquivos brutos viram uma linha (a última).
+    - 'jogou' (pontos != 0) e 'pontos_quad' são colunas, então os agregados usam só funções nativas.
+    """
+    df = df[df['posicao_id'] != 'tec']
+    df = df.sort_values(['atleta_id'] + ORDER_COLS, kind='stable')
+    df = df.drop_duplicates(['atleta_id'] + ORDER_COLS, keep='last').reset_index(drop=True)
+    pontos = df['pontos_num'].to_numpy(dtype='float64')
+    return df.assign(pontos_num=pontos, preco_num=df['preco_num'].to_numpy(dtype='float64'),
+                     pontos_quad=pontos ** 2, jogou=pontos != 0)
+
+def finish_player_table(sums):
+    """Converte as somas (n, total, soma dos quadrados, jogos, soma dos preços) nas métricas por atleta."""
+    n = sums['linhas'].to_numpy(dtype='float64')
+    total = sums['total_pontos'].to_numpy()
+    # Desvio padrão amostral (ddof=1) a partir das somas; com uma linha só, 0
+    var = np.divide(sums['soma_quad'].to_numpy() - total ** 2 / n, n - 1, out=np.zeros_like(n), where=n > 1)
+    out = sums.assign(
+        media_pontos=total / n,
+        std_pontos=np.sqrt(np.clip(var, 0, None)),
+        media_preco=sums['soma_preco'].to_numpy() / n,
+    )
+    out['custo_beneficio_medio'] = (out['media_pontos'] / out['media_preco']).replace([np.inf, -np.inf], 0).fillna(0)
+    return out
+
+def aggregation_cube(df):
+    """
+    Calcula o cubo de agregação sobre as linhas de base_rows, sem funções Python por grupo.
+    - Atleta por temporada: somas por (atleta_id, ano); apelido, clube e posição da última rodada da temporada.
+    - Atleta (histórico): as somas por temporada somadas de novo, com os dados da última temporada.
+    - Clube por temporada e posição por rodada: agregados diretos das linhas.
+    Retorna {caminho do parquet: DataFrame}.
+    """
+    sums = dict(linhas=('pontos_num', 'size'), total_pontos=('pontos_num', 'sum'), soma_quad=('pontos_quad', 'sum'),
+                jogos_disputados=('jogou', 'sum'), soma_preco=('preco_num', 'sum'))
+    info = df[['atleta_id', 'ano', 'apelido', 'clube.nome', 'posicao_id']]
+
+    # Linhas já ordenadas por (atleta_id, ano, rodada_id): a última de cada grupo é a rodada mais recente
+    por_temporada = df.groupby(['atleta_id', 'ano'], sort=True).agg(**sums).reset_index()
+    ultima_temporada = info.drop_duplicates(['atleta_id', 'ano'], keep='last')
+    por_temporada = por_temporada.merge(ultima_temporada, on=['atleta_id', 'ano'], how='left', validate='one_to_one')
+
+    historico = por_temporada.groupby('atleta_id', sort=True)[['linhas', 'total_pontos', 'soma_quad', 'jogos_disputados', 'soma_preco']].sum()
+    ultima = por_temporada.drop_duplicates('atleta_id', keep='last').set_index('atleta_id')[['apelido', 'clube.nome', 'posicao_id']]
+    historico = historico.join(ultima).reset_index()
+
+    player_cols = ['total_pontos', 'media_pontos', 'std_pontos', 'jogos_disputados', 'media_preco']
+    renames = {'clube.nome': 'ultimo_clube', 'posicao_id': 'posicao'}
+    atleta = finish_player_table(historico).rename(columns=renames)
+    atleta = atleta[['atleta_id', 'apelido'] + player_cols + ['ultimo_clube', 'posicao', 'custo_beneficio_medio']]
+    atleta = atleta.sort_values(['media_pontos', 'atleta_id'], ascending=[False, True])
+
+    temporada = finish_player_table(por_temporada).rename(columns=renames)
+    temporada = temporada[['atleta_id', 'ano', 'apelido'] + player_cols + ['ultimo_clube', 'posicao', 'custo_beneficio_medio']]
+
+    clube = df.groupby(['ano', 'clube.nome'], sort=True, observed=True).agg(
+        atletas=('atleta_id', 'nunique'), jogos=('jogou', 'sum'),
+        total_pontos=('pontos_num', 'sum'), media_preco=('preco_num', 'mean'),
+    ).reset_index().rename(columns={'clube.nome': 'clube'})
+    clube['media_pontos_jogo'] = (clube['total_pontos'] / clube['jogos']).where(clube['jogos'] > 0, 0)
+
+    jogos = df[df['jogou']]
+    posicao = jogos.groupby(['ano', 'rodada_id', 'posicao_id'], sort=True, observed=True).agg(
+        jogos=('pontos_num', 'size'), media_pontos=('pontos_num', 'mean'), mediana_pontos=('pontos_num', 'median'),
+        max_pontos=('pontos_num', 'max'), media_preco=('preco_num', 'mean'),
+    ).reset_index().rename(columns={'posicao_id': 'posicao'})
+
+    return {
+        AGGREGATED_OUTPUT_FILE: atleta,
+        AGGREGATED_SEASON_FILE: temporada,
+        AGGREGATED_CLUB_FILE: clube,
+        AGGREGATED_POSITION_FILE: posicao,
+    }
+
+def run(df=None):
     """
-    Realiza a agregação de dados por atleta.
-    - Carrega os dados limpos.
-    - Agrupa por jogador e calcula métricas de desempenho (média de pontos, etc.).
-    - Salva o DataFrame agregado em formato parquet.
+    Realiza a agregação dos dados em várias granularidades (cubo).
+    - Carrega os dados limpos (ou usa o DataFrame recebido do orquestrador).
+    - Calcula, a partir de uma única ordenação por (atleta_id, ano, rodada_id), as tabelas por atleta,
+      por atleta e temporada, por clube e temporada e por posição e rodada.
+    - Salva cada tabela em parquet (e a cópia Arrow), para as páginas consultarem sem reagregar.
     """
-    print("\n--- INICIANDO: [5/5] Agregação de Dados por Atleta ---")
+    print("\n--- INICIANDO: [5/9] Agregação de Dados por Atleta ---")
 
-    if not os.path.exists(CONSOLIDATED_OUTPUT_FILE):
-        print(f"ERRO: Arquivo de dados consolidados não encontrado em '{CONSOLIDATED_OUTPUT_FILE}'.")
-        print("Execute os scripts anteriores (01, 02, 03) primeiro.")
-        return False
+    if df is None:
+        if not os.path.exists(CONSOLIDATED_DATASET_PATH):
+            print(f"ERRO: Dataset consolidado não encontrado em '{CONSOLIDATED_DATASET_PATH}'.")
+            print("Execute os scripts anteriores (01, 02, 03) primeiro.")
+            return False
 
-    df = pd.read_parquet(CONSOLIDATED_OUTPUT_FILE)
+        df = load_consolidated(columns=COLUMNS)
+    else:
+        df = df[COLUMNS]
     print(f"  - Dados limpos carregados. Shape: {df.shape}")
 
-    print("  - Agregando dados por jogador...")
-    df_jogadores = df[df['posicao_id'] != 'tec']
-
-    player_agg = df_jogadores.groupby(['atleta_id', 'apelido']).agg(
-        total_pontos=('pontos_num', 'sum'),
-        media_pontos=('pontos_num', 'mean'),
-        std_pontos=('pontos_num', 'std'),
-        jogos_disputados=('pontos_num', lambda x: (x != 0).sum()),
-        media_preco=('preco_num', 'mean'),
-        ultimo_clube=('clube.nome', 'last'),
-        posicao=('posicao_id', 'last')
-    ).reset_index()
-
-    player_agg['std_pontos'] = player_agg['std_pontos'].fillna(0)
-    
-    player_agg['custo_beneficio_medio'] = (player_agg['media_pontos'] / player_agg['media_preco']).replace([np.inf, -np.inf], 0).fillna(0)
-    
-    player_agg_sorted = player_agg.sort_values(by='media_pontos', ascending=False)
-    
+    print("  - Agregando dados por atleta, atleta-temporada, clube-temporada e posição-rodada...")
+    cube = aggregation_cube(base_rows(df))
+
     os.makedirs(os.path.dirname(AGGREGATED_OUTPUT_FILE), exist_ok=True)
-    player_agg_sorted.to_parquet(AGGREGATED_OUTPUT_FILE, index=False)
-    
+    for path, table in cube.items():
+        table.to_parquet(path, index=False)
+        publish_arrow(table, path)
+        print(f"    - '{os.path.basename(path)}' salvo. Shape: {table.shape}")
+
     print(f"  - Análise agregada por atleta salva em '{AGGREGATED_OUTPUT_FILE}'")
-    print("--- SUCESSO: [5/5] Agregação de Dados Concluída ---")
+    print("--- SUCESSO: [5/9] Agregação de Dados Concluída ---")
     return True
 
 if __name__ == "__main__":
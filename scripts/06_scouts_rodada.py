@@ -0,0 +1,81 @@
+import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.config import CONSOLIDATED_DATASET_PATH, SCOUTS_ROUND_OUTPUT_FILE, SCOUT_COLS
+from src.armazenamento import load_consolidated, arrow_path, publish_arrow
+
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [CONSOLIDATED_DATASET_PATH]
+OUTPUTS = [SCOUTS_ROUND_OUTPUT_FILE, arrow_path(SCOUTS_ROUND_OUTPUT_FILE)]
+# Só roda depois que a verificação dos dados passar
+DEPENDS = ['02_verificacao']
+# Colunas do dataset consolidado usadas por esta etapa
+KEY_COLS = ['atleta_id', 'ano', 'rodada_id']
+COLUMNS = KEY_COLS + SCOUT_COLS
+
+def scout_deltas(df):
+    """
+    Converte os scouts acumulados na temporada em scouts da rodada, sem laços em Python.
+    - Uma única ordenação por (atleta_id, ano, rodada_id); rodadas repetidas em dois arquivos brutos
+      (ex.: 'rodada-0.csv' e 'rodada-1.csv' de 2022) ficam com o maior acumulado.
+    - O acumulado passa por um máximo corrente por (atleta_id, ano), então correções para baixo
+      nos dados brutos não geram scouts negativos.
+    - Se o atleta não aparece em algumas rodadas, a diferença cobre todo o intervalo, e a coluna
+      'rodadas_acumuladas' diz quantas rodadas ela soma (1 = só a rodada da linha).
+    """
+    df = df.groupby(KEY_COLS, sort=True, observed=True)[SCOUT_COLS].max().reset_index()
+    acumulado = df.groupby(['atleta_id', 'ano'], sort=False)[SCOUT_COLS].cummax().to_numpy()
+
+    # Primeira linha de cada (atleta_id, ano): o acumulado anterior é zero
+    inicio = np.ones(len(df), dtype=bool)
+    inicio[1:] = (df['atleta_id'].to_numpy()[1:] != df['atleta_id'].to_numpy()[:-1]) | \
+                 (df['ano'].to_numpy()[1:] != df['ano'].to_numpy()[:-1])
+
+    anterior = np.zeros_like(acumulado)
+    anterior[1:] = acumulado[:-1]
+    anterior[inicio] = 0
+    df[SCOUT_COLS] = (acumulado - anterior).astype('int16')
+
+    rodada = df['rodada_id'].to_numpy()
+    rodada_anterior = np.zeros_like(rodada)
+    rodada_anterior[1:] = rodada[:-1]
+    rodada_anterior[inicio] = 0
+    df['rodadas_acumuladas'] = (rodada - rodada_anterior).astype('int8')
+    return df
+
+def run(df=None):
+    """
+    Gera os scouts por rodada a partir dos scouts acumulados da temporada.
+    - Carrega os dados limpos (ou usa o DataFrame recebido do orquestrador).
+    - Calcula a diferença entre rodadas consecutivas de cada atleta na temporada.
+    - Salva o resultado em parquet, ao lado do dataset consolidado.
+    """
+    print("\n--- INICIANDO: [6/9] Scouts por Rodada ---")
+
+    if df is None:
+        if not os.path.exists(CONSOLIDATED_DATASET_PATH):
+            print(f"ERRO: Dataset consolidado não encontrado em '{CONSOLIDATED_DATASET_PATH}'.")
+            print("Execute os scripts anteriores primeiro.")
+            return False
+
+        df = load_consolidated(columns=COLUMNS)
+    else:
+        df = df[COLUMNS]
+    print(f"  - Dados limpos carregados. Shape: {df.shape}")
+
+    print("  - Calculando a diferença dos scouts acumulados por atleta e temporada...")
+    deltas = scout_deltas(df)
+
+    os.makedirs(os.path.dirname(SCOUTS_ROUND_OUTPUT_FILE), exist_ok=True)
+    deltas.to_parquet(SCOUTS_ROUND_OUTPUT_FILE, index=False)
+    publish_arrow(deltas, SCOUTS_ROUND_OUTPUT_FILE)
+
+    print(f"  - Scouts por rodada salvos em '{SCOUTS_ROUND_OUTPUT_FILE}'. Shape: {deltas.shape}")
+    print("--- SUCESSO: [6/9] Scouts por Rodada Concluídos ---")
+    return True
+
+if __name__ == "__main__":
+    if not run():
+        sys.exit(1)
@@ -0,0 +1,160 @@
+import json
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.config import (CONSOLIDATED_DATASET_PATH, FORM_OUTPUT_FILE, FORM_STATE_FILE, FORM_ROUNDS_FILE,
+                        FORM_WINDOW, FORM_EWMA_SPAN)
+from src.armazenamento import load_consolidated, arrow_path, publish_arrow
+from src.manifesto import frame_fingerprints
+
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [CONSOLIDATED_DATASET_PATH]
+OUTPUTS = [FORM_OUTPUT_FILE, arrow_path(FORM_OUTPUT_FILE), FORM_STATE_FILE, FORM_ROUNDS_FILE]
+# Só roda depois que a verificação dos dados passar
+DEPENDS = ['02_verificacao']
+# Colunas do dataset consolidado usadas por esta etapa
+COLUMNS = ['atleta_id', 'ano', 'rodada_id', 'pontos_num']
+
+# janela_1 é o jogo mais recente; janela_N, o mais antigo ainda dentro da janela
+WINDOW_COLS = [f'janela_{i}' for i in range(1, FORM_WINDOW + 1)]
+STATE_COLS = WINDOW_COLS + ['jogos', 'ewma_pontos', 'ultima_rodada']
+
+def round_fingerprints(games):
+    """Hash do conteúdo (atleta_id e pontos) de cada rodada ('ano/rodada_id'), para detectar rodadas alteradas."""
+    fp = frame_fingerprints(games, ['ano', 'rodada_id'], ['atleta_id', 'rodada_id', 'pontos_num'])
+    return {f"{ano}/{rodada}": digest for (ano, rodada), digest in fp.items()}
+
+def load_form_state():
+    """
+    Carrega o estado incremental (índice (atleta_id, ano)) e as rodadas já incorporadas.
+    Se não existir, ou se a janela ou o span mudaram na configuração, começa do zero.
+    """
+    empty = pd.DataFrame(columns=STATE_COLS, index=pd.MultiIndex.from_arrays([[], []], names=['atleta_id', 'ano']), dtype=float)
+    try:
+        with open(FORM_ROUNDS_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('janela') != FORM_WINDOW or meta.get('span') != FORM_EWMA_SPAN:
+            return empty, {}
+        state = pd.read_parquet(FORM_STATE_FILE).set_index(['atleta_id', 'ano']).astype(float)
+        return state[STATE_COLS], meta['rodadas']
+    except (OSError, ValueError, KeyError):
+        return empty, {}
+
+def save_form_state(state, rounds):
+    """Salva o estado e as rodadas incorporadas (o JSON por último: ele valida o parquet)."""
+    state = state.reset_index().astype({'atleta_id': 'int32', 'ano': 'int16', 'jogos': 'int16', 'ultima_rodada': 'int16'})
+    state.to_parquet(FORM_STATE_FILE, index=False)
+    tmp_path = f"{FORM_ROUNDS_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'janela': FORM_WINDOW, 'span': FORM_EWMA_SPAN, 'rodadas': rounds}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, FORM_ROUNDS_FILE)
+
+def fold_round(state, games, alpha):
+    """
+    Incorpora ao estado os jogos de uma mesma rodada (de uma ou mais temporadas), sem tocar no histórico:
+    a janela anda uma posição, a EWMA recebe o novo ponto e o contador de jogos aumenta.
+    """
+    keys = pd.MultiIndex.from_frame(games[['atleta_id', 'ano']])
+    novos = keys.difference(state.index)
+    if len(novos):
+        state = state.reindex(state.index.append(novos))
+    pos = state.index.get_indexer(keys)
+    pontos = games['pontos_num'].to_numpy(dtype=float)
+
+    window = state[WINDOW_COLS].to_numpy(copy=True)
+    window[pos, 1:] = window[pos, :-1]
+    window[pos, 0] = pontos
+
+    jogos = state['jogos'].fillna(0).to_numpy(copy=True)
+    ewma = state['ewma_pontos'].to_numpy(copy=True)
+    ewma[pos] = np.where(jogos[pos] > 0, alpha * pontos + (1 - alpha) * ewma[pos], pontos)
+    jogos[pos] += 1
+    ultima = state['ultima_rodada'].to_numpy(copy=True)
+    ultima[pos] = games['rodada_id'].to_numpy()
+
+    return pd.DataFrame(np.column_stack([window, jogos, ewma, ultima]), index=state.index, columns=STATE_COLS)
+
+def form_table(state):
+    """Métricas de forma da última temporada de cada atleta, uma linha por atleta_id."""
+    window = state[WINDOW_COLS].to_numpy(copy=True)
+    n = (~np.isnan(window)).sum(axis=1)
+    media = np.nansum(window, axis=1) / n
+    desvio = np.nansum((window - media[:, None]) ** 2, axis=1)
+    std = np.sqrt(np.divide(desvio, n - 1, out=np.zeros_like(desvio), where=n > 1))
+
+    forma = pd.DataFrame({
+        'atleta_id': state.index.get_level_values('atleta_id').astype('int32'),
+        'ano': state.index.get_level_values('ano').astype('int16'),
+        'ultima_rodada': state['ultima_rodada'].to_numpy().astype('int16'),
+        'jogos_temporada': state['jogos'].to_numpy().astype('int16'),
+        'jogos_janela': n.astype('int8'),
+        'media_forma': media.astype('float32'),
+        'std_forma': std.astype('float32'),
+        'ewma_pontos': state['ewma_pontos'].to_numpy().astype('float32'),
+    })
+    forma = forma.sort_values(['atleta_id', 'ano']).drop_duplicates('atleta_id', keep='last')
+    return forma.reset_index(drop=True)
+
+def run(df=None):
+    """
+    Mantém as métricas de forma recente de cada atleta por temporada.
+    - Média e desvio padrão móveis dos últimos FORM_WINDOW jogos e EWMA (span FORM_EWMA_SPAN) de pontos_num.
+    - Incremental: só as rodadas ainda não incorporadas ao estado salvo são processadas, em ordem.
+    - Uma temporada é refeita do zero se uma rodada já incorporada mudou ou sumiu, ou se chegou
+      uma rodada anterior à última incorporada.
+    - Salva a tabela de forma (uma linha por atleta_id) e o estado.
+    """
+    print("\n--- INICIANDO: [7/9] Forma Recente dos Atletas ---")
+
+    if df is None:
+        if not os.path.exists(CONSOLIDATED_DATASET_PATH):
+            print(f"ERRO: Dataset consolidado não encontrado em '{CONSOLIDATED_DATASET_PATH}'.")
+            print("Execute os scripts anteriores primeiro.")
+            return False
+
+        df = load_consolidated(columns=COLUMNS)
+    else:
+        df = df[COLUMNS]
+
+    # Jogos disputados (mesmo critério de 05_agregacao); rodadas repetidas em dois arquivos ficam com a última linha
+    games = df[df['pontos_num'] != 0].drop_duplicates(['atleta_id', 'ano', 'rodada_id'], keep='last')
+    fingerprints = round_fingerprints(games)
+    state, rounds = load_form_state()
+
+    parsed = {key: tuple(map(int, key.split('/'))) for key in set(rounds) | set(fingerprints)}
+    ultima_por_ano = {}
+    for ano, rodada in (parsed[key] for key in rounds):
+        ultima_por_ano[ano] = max(ultima_por_ano.get(ano, 0), rodada)
+    refazer = {parsed[key][0] for key, fp in rounds.items() if fingerprints.get(key) != fp}
+    refazer |= {parsed[key][0] for key in fingerprints
+                if key not in rounds and parsed[key][1] < ultima_por_ano.get(parsed[key][0], 0)}
+    if refazer:
+        print(f"  - Refazendo do zero as temporadas: {sorted(refazer)}")
+        state = state[~state.index.get_level_values('ano').isin(refazer)]
+        rounds = {key: fp for key, fp in rounds.items() if parsed[key][0] not in refazer}
+
+    novas = [parsed[key] for key in fingerprints if key not in rounds]
+    print(f"  - Rodadas já incorporadas: {len(rounds)} | novas: {len(novas)}")
+
+    alpha = 2 / (FORM_EWMA_SPAN + 1)
+    novos_jogos = games[pd.MultiIndex.from_frame(games[['ano', 'rodada_id']]).isin(novas)]
+    for _, jogos_rodada in novos_jogos.groupby('rodada_id', sort=True):
+        state = fold_round(state, jogos_rodada, alpha)
+    rounds.update({key: fp for key, fp in fingerprints.items() if key not in rounds})
+
+    os.makedirs(os.path.dirname(FORM_OUTPUT_FILE), exist_ok=True)
+    save_form_state(state, rounds)
+    forma = form_table(state)
+    forma.to_parquet(FORM_OUTPUT_FILE, index=False)
+    publish_arrow(forma, FORM_OUTPUT_FILE)
+
+    print(f"  - Forma recente salva em '{FORM_OUTPUT_FILE}'. Shape: {forma.shape}")
+    print("--- SUCESSO: [7/9] Forma Recente Concluída ---")
+    return True
+
+if __name__ == "__main__":
+    if not run():
+        sys.exit(1)
@@ -0,0 +1,86 @@
+import json
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.config import (SCOUTS_ROUND_OUTPUT_FILE, AGGREGATED_OUTPUT_FILE, SIMILARITY_INDEX_FILE, SIMILARITY_STATE_FILE,
+                        SIMILARITY_SEASONS_FILE, SIMILARITY_MIN_GAMES, SCOUT_COLS)
+from src.armazenamento import arrow_path, publish_arrow
+from src.manifesto import frame_fingerprints
+from src.similaridade import build_similarity_index
+
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [SCOUTS_ROUND_OUTPUT_FILE, AGGREGATED_OUTPUT_FILE]
+OUTPUTS = [SIMILARITY_INDEX_FILE, arrow_path(SIMILARITY_INDEX_FILE), SIMILARITY_STATE_FILE, SIMILARITY_SEASONS_FILE]
+PARAMS = {'min_jogos': SIMILARITY_MIN_GAMES}
+
+def season_fingerprints(scouts):
+    """
+    Hash do conteúdo (atleta_id e scouts de cada linha) de cada temporada, para detectar temporadas alteradas:
+    um scout que passa de um atleta para outro, ou de uma coluna para outra, muda a impressão digital.
+    """
+    return {str(ano): digest for ano, digest in frame_fingerprints(scouts, 'ano', ['atleta_id'] + SCOUT_COLS).items()}
+
+def load_similarity_state():
+    """Carrega as somas de scouts por (atleta_id, ano) e as impressões digitais das temporadas somadas."""
+    try:
+        with open(SIMILARITY_SEASONS_FILE, 'r', encoding='utf-8') as f:
+            seasons = json.load(f)
+        return pd.read_parquet(SIMILARITY_STATE_FILE), seasons
+    except (OSError, ValueError):
+        return pd.DataFrame(columns=['atleta_id', 'ano'] + SCOUT_COLS), {}
+
+def save_similarity_state(state, seasons):
+    """Salva o estado (o JSON por último: ele valida o parquet)."""
+    state.to_parquet(SIMILARITY_STATE_FILE, index=False)
+    tmp_path = f"{SIMILARITY_SEASONS_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(seasons, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, SIMILARITY_SEASONS_FILE)
+
+def run():
+    """
+    Mantém o índice de similaridade de atletas (ver src/similaridade.py).
+    - Soma os scouts da rodada por (atleta_id, ano); só as temporadas novas ou alteradas são somadas de novo,
+      e as que saíram da janela de anos são descartadas do estado.
+    - Divide as somas de todas as temporadas pelos jogos disputados e padroniza as taxas por posição.
+    - Salva o índice em parquet (e a cópia Arrow) e o estado incremental.
+    """
+    print("\n--- INICIANDO: [8/9] Índice de Similaridade ---")
+
+    for path in INPUTS:
+        if not os.path.exists(path):
+            print(f"ERRO: Arquivo de entrada não encontrado em '{path}'.")
+            print("Execute as etapas 05_agregacao e 06_scouts_rodada primeiro.")
+            return False
+
+    scouts = pd.read_parquet(SCOUTS_ROUND_OUTPUT_FILE, columns=['atleta_id', 'ano'] + SCOUT_COLS)
+    fingerprints = season_fingerprints(scouts)
+    state, seasons = load_similarity_state()
+
+    alteradas = sorted(ano for ano, fp in fingerprints.items() if seasons.get(ano) != fp)
+    removidas = sorted(set(seasons) - set(fingerprints))
+    print(f"  - Temporadas já somadas: {len(seasons) - len(removidas)} | novas/alteradas: {alteradas} | removidas: {removidas}")
+
+    if alteradas or removidas:
+        manter = ~state['ano'].astype(str).isin(alteradas + removidas)
+        novas = scouts[scouts['ano'].astype(str).isin(alteradas)].groupby(['atleta_id', 'ano'], sort=True)[SCOUT_COLS].sum().reset_index()
+        state = pd.concat([state[manter], novas], ignore_index=True).astype({col: 'int32' for col in SCOUT_COLS})
+        state = state.astype({'atleta_id': 'int32', 'ano': 'int16'}).sort_values(['atleta_id', 'ano']).reset_index(drop=True)
+
+    jogadores = pd.read_parquet(AGGREGATED_OUTPUT_FILE)
+    index = build_similarity_index(state.groupby('atleta_id')[SCOUT_COLS].sum().reset_index(), jogadores)
+
+    os.makedirs(os.path.dirname(SIMILARITY_INDEX_FILE), exist_ok=True)
+    save_similarity_state(state, fingerprints)
+    index.to_parquet(SIMILARITY_INDEX_FILE, index=False)
+    publish_arrow(index, SIMILARITY_INDEX_FILE)
+
+    print(f"  - Índice de similaridade salvo em '{SIMILARITY_INDEX_FILE}'. Shape: {index.shape}")
+    print("--- SUCESSO: [8/9] Índice de Similaridade Concluído ---")
+    return True
+
+if __name__ == "__main__":
+    if not run():
+        sys.exit(1)
@@ -0,0 +1,180 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.config import (CONSOLIDATED_DATASET_PATH, SCOUTS_ROUND_OUTPUT_FILE, PREDICTIONS_OUTPUT_FILE, PREDICTION_MODEL_FILE,
+                        PREDICTION_FEATURES_PATH, PREDICTION_FEATURES_STATE_FILE, PREDICTION_WINDOWS,
+                        PREDICTION_RIDGE_ALPHA, PREDICTION_HOLDOUT_ROUNDS, SCOUT_COLS)
+from src.armazenamento import load_consolidated, arrow_path, publish_arrow
+from src.manifesto import frame_fingerprints
+from src.previsao import KEY_COLS, FEATURE_COLS, player_rounds, add_next_round, season_features, fit_ridge, predict
+
+# Entradas e saídas declaradas para o orquestrador (scripts/run_pipeline.py)
+INPUTS = [CONSOLIDATED_DATASET_PATH, SCOUTS_ROUND_OUTPUT_FILE]
+OUTPUTS = [PREDICTIONS_OUTPUT_FILE, arrow_path(PREDICTIONS_OUTPUT_FILE), PREDICTION_MODEL_FILE,
+           PREDICTION_FEATURES_PATH, PREDICTION_FEATURES_STATE_FILE]
+# Só roda depois que a verificação dos dados passar
+DEPENDS = ['02_verificacao']
+# Colunas do dataset consolidado usadas por esta etapa
+COLUMNS = KEY_COLS + ['apelido', 'clube_id', 'posicao_id', 'pontos_num', 'preco_num', 'variacao_num']
+PARAMS = {'janelas': PREDICTION_WINDOWS, 'alpha': PREDICTION_RIDGE_ALPHA, 'validacao': PREDICTION_HOLDOUT_ROUNDS}
+
+def season_fingerprints(rows):
+    """
+    Hash do conteúdo (cada linha jogador-rodada, com pontos, preços e scouts) de cada temporada, para detectar
+    temporadas alteradas mesmo quando a correção só troca valores entre atletas ou rodadas.
+    """
+    columns = COLUMNS + SCOUT_COLS
+    return {str(ano): digest for ano, digest in frame_fingerprints(rows, 'ano', columns).items()}
+
+def features_path(ano):
+    return os.path.join(PREDICTION_FEATURES_PATH, f"ano={ano}.parquet")
+
+def load_features_state():
+    """Impressões digitais das temporadas em cache; vazio se não existir ou se as janelas mudaram na configuração."""
+    try:
+        with open(PREDICTION_FEATURES_STATE_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('janelas') != PREDICTION_WINDOWS or meta.get('features') != FEATURE_COLS:
+            return {}
+        return meta['temporadas']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def save_features_state(seasons):
+    """Salva as impressões digitais (depois dos parquets das temporadas: o JSON os valida)."""
+    tmp_path = f"{PREDICTION_FEATURES_STATE_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'janelas': PREDICTION_WINDOWS, 'features': FEATURE_COLS, 'temporadas': seasons}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, PREDICTION_FEATURES_STATE_FILE)
+
+def feature_matrix(rows):
+    """
+    Matriz de features de todas as temporadas, com cache em disco por temporada: só as temporadas novas
+    ou alteradas são recalculadas, e as que saíram da janela de anos são apagadas do cache.
+    """
+    fingerprints = season_fingerprints(rows)
+    seasons = load_features_state()
+    os.makedirs(PREDICTION_FEATURES_PATH, exist_ok=True)
+
+    alteradas = sorted(ano for ano, fp in fingerprints.items() if seasons.get(ano) != fp or not os.path.exists(features_path(ano)))
+    removidas = sorted(set(seasons) - set(fingerprints))
+    print(f"  - Temporadas em cache: {len(fingerprints) - len(alteradas)} | recalculadas: {alteradas} | removidas: {removidas}")
+
+    for ano in removidas:
+        if os.path.exists(features_path(ano)):
+            os.remove(features_path(ano))
+    for ano in alteradas:
+        season = season_features(add_next_round(rows[rows['ano'] == int(ano)]))
+        season.to_parquet(features_path(ano), index=False)
+    save_features_state(fingerprints)
+
+    return pd.concat([pd.read_parquet(features_path(ano)) for ano in sorted(fingerprints)], ignore_index=True)
+
+def validate(train):
+    """
+    Treina sem as últimas PREDICTION_HOLDOUT_ROUNDS rodadas da temporada mais recente e mede o erro absoluto médio
+    nelas, comparado ao de usar a média da temporada até a rodada anterior como previsão.
+    """
+    ano = train['ano'].max()
+    corte = train.loc[train['ano'] == ano, 'rodada_id'].max() - PREDICTION_HOLDOUT_ROUNDS
+    teste = (train['ano'] == ano) & (train['rodada_id'] > corte)
+    if not teste.any() or teste.all():
+        return {}
+    model = fit_ridge(train.loc[~teste, FEATURE_COLS], train.loc[~teste, 'pontos_num'])
+    y = train.loc[teste, 'pontos_num'].to_numpy()
+    previsto = predict(model, train.loc[teste, FEATURE_COLS])
+    return {
+        'linhas_validacao': int(teste.sum()),
+        'mae_modelo': round(float(np.abs(previsto - y).mean()), 4),
+        'mae_media_temporada': round(float(np.abs(train.loc[teste, 'media_temporada_ant'].to_numpy() - y).mean()), 4),
+    }
+
+def run(df=None):
+    """
+    Prevê os pontos da próxima rodada de cada atleta (ver src/previsao.py).
+    - Monta a matriz de features jogador-rodada (cache em disco por temporada) com scouts da etapa 06.
+    - Valida o modelo nas últimas rodadas, treina a regressão ridge com todas as rodadas disputadas
+      e pontua numa única chamada os atletas da última temporada dos dados.
+    - Só usa o histórico (a saída depende apenas de INPUTS e PARAMS): o mercado ao vivo (status e preço atual)
+      é juntado às previsões por atleta_id nas páginas (ver src/otimizador.py e src/indice_atletas.py).
+    - Salva as previsões em parquet (e a cópia Arrow) e o modelo, com métricas e tempos, em JSON.
+    """
+    print("\n--- INICIANDO: [9/9] Previsão de Pontos ---")
+
+    if not os.path.exists(SCOUTS_ROUND_OUTPUT_FILE):
+        print(f"ERRO: Arquivo de entrada não encontrado em '{SCOUTS_ROUND_OUTPUT_FILE}'.")
+        print("Execute a etapa 06_scouts_rodada primeiro.")
+        return False
+    if df is None:
+        if not os.path.exists(CONSOLIDATED_DATASET_PATH):
+            print(f"ERRO: Dataset consolidado não encontrado em '{CONSOLIDATED_DATASET_PATH}'.")
+            print("Execute os scripts anteriores primeiro.")
+            return False
+
+        df = load_consolidated(columns=COLUMNS)
+    else:
+        df = df[COLUMNS]
+
+    inicio = time.perf_counter()
+    rows = player_rounds(df, pd.read_parquet(SCOUTS_ROUND_OUTPUT_FILE, columns=KEY_COLS + SCOUT_COLS))
+    matrix = feature_matrix(rows)
+    tempo_features = time.perf_counter() - inicio
+    print(f"  - Matriz de features: {matrix.shape} em {tempo_features:.2f}s")
+
+    train = matrix[~matrix['proxima'] & matrix['jogou']]
+    metricas = validate(train)
+    if metricas:
+        print(f"  - Validação ({metricas['linhas_validacao']} jogos): MAE do modelo {metricas['mae_modelo']:.3f} | "
+              f"MAE da média da temporada {metricas['mae_media_temporada']:.3f}")
+
+    inicio = time.perf_counter()
+    model = fit_ridge(train[FEATURE_COLS], train['pontos_num'])
+    tempo_treino = time.perf_counter() - inicio
+
+    ano = int(matrix['ano'].max())
+    proximas = matrix[matrix['proxima'] & (matrix['ano'] == ano)]
+    previsoes = proximas[['atleta_id', 'apelido', 'clube_id', 'posicao_id']].reset_index(drop=True)
+    previsoes['posicao'] = previsoes['posicao_id'].astype(str)
+    # Preço da última rodada do atleta nos dados (o preço atual vem do mercado, nas páginas)
+    previsoes['preco_num'] = proximas['preco_ant'].to_numpy()
+    X = proximas[FEATURE_COLS]
+
+    inicio = time.perf_counter()
+    previsoes['pontos_previstos'] = predict(model, X).astype('float32')
+    tempo_inferencia = time.perf_counter() - inicio
+    previsoes['jogos_ant'] = X['jogos_ant'].to_numpy().astype('int16')
+    previsoes['media_temporada_ant'] = X['media_temporada_ant'].to_numpy().astype('float32')
+    previsoes = previsoes[['atleta_id', 'apelido', 'posicao', 'clube_id', 'preco_num', 'jogos_ant',
+                           'media_temporada_ant', 'pontos_previstos']]
+    previsoes = previsoes.sort_values(['pontos_previstos', 'atleta_id'], ascending=[False, True]).reset_index(drop=True)
+    print(f"  - Modelo treinado com {len(train)} jogos em {tempo_treino:.3f}s; "
+          f"{len(previsoes)} atletas pontuados em {tempo_inferencia * 1000:.1f} ms")
+
+    os.makedirs(os.path.dirname(PREDICTIONS_OUTPUT_FILE), exist_ok=True)
+    previsoes.to_parquet(PREDICTIONS_OUTPUT_FILE, index=False)
+    publish_arrow(previsoes, PREDICTIONS_OUTPUT_FILE)
+    with open(PREDICTION_MODEL_FILE, 'w', encoding='utf-8') as f:
+        json.dump({
+            'modelo': model,
+            'temporada_base': ano,
+            'ultima_rodada': int(matrix.loc[matrix['ano'] == ano, 'rodada_id'].max()) - 1,
+            'linhas_treino': int(len(train)),
+            'atletas_previstos': int(len(previsoes)),
+            'tempo_features_s': round(tempo_features, 4),
+            'tempo_treino_s': round(tempo_treino, 4),
+            'tempo_inferencia_s': round(tempo_inferencia, 6),
+            **metricas,
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"  - Previsões salvas em '{PREDICTIONS_OUTPUT_FILE}'. Shape: {previsoes.shape}")
+    print("--- SUCESSO: [9/9] Previsão de Pontos Concluída ---")
+    return True
+
+if __name__ == "__main__":
+    if not run():
+        sys.exit(1)
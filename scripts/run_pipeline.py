@@ -1,50 +1,258 @@
+import argparse
+import contextlib
+import datetime
+import glob
+import hashlib
 import importlib
+import io
+import json
+import threading
 import time
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.config import (ROOT_DIR, CONSOLIDATED_DATASET_PATH, ARROW_STORE_PATH, PIPELINE_STATE_FILE, RUN_REPORT_FILE,
+                        RUN_REPORT_MAX_RUNS)
+from src.manifesto import file_hash, path_fingerprint
+from src.armazenamento import load_consolidated, restore_arrow_copies
+from src.instrumentacao import start_memory_sampler, measure_stage, output_rows, append_run_report
 
 PIPELINE_SCRIPTS = [
     '01_limpeza',
     '02_verificacao',
     '03_analise_descritiva',
     '04_exploracao',
-    '05_agregacao'
+    '05_agregacao',
+    '06_scouts_rodada',
+    '07_forma',
+    '08_similaridade',
+    '09_previsao'
 ]
 
-def main():
+# Número máximo de etapas independentes executadas ao mesmo tempo
+MAX_PARALLEL_STAGES = 3
+
+def load_state():
+    """Carrega as impressões digitais da última execução bem-sucedida de cada etapa."""
+    if not os.path.exists(PIPELINE_STATE_FILE):
+        return {}
+    try:
+        with open(PIPELINE_STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_state(state):
+    """Salva o estado do orquestrador de forma atômica."""
+    os.makedirs(os.path.dirname(PIPELINE_STATE_FILE), exist_ok=True)
+    tmp_path = f"{PIPELINE_STATE_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, PIPELINE_STATE_FILE)
+
+def build_graph(modules):
+    """
+    Monta o DAG a partir das entradas e saídas declaradas por cada etapa.
+    Uma etapa depende das etapas anteriores que produzem alguma de suas entradas (INPUTS x OUTPUTS)
+    e das listadas explicitamente em DEPENDS.
+    """
+    deps = {}
+    for i, name in enumerate(PIPELINE_SCRIPTS):
+        inputs = set(getattr(modules[name], 'INPUTS', []))
+        deps[name] = {prev for prev in PIPELINE_SCRIPTS[:i] if inputs & set(getattr(modules[prev], 'OUTPUTS', []))}
+        deps[name] |= set(getattr(modules[name], 'DEPENDS', []))
+    return deps
+
+def shared_columns(modules):
+    """União das colunas do dataset consolidado usadas pelas etapas (None se alguma usar todas)."""
+    columns = []
+    for module in modules.values():
+        if CONSOLIDATED_DATASET_PATH not in getattr(module, 'INPUTS', []):
+            continue
+        if getattr(module, 'COLUMNS', None) is None:
+            return None
+        columns.extend(col for col in module.COLUMNS if col not in columns)
+    return columns
+
+def code_fingerprint():
+    """Impressão digital do código compartilhado em src/: uma mudança nele invalida todas as etapas."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, 'src', '*.py'))):
+        digest.update(file_hash(path).encode('ascii'))
+    return digest.hexdigest()
+
+def stage_fingerprint(module, shared_code):
+    """Impressão digital de uma etapa: seu código, o código de src/, seus PARAMS e o conteúdo de cada entrada."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(shared_code.encode('ascii'))
+    digest.update(file_hash(module.__file__).encode('ascii'))
+    digest.update(json.dumps(getattr(module, 'PARAMS', {}), sort_keys=True).encode('utf-8'))
+    for path in getattr(module, 'INPUTS', []):
+        digest.update(path_fingerprint(path).encode('ascii'))
+    return digest.hexdigest()
+
+def outputs_present(module):
+    """
+    Verifica se as saídas declaradas da etapa existem. As cópias Arrow (ARROW_STORE_PATH, fora do git) não contam:
+    quando faltam numa etapa pulada, são recriadas a partir dos parquets (ver restore_arrow_copies).
+    """
+    arrow_dir = os.path.join(ARROW_STORE_PATH, '')
+    return all(os.path.exists(path) for path in getattr(module, 'OUTPUTS', []) if not path.startswith(arrow_dir))
+
+class StageOutput(io.TextIOBase):
     """
-    Orquestrador principal do pipeline de dados.
-    Executa cada script do pipeline em sequência e para se algum falhar.
+    sys.stdout durante o pipeline: o que a thread de uma etapa imprime vai para o buffer da etapa (ver run_stage),
+    e o resto, para o stdout original. Um redirect_stdout por etapa não serve com etapas em paralelo, porque
+    sys.stdout é um só para o processo inteiro.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def run_stage(output, script_name, func, **kwargs):
+    """
+    Executa e mede uma etapa (na thread do pool) guardando a sua saída em um buffer próprio.
+    Retorna (sucesso, métricas, texto impresso); um erro inesperado vira falha, com a mensagem no texto.
+    """
+    output.local.buffer = buffer = io.StringIO()
+    try:
+        success, metrics = measure_stage(script_name, func, **kwargs)
+    except Exception as e:
+        print(f"\nERRO FATAL: Ocorreu um erro inesperado ao executar '{script_name}'. Detalhe: {e}")
+        success, metrics = False, None
+    finally:
+        output.local.buffer = None
+    return success, metrics, buffer.getvalue()
+
+def main(forcar=False):
+    """
+    Orquestrador principal do pipeline de dados, executado como um pequeno DAG.
+    - Cada etapa declara INPUTS e OUTPUTS; as dependências vêm desses caminhos (e de DEPENDS).
+    - Etapas cujas entradas e código não mudaram desde a última execução bem-sucedida são puladas;
+      se só as cópias Arrow das saídas faltam (checkout novo), elas são recriadas a partir dos parquets.
+    - O dataset consolidado é carregado uma única vez e passado em memória às etapas que o usam.
+    - Etapas independentes rodam em paralelo; o pipeline para se alguma falhar. A saída de cada etapa é
+      impressa inteira quando ela termina, sem se misturar com a das outras.
+    - Cada etapa é medida (tempo, CPU, memória, linhas e bytes) e registrada em RUN_REPORT_FILE,
+      inclusive as puladas pelo cache.
     """
     print("==================================================")
     print("INICIANDO PIPELINE DE DADOS COMPLETO...")
     print("==================================================")
     start_time = time.time()
 
+    modules = {}
     for script_name in PIPELINE_SCRIPTS:
         try:
-            script_module = importlib.import_module(script_name)
-            
-            success = script_module.run()
-            
-            if not success:
-                print(f"\nERRO FATAL: O script '{script_name}' falhou. Abortando o pipeline.")
-                return
+            modules[script_name] = importlib.import_module(script_name)
         except ImportError as e:
             print(f"\nERRO FATAL: Não foi possível importar o script '{script_name}'. Detalhe: {e}")
             return
-        except Exception as e:
-            print(f"\nERRO FATAL: Ocorreu um erro inesperado ao executar '{script_name}'. Detalhe: {e}")
-            return
 
+    deps = build_graph(modules)
+    state = {} if forcar else load_state()
+    shared_code = code_fingerprint()
+    shared = {}
+    pending = list(PIPELINE_SCRIPTS)
+    done, running = set(), {}
+    executed, skipped, failed = 0, 0, None
+    run_id = datetime.datetime.now().isoformat(timespec='seconds')
+    records = []
+
+    def record(stage, status, metrics=None, **fields):
+        records.append({'execucao': run_id, 'etapa': stage, 'status': status, **(metrics or {}), **fields})
+
+    stop_sampler = start_memory_sampler()
+    output = StageOutput(sys.stdout)
+    with contextlib.redirect_stdout(output), ThreadPoolExecutor(max_workers=MAX_PARALLEL_STAGES) as pool:
+        while pending or running:
+            # Agenda (ou pula) todas as etapas cujas dependências já terminaram
+            scheduled = True
+            while failed is None and scheduled:
+                scheduled = False
+                for script_name in [name for name in pending if deps[name] <= done]:
+                    pending.remove(script_name)
+                    module = modules[script_name]
+                    fingerprint = stage_fingerprint(module, shared_code)
+                    if state.get(script_name) == fingerprint and outputs_present(module):
+                        print(f"\n--- PULANDO: '{script_name}' (entradas inalteradas desde a última execução) ---")
+                        restored = restore_arrow_copies(getattr(module, 'OUTPUTS', []))
+                        if restored:
+                            print(f"  - Cópias Arrow recriadas a partir dos parquets: {[os.path.basename(p) for p in restored]}")
+                        record(script_name, 'pulada')
+                        done.add(script_name)
+                        skipped += 1
+                        scheduled = True
+                        continue
+
+                    kwargs = {}
+                    if CONSOLIDATED_DATASET_PATH in getattr(module, 'INPUTS', []):
+                        if 'df' not in shared:
+                            shared['df'], metrics = measure_stage('carga_compartilhada', load_consolidated,
+                                                                  columns=shared_columns(modules))
+                            record('carga_compartilhada', 'executada', metrics, linhas_saida=len(shared['df']))
+                        kwargs['df'] = shared['df']
+                    future = pool.submit(run_stage, output, script_name, module.run, **kwargs)
+                    running[future] = (script_name, fingerprint, len(kwargs['df']) if 'df' in kwargs else None)
+
+            if not running:
+                if pending and failed is None:
+                    print(f"\nERRO FATAL: Dependências não satisfeitas para {pending}. Abortando o pipeline.")
+                    failed = pending[0]
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                script_name, fingerprint, rows_in = running.pop(future)
+                success, metrics, text = future.result()
+                print(text, end='')
+
+                if success:
+                    done.add(script_name)
+                    state[script_name] = fingerprint
+                    executed += 1
+                    record(script_name, 'executada', metrics, linhas_entrada=rows_in,
+                           linhas_saida=output_rows(getattr(modules[script_name], 'OUTPUTS', [])))
+                else:
+                    record(script_name, 'falhou', metrics, linhas_entrada=rows_in)
+                    if failed is None:
+                        print(f"\nERRO FATAL: O script '{script_name}' falhou. Abortando o pipeline.")
+                    failed = script_name
+                    state.pop(script_name, None)
+                save_state(state)
+
+    stop_sampler.set()
     end_time = time.time()
     total_time = end_time - start_time
+    record('pipeline', 'falhou' if failed is not None else 'executada', tempo_s=round(total_time, 3),
+           etapas_executadas=executed, etapas_puladas=skipped)
+    append_run_report(RUN_REPORT_FILE, records, RUN_REPORT_MAX_RUNS)
+    if failed is not None:
+        return
+
     print("\n==================================================")
     print(f"PIPELINE CONCLUÍDO COM SUCESSO!")
+    print(f"Etapas executadas: {executed} | puladas (cache): {skipped}")
     print(f"Tempo total de execução: {total_time:.2f} segundos.")
+    print(f"Relatório da execução em '{RUN_REPORT_FILE}'")
     print("==================================================")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Executa o pipeline de dados do EscalAI.")
+    parser.add_argument('--forcar', action='store_true', help="Ignora o cache e executa todas as etapas.")
+    args = parser.parse_args()
+    main(forcar=args.forcar)
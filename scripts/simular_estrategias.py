@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.config import (CONSOLIDATED_DATASET_PATH, FORMATIONS, SIMULATION_ROUNDS_FILE, SIMULATION_SUMMARY_FILE,
+                        SIMULATION_START_BUDGET, SIMULATION_WORKERS)
+from src.simulacao import STRATEGIES, available_seasons, simulate, summarize
+
+def main(anos=None, estrategias=None, formacoes=('4-3-3',), orcamento=SIMULATION_START_BUDGET, workers=SIMULATION_WORKERS):
+    """
+    Simula estratégias de escalação nas temporadas do dataset consolidado (ver src/simulacao.py)
+    e salva as linhas por rodada e o resumo por temporada.
+    """
+    print("\n--- INICIANDO: Simulação de Estratégias de Escalação ---")
+
+    if not os.path.exists(CONSOLIDATED_DATASET_PATH):
+        print(f"ERRO: Dataset consolidado não encontrado em '{CONSOLIDATED_DATASET_PATH}'.")
+        print("Execute o pipeline (python scripts/run_pipeline.py) primeiro.")
+        return False
+
+    anos = available_seasons() if anos is None else anos
+    estrategias = list(STRATEGIES) if estrategias is None else estrategias
+    print(f"  - Temporadas: {anos} | estratégias: {estrategias} | formações: {list(formacoes)} | "
+          f"{min(workers, len(anos))} processo(s)")
+
+    inicio = time.perf_counter()
+    try:
+        rodadas = simulate(anos, estrategias, formacoes, orcamento=orcamento, workers=workers)
+    except ValueError as e:
+        print(f"ERRO: {e}")
+        return False
+    tempo = time.perf_counter() - inicio
+
+    resumo = summarize(rodadas)
+    os.makedirs(os.path.dirname(SIMULATION_ROUNDS_FILE), exist_ok=True)
+    rodadas.to_parquet(SIMULATION_ROUNDS_FILE, index=False)
+    resumo.to_parquet(SIMULATION_SUMMARY_FILE, index=False)
+
+    geral = resumo.groupby(['estrategia', 'formacao']).agg(
+        pontos_totais=('pontos_totais', 'sum'), media_rodada=('media_rodada', 'mean'), patrimonio_final=('patrimonio_final', 'mean'),
+    ).sort_values('pontos_totais', ascending=False)
+    print("\n" + resumo.to_string(index=False, float_format='{:.2f}'.format))
+    print("\nTodas as temporadas (patrimônio final médio):")
+    print(geral.to_string(float_format='{:.2f}'.format))
+
+    print(f"\n  - {len(resumo)} simulações ({len(rodadas)} rodadas) em {tempo:.1f}s")
+    print(f"  - Resultados salvos em '{SIMULATION_ROUNDS_FILE}' e '{SIMULATION_SUMMARY_FILE}'")
+    print("--- SUCESSO: Simulação Concluída ---")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula estratégias de escalação nas temporadas históricas.")
+    parser.add_argument('--anos', type=int, nargs='+', help="Temporadas simuladas (padrão: todas do dataset consolidado).")
+    parser.add_argument('--estrategias', nargs='+', choices=list(STRATEGIES), help="Estratégias (padrão: todas).")
+    parser.add_argument('--formacoes', nargs='+', choices=list(FORMATIONS), default=['4-3-3'])
+    parser.add_argument('--orcamento', type=float, default=SIMULATION_START_BUDGET, help="Patrimônio inicial (C$).")
+    parser.add_argument('--processos', type=int, default=SIMULATION_WORKERS, help="Processos (uma temporada por processo).")
+    args = parser.parse_args()
+    if not main(args.anos, args.estrategias, args.formacoes, args.orcamento, args.processos):
+        sys.exit(1)
@@ -0,0 +1,145 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.config import CONSOLIDATED_DATASET_PATH, ARROW_STORE_PATH
+
+# Funções de acesso aos dados processados sem dependência do Streamlit, usadas pelos scripts
+# do pipeline e reexportadas por src.dados para as páginas.
+
+# Particionamento hive do dataset consolidado; as chaves voltam como int16 (o mesmo tipo de CONSOLIDATED_SCHEMA)
+CONSOLIDATED_PARTITIONING = ds.partitioning(pa.schema([('ano', pa.int16()), ('rodada_id', pa.int16())]), flavor='hive')
+
+def load_consolidated(filters=None, columns=None):
+    """
+    Carrega o dataset consolidado (particionado por ano/rodada_id) com filtros e projeção de colunas.
+    - `filters`: filtros no formato do pyarrow, ex.: [('ano', '==', 2025), ('rodada_id', '>=', 10)].
+      Filtros sobre 'ano' e 'rodada_id' descartam partições inteiras sem abri-las.
+    - `columns`: lista de colunas a ler; None lê todas.
+    """
+    table = pq.read_table(CONSOLIDATED_DATASET_PATH, columns=columns, filters=filters,
+                          partitioning=CONSOLIDATED_PARTITIONING)
+    return table.to_pandas()
+
+def memory_report(df):
+    """
+    Compara, por coluna, a memória do DataFrame com o schema compacto e com o schema anterior
+    (float64/int64 para números e strings como objetos Python).
+    Retorna um DataFrame ordenado pela economia em bytes.
+    """
+    rows = []
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series.dtype):
+            legacy_bytes = series.astype(object).memory_usage(deep=True, index=False)
+        else:
+            legacy_bytes = len(series) * 8
+        current_bytes = series.memory_usage(deep=True, index=False)
+        rows.append({'coluna': col, 'dtype': str(series.dtype), 'bytes_antes': int(legacy_bytes), 'bytes_depois': int(current_bytes)})
+
+    report = pd.DataFrame(rows)
+    report['economia_bytes'] = report['bytes_antes'] - report['bytes_depois']
+    report['economia_pct'] = (100 * report['economia_bytes'] / report['bytes_antes'].where(report['bytes_antes'] > 0)).fillna(0).round(1)
+    return report.sort_values('economia_bytes', ascending=False).reset_index(drop=True)
+
+def combine_memory_reports(reports):
+    """
+    Soma relatórios de memory_report calculados em partes do dataset (ex.: uma temporada por vez),
+    para não carregar o dataset inteiro. Colunas categóricas contam o dicionário de cada parte.
+    """
+    report = (pd.concat(reports).groupby('coluna', sort=False)
+              .agg(dtype=('dtype', 'first'), bytes_antes=('bytes_antes', 'sum'), bytes_depois=('bytes_depois', 'sum'))
+              .reset_index())
+    report['economia_bytes'] = report['bytes_antes'] - report['bytes_depois']
+    report['economia_pct'] = (100 * report['economia_bytes'] / report['bytes_antes'].where(report['bytes_antes'] > 0)).fillna(0).round(1)
+    return report.sort_values('economia_bytes', ascending=False).reset_index(drop=True)
+
+def arrow_path(name):
+    """Caminho de uma tabela do armazenamento Arrow (ex.: 'dados_agregados_por_atleta' ou o nome de um parquet de saída)."""
+    return os.path.join(ARROW_STORE_PATH, os.path.splitext(os.path.basename(name))[0] + '.arrow')
+
+def _write_arrow(path, schema, tables):
+    """
+    Grava as tabelas em um arquivo Arrow IPC sem compressão (mapeável em memória sem cópia).
+    A troca é atômica: quem já mapeou a versão anterior continua lendo o arquivo antigo até reabrir.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+        for table in tables:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+def publish_arrow(df, output_file):
+    """Publica no armazenamento Arrow a cópia de uma tabela de saída do pipeline (mesmo nome do parquet). Retorna o caminho."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    path = arrow_path(output_file)
+    _write_arrow(path, table.schema, [table])
+    return path
+
+def publish_consolidated_arrow(path):
+    """
+    Publica o dataset consolidado inteiro em um único arquivo Arrow, uma partição por vez.
+    - As colunas categóricas de cada partição têm dicionários próprios; o formato de arquivo IPC exige
+      um dicionário por coluna, então uma primeira passada junta os valores de todas as partições.
+    - A memória usada é a de uma partição, mais os dicionários.
+    """
+    dataset = ds.dataset(CONSOLIDATED_DATASET_PATH, format='parquet', partitioning=CONSOLIDATED_PARTITIONING)
+    dict_cols = [field.name for field in dataset.schema if pa.types.is_dictionary(field.type)]
+
+    values = {col: [] for col in dict_cols}
+    for fragment in dataset.get_fragments():
+        table = fragment.to_table(columns=dict_cols)
+        for col in dict_cols:
+            values[col] += [chunk.dictionary for chunk in table[col].chunks]
+    dictionaries = {col: pc.unique(pa.concat_arrays(chunks)) if chunks else pa.array([], pa.string())
+                    for col, chunks in values.items()}
+
+    schema = pa.schema([
+        pa.field(field.name, pa.dictionary(pa.int32(), field.type.value_type)) if field.name in dictionaries else field
+        for field in dataset.schema
+    ])
+
+    def unified(fragment):
+        table = fragment.to_table(schema=dataset.schema)
+        for col, dictionary in dictionaries.items():
+            chunks = []
+            for chunk in table[col].chunks:
+                # Índice de cada valor do dicionário da partição no dicionário global
+                remap = pc.index_in(chunk.dictionary, value_set=dictionary)
+                chunks.append(pa.DictionaryArray.from_arrays(pc.take(remap, chunk.indices), dictionary))
+            table = table.set_column(table.schema.get_field_index(col), schema.field(col), pa.chunked_array(chunks, schema.field(col).type))
+        return table.cast(schema)
+
+    _write_arrow(path, schema, (unified(fragment) for fragment in dataset.get_fragments()))
+    return path
+
+def restore_arrow_copies(outputs):
+    """
+    Recria, a partir das saídas em parquet, as cópias Arrow listadas em `outputs` que não existem
+    (dados_cartola/arrow/ não é versionado: num checkout novo, só os parquets estão lá).
+    Retorna os caminhos recriados.
+    """
+    restored = []
+    for path in outputs:
+        target = arrow_path(path)
+        if path == target or target not in outputs or os.path.exists(target) or not os.path.exists(path):
+            continue
+        if path == CONSOLIDATED_DATASET_PATH:
+            publish_consolidated_arrow(target)
+        else:
+            # Mesmo caminho das etapas (via pandas), para a cópia sair com o schema que a etapa publicaria
+            publish_arrow(pd.read_parquet(path), path)
+        restored.append(target)
+    return restored
+
+def open_arrow(path):
+    """
+    Abre uma tabela do armazenamento Arrow mapeada em memória, sem copiar os dados: as colunas só chegam à RAM
+    quando são lidas, e as páginas do arquivo ficam no cache do sistema operacional, compartilhadas entre processos.
+    """
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
@@ -0,0 +1,109 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.config import ARTIFACT_CACHE_MB
+
+# Copy-on-write é o padrão no pandas 3; no 2.x (requirements.txt aceita pandas>=2.0) depende da opção global,
+# que este módulo não altera
+_PANDAS_COW = int(pd.__version__.split('.')[0]) >= 3
+
+# Registro dos artefatos lidos pelas páginas (parquet, JSON, relatórios...), compartilhado por todas as sessões.
+# Cada entrada é chaveada pelo caminho, pelo carregador e seus argumentos, e guarda a impressão digital do
+# arquivo (mtime e tamanho) de quando foi lida: se o pipeline publicar uma nova versão, a próxima leitura
+# percebe a diferença e recarrega. O total em memória respeita ARTIFACT_CACHE_MB, descartando as entradas
+# usadas há mais tempo (LRU).
+
+_entries = OrderedDict()
+_stats = {'acertos': 0, 'faltas': 0, 'invalidacoes': 0, 'descartes': 0}
+_lock = threading.Lock()
+
+def artifact_fingerprint(path):
+    """
+    Impressão digital barata de um arquivo (mtime em ns e tamanho) ou de um diretório (a de cada arquivo dentro dele).
+    Retorna None se o caminho não existir.
+    """
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    if os.path.isdir(path):
+        files = sorted(os.path.join(d, f) for d, _, names in os.walk(path) for f in names)
+        return tuple((os.path.relpath(f, path), *artifact_fingerprint(f)) for f in files)
+    return None
+
+def estimate_size(value):
+    """Tamanho aproximado em memória de um artefato (DataFrames pelo memory_usage profundo)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+def _evict(budget):
+    """Descarta as entradas menos usadas recentemente até o total caber no orçamento (a mais recente sempre fica)."""
+    total = sum(entry[2] for entry in _entries.values())
+    while total > budget and len(_entries) > 1:
+        _, (_, _, size) = _entries.popitem(last=False)
+        total -= size
+        _stats['descartes'] += 1
+
+def _private_copy(df):
+    """
+    Cópia de um DataFrame do registro que a página pode alterar sem tocar no artefato compartilhado.
+    Com copy-on-write ativo, uma cópia rasa basta; sem ele (pandas 2.x com a opção desligada), a cópia é profunda:
+    ligar copy-on-write só em volta de df.copy(deep=False) não protege as alterações feitas depois.
+    """
+    if _PANDAS_COW or pd.get_option('mode.copy_on_write') is True:
+        return df.copy(deep=False)
+    return df.copy()
+
+def load_artifact(path, loader, *args, budget_mb=ARTIFACT_CACHE_MB, **kwargs):
+    """
+    Devolve `loader(path, *args, **kwargs)`, lido do registro enquanto o arquivo não mudar.
+    - Retorna None se o caminho não existir (e descarta a entrada antiga, se houver).
+    - DataFrames saem como cópia (ver _private_copy): alterações na página não chegam ao registro.
+    - Os demais valores (dicts, listas, tabelas Arrow) são compartilhados entre as sessões e devem ser tratados
+      como somente leitura.
+    """
+    key = (os.path.abspath(path), f"{loader.__module__}.{loader.__qualname__}", args, tuple(sorted(kwargs.items())))
+    fingerprint = artifact_fingerprint(path)
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and (fingerprint is None or entry[0] != fingerprint):
+            del _entries[key]
+            _stats['invalidacoes'] += 1
+            entry = None
+        if entry is not None:
+            _entries.move_to_end(key)
+            _stats['acertos'] += 1
+    if fingerprint is None:
+        return None
+
+    if entry is None:
+        value = loader(path, *args, **kwargs)
+        # Se o arquivo mudou durante a leitura, a próxima chamada relê
+        with _lock:
+            _entries[key] = (fingerprint, value, estimate_size(value))
+            _stats['faltas'] += 1
+            _evict(budget_mb * 2**20)
+    else:
+        value = entry[1]
+    return _private_copy(value) if isinstance(value, pd.DataFrame) else value
+
+def cache_stats():
+    """Entradas, bytes em memória e contadores (acertos, faltas, invalidações e descartes) do registro."""
+    with _lock:
+        return {'entradas': len(_entries), 'bytes': sum(entry[2] for entry in _entries.values()), **_stats}
+
+def clear_artifacts():
+    """Esvazia o registro."""
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import formatdate
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config import (CARTOLA_BASE_URL, API_CACHE_PATH, API_TIMEOUT, API_RETRIES, API_BACKOFF,
+                        API_POOL_SIZE, API_CONCURRENCY)
+
+# Cliente HTTP da API do Cartola: sessão com pool de conexões, timeouts, retry com backoff,
+# revalidação condicional (ETag/If-Modified-Since) e cache em disco compartilhado entre processos.
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(base_url=CARTOLA_BASE_URL):
+    """Retorna a sessão HTTP (com pool de conexões e retry) do processo para a URL base."""
+    with _sessions_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            retry = Retry(
+                total=API_RETRIES, connect=API_RETRIES, read=API_RETRIES,
+                backoff_factor=API_BACKOFF, status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET'], respect_retry_after_header=True, raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=API_POOL_SIZE, pool_maxsize=API_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({'User-Agent': 'EscalAI', 'Accept': 'application/json'})
+            _sessions[base_url] = session
+        return session
+
+def _cache_path(url):
+    return os.path.join(API_CACHE_PATH, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json")
+
+def _read_cache(url):
+    """Entrada em cache da URL e a idade dela em segundos (mtime do arquivo), ou (None, None)."""
+    path = _cache_path(url)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f), time.time() - os.path.getmtime(path)
+    except (OSError, json.JSONDecodeError):
+        return None, None
+
+def _write_cache(url, entry):
+    """Grava a entrada de forma atômica; outro processo nunca lê um arquivo pela metade."""
+    os.makedirs(API_CACHE_PATH, exist_ok=True)
+    path = _cache_path(url)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def fetch_json(endpoint, ttl=60, base_url=CARTOLA_BASE_URL):
+    """
+    Busca um endpoint da API (ex.: '/mercado/status') e retorna o JSON, ou None em caso de falha.
+    - Dentro do `ttl` (segundos, contado pela data de modificação do arquivo em cache), responde do
+      cache em disco sem acessar a rede.
+    - Depois do `ttl`, revalida com If-None-Match/If-Modified-Since; um 304 só renova o cache.
+    - Em erro de rede ou status inesperado, devolve a última resposta em cache, se houver.
+    """
+    url = f"{base_url}{endpoint}"
+    entry, age = _read_cache(url)
+    if entry is not None and age < ttl:
+        return entry['corpo']
+
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        headers['If-Modified-Since'] = entry.get('last_modified') or formatdate(time.time() - age, usegmt=True)
+
+    try:
+        response = get_session(base_url).get(url, headers=headers, timeout=API_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return entry['corpo'] if entry is not None else None
+
+    if response.status_code == 304 and entry is not None:
+        # Conteúdo inalterado: só renova a idade da entrada, sem regravar o corpo
+        try:
+            os.utime(_cache_path(url))
+        except OSError:
+            pass
+        return entry['corpo']
+    if response.status_code != 200:
+        return entry['corpo'] if entry is not None else None
+
+    try:
+        body = response.json()
+    except ValueError:
+        return entry['corpo'] if entry is not None else None
+    _write_cache(url, {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'corpo': body,
+    })
+    return body
+
+async def fetch_many_async(endpoints, ttl=60, base_url=CARTOLA_BASE_URL, concurrency=API_CONCURRENCY):
+    """
+    Versão assíncrona de `fetch_json` para vários endpoints (ex.: um por clube ou por rodada).
+    As requisições rodam em threads, compartilhando o pool de conexões da sessão, com no máximo
+    `concurrency` simultâneas. Retorna um dict endpoint -> JSON (ou None).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(endpoint):
+        async with semaphore:
+            return await asyncio.to_thread(fetch_json, endpoint, ttl, base_url)
+
+    results = await asyncio.gather(*(fetch(endpoint) for endpoint in endpoints))
+    return dict(zip(endpoints, results))
+
+def fetch_many(endpoints, ttl=60, base_url=CARTOLA_BASE_URL, concurrency=API_CONCURRENCY):
+    """Executa `fetch_many_async` a partir de código síncrono (scripts e páginas)."""
+    return asyncio.run(fetch_many_async(list(endpoints), ttl=ttl, base_url=base_url, concurrency=concurrency))
@@ -0,0 +1,255 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config import RAW_DATA_PATH
+from src.esquemas import POS_MAP
+from src.ingestao import read_raw_file
+
+# Servidor local que imita os endpoints públicos da API do Cartola usados pelo app, com mercado
+# determinístico (a última rodada dos dados brutos locais, ou sintético sem eles). Serve para testar e medir o cliente (src/cartola_api.py) sem rede:
+#   python -m src.cartola_fake --porta 8765
+#   CARTOLA_BASE_URL=http://127.0.0.1:8765 streamlit run app.py
+
+POSITIONS = {1: 'gol', 2: 'lat', 3: 'zag', 4: 'mei', 5: 'ata', 6: 'tec'}
+# Atletas por posição em cada clube (aproximadamente a proporção do mercado real)
+SQUAD = {1: 3, 2: 5, 3: 6, 4: 10, 5: 7, 6: 1}
+STATUS = {2: 'Dúvida', 3: 'Suspenso', 5: 'Contundido', 6: 'Nulo', 7: 'Provável'}
+
+def latest_raw_round():
+    """Caminho do arquivo 'rodada-N.csv' mais recente dos dados brutos, ou None."""
+    files = glob.glob(os.path.join(RAW_DATA_PATH, '*', 'rodada-*.csv'))
+    key = lambda path: (os.path.basename(os.path.dirname(path)), int(re.findall(r'\d+', os.path.basename(path))[0]))
+    return max(files, key=key) if files else None
+
+def market_from_raw(path, rodada=1):
+    """Monta o mercado a partir de um arquivo bruto de rodada (atletas, clubes e preços reais)."""
+    df = read_raw_file(path).drop_duplicates('atleta_id')
+    pos_ids = {v: k for k, v in POSITIONS.items()}
+    atletas = [{
+        'atleta_id': int(row['atleta_id']),
+        'apelido': row['apelido'],
+        'clube_id': int(row['clube_id']),
+        'posicao_id': pos_ids.get(POS_MAP.get(str(row['posicao_id']).lower()), 4),
+        'status_id': int(row['status_id']) if str(row['status_id']).isdigit() else 7,
+        'rodada_id': rodada,
+        'pontos_num': float(row['pontos_num']),
+        'media_num': float(row['media_num']),
+        'preco_num': float(row['preco_num']),
+        'variacao_num': 0.0,
+        'jogos_num': rodada - 1,
+        'scout': {},
+    } for row in df.fillna({'pontos_num': 0, 'media_num': 0, 'preco_num': 1}).to_dict('records')]
+    clubes = {
+        str(int(row['clube_id'])): {'id': int(row['clube_id']), 'nome': row['clube.nome'], 'abreviacao': row['clube.nome']}
+        for row in df.drop_duplicates('clube_id').to_dict('records')
+    }
+    return atletas, clubes
+
+def build_market(n_clubs=20, seed=0, rodada=1, source=None):
+    """
+    Monta o payload de /atletas/mercado. Com `source` (arquivo bruto de rodada), usa seus atletas;
+    sem ele, gera um mercado sintético com n_clubs * 32 atletas.
+    """
+    if source is not None:
+        atletas, clubes = market_from_raw(source, rodada=rodada)
+        return _market_payload(atletas, clubes)
+    rng = random.Random(seed)
+    clubes = {}
+    atletas = []
+    for c in range(n_clubs):
+        clube_id = 260 + c
+        sigla = f"C{c:02d}"
+        clubes[str(clube_id)] = {'id': clube_id, 'nome': f"Clube {c:02d}", 'abreviacao': sigla}
+        for posicao_id, n in SQUAD.items():
+            for _ in range(n):
+                atleta_id = 30000 + len(atletas)
+                media = max(0.0, rng.gauss(3.5, 2.0))
+                atletas.append({
+                    'atleta_id': atleta_id,
+                    'apelido': f"Atleta {atleta_id}",
+                    'clube_id': clube_id,
+                    'posicao_id': posicao_id,
+                    'status_id': rng.choice([7, 7, 7, 7, 2, 5, 6]),
+                    'rodada_id': rodada,
+                    'pontos_num': round(rng.gauss(media, 3.0), 2),
+                    'media_num': round(media, 2),
+                    'preco_num': round(max(1.0, media * 2.5 + rng.uniform(0, 4)), 2),
+                    'variacao_num': 0.0,
+                    'jogos_num': rodada - 1,
+                    'scout': {},
+                })
+    return _market_payload(atletas, clubes)
+
+def _market_payload(atletas, clubes):
+    return {
+        'atletas': atletas,
+        'clubes': clubes,
+        'posicoes': {str(k): {'id': k, 'abreviacao': v} for k, v in POSITIONS.items()},
+        'status': {str(k): {'id': k, 'nome': v} for k, v in STATUS.items()},
+    }
+
+class FakeCartolaServer(ThreadingHTTPServer):
+    """Servidor com o estado do mercado; `advance_round` e `mutate_market` simulam a temporada."""
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, failure_rate=0.0, n_clubs=20, seed=0, source='auto'):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.RLock()
+        self.request_counts = {}
+        self.rodada = 1
+        if source == 'auto':
+            source = latest_raw_round()
+        self.market = build_market(n_clubs=n_clubs, seed=seed, rodada=self.rodada, source=source)
+        self._touch()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _touch(self):
+        self.modified_at = time.time()
+
+    def mutate_market(self, fraction=0.05):
+        """Altera preço e status de uma fração dos atletas, como durante o mercado aberto."""
+        with self.lock:
+            for atleta in self.rng.sample(self.market['atletas'], int(len(self.market['atletas']) * fraction)):
+                variacao = round(self.rng.uniform(-1.0, 1.0), 2)
+                atleta['preco_num'] = round(max(1.0, atleta['preco_num'] + variacao), 2)
+                atleta['variacao_num'] = variacao
+                atleta['status_id'] = self.rng.choice([7, 7, 7, 2, 5])
+            self._touch()
+
+    def advance_round(self):
+        """Fecha a rodada: sorteia pontuações, atualiza médias e abre o mercado da rodada seguinte."""
+        with self.lock:
+            self.rodada += 1
+            for atleta in self.market['atletas']:
+                pontos = round(self.rng.gauss(atleta['media_num'], 3.0), 2)
+                jogos = atleta['jogos_num'] + 1
+                atleta['media_num'] = round((atleta['media_num'] * atleta['jogos_num'] + pontos) / jogos, 2)
+                atleta['pontos_num'] = pontos
+                atleta['jogos_num'] = jogos
+                atleta['rodada_id'] = self.rodada
+            self._touch()
+
+    def payload(self, path):
+        """Corpo JSON de um endpoint, ou None se o endpoint não existe."""
+        with self.lock:
+            if path == '/mercado/status':
+                return {
+                    'rodada_atual': self.rodada, 'status_mercado': 1, 'temporada': time.gmtime().tm_year,
+                    'times_escalados': 1000 * self.rodada, 'fechamento': {'timestamp': int(self.modified_at) + 86400},
+                }
+            if path == '/atletas/mercado':
+                return self.market
+            if path == '/clubes':
+                return self.market['clubes']
+            if path == '/atletas/pontuados':
+                return {'rodada': self.rodada - 1, 'atletas': {
+                    str(a['atleta_id']): {'apelido': a['apelido'], 'pontuacao': a['pontos_num'], 'clube_id': a['clube_id']}
+                    for a in self.market['atletas'] if a['jogos_num'] > 0
+                }}
+            if path.startswith('/partidas'):
+                rodada = int(path.rsplit('/', 1)[1]) if path.count('/') == 2 else self.rodada
+                ids = sorted(int(k) for k in self.market['clubes'])
+                order = random.Random(rodada).sample(ids, len(ids))
+                return {'rodada': rodada, 'partidas': [
+                    {'clube_casa_id': order[i], 'clube_visitante_id': order[i + 1]} for i in range(0, len(order) - 1, 2)
+                ]}
+        return None
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split('?', 1)[0].rstrip('/')
+        with server.lock:
+            server.request_counts[path] = server.request_counts.get(path, 0) + 1
+        if server.latency:
+            time.sleep(server.latency)
+        if server.failure_rate and server.rng.random() < server.failure_rate:
+            self._send(503, b'{}')
+            return
+
+        # Serializa sob o lock para não ler o mercado no meio de uma alteração
+        with server.lock:
+            try:
+                body = server.payload(path)
+            except ValueError:
+                body = None
+            data = None if body is None else json.dumps(body, ensure_ascii=False).encode('utf-8')
+        if data is None:
+            self._send(404, b'{}')
+            return
+
+        etag = f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+        headers = {'ETag': etag, 'Last-Modified': formatdate(server.modified_at, usegmt=True)}
+        if self._not_modified(etag, server.modified_at):
+            self._send(304, b'', headers)
+            return
+        self._send(200, data, headers)
+
+    def _not_modified(self, etag, modified_at):
+        if 'If-None-Match' in self.headers:
+            return self.headers['If-None-Match'] == etag
+        since = self.headers.get('If-Modified-Since')
+        if since:
+            try:
+                return int(modified_at) <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send(self, status, data, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+def start_server(host='127.0.0.1', port=0, **kwargs):
+    """Inicia o servidor numa thread em segundo plano (porta 0 = porta livre) e o retorna."""
+    server = FakeCartolaServer((host, port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API do Cartola.")
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--latencia', type=float, default=0.0, help="Atraso artificial por requisição (segundos).")
+    parser.add_argument('--falhas', type=float, default=0.0, help="Fração de requisições respondidas com 503.")
+    parser.add_argument('--sintetico', action='store_true', help="Usa um mercado sintético em vez dos dados brutos locais.")
+    parser.add_argument('--atualizar', type=float, default=0.0,
+                        help="Intervalo (segundos) entre alterações de preços do mercado; 0 desativa.")
+    args = parser.parse_args()
+
+    server = FakeCartolaServer(('127.0.0.1', args.porta), latency=args.latencia, failure_rate=args.falhas,
+                               source=None if args.sintetico else 'auto')
+    print(f"Servidor fake do Cartola em {server.base_url} (Ctrl+C para encerrar)")
+    if args.atualizar > 0:
+        def update_loop():
+            while True:
+                time.sleep(args.atualizar)
+                server.mutate_market()
+        threading.Thread(target=update_loop, daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,234 @@
+import argparse
+import glob
+import json
+import numbers
+import os
+import time
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from src.config import (CARTOLA_BASE_URL, MARKET_SNAPSHOT_PATH, MARKET_LATEST_FILE, MARKET_STATUS_LATEST_FILE,
+                        COLLECTOR_INTERVAL, MARKET_SNAPSHOT_MAX_AGE)
+from src.cartola_api import fetch_json
+
+# Coletor do mercado ao vivo: consulta /atletas/mercado e /mercado/status periodicamente e guarda o histórico
+# intra-rodada em parquet comprimido (zstd), particionado por temporada e rodada (temporada=AAAA/rodada=N).
+# - A primeira coleta de cada rodada grava o mercado completo ('<ms>-completo.parquet'); as seguintes, só as
+#   linhas que mudaram desde a coleta anterior ('<ms>-delta.parquet'), com 'removido' = True para quem saiu.
+# - O mercado em um instante = último arquivo completo até ele + os deltas seguintes até ele.
+# - O mercado e o status mais recentes também ficam inteiros em MARKET_LATEST_FILE e MARKET_STATUS_LATEST_FILE,
+#   lidos pelas páginas sem acessar a API.
+
+SNAPSHOT_SCHEMA = {
+    'atleta_id': 'int32',
+    'apelido': 'str',
+    'clube_id': 'int32',
+    'posicao_id': 'int8',
+    'status_id': 'int8',
+    'preco_num': 'float32',
+    'variacao_num': 'float32',
+    'media_num': 'float32',
+    'jogos_num': 'int16',
+    'pontos_num': 'float32',
+}
+SNAPSHOT_COLS = list(SNAPSHOT_SCHEMA)
+TRACKED_COLS = SNAPSHOT_COLS[1:]
+ATHLETES_PATH = os.path.join(MARKET_SNAPSHOT_PATH, 'atletas')
+STATUS_PATH = os.path.join(MARKET_SNAPSHOT_PATH, 'status')
+
+def market_snapshot(atletas):
+    """Converte a lista de atletas de /atletas/mercado no DataFrame da coleta, indexado por atleta_id."""
+    df = pd.DataFrame.from_records(atletas, columns=SNAPSHOT_COLS)
+    df = df.fillna({col: 0 for col in TRACKED_COLS if col != 'apelido'}).astype(SNAPSHOT_SCHEMA)
+    return df.drop_duplicates('atleta_id', keep='last').set_index('atleta_id').sort_index()
+
+def changed_rows(previous, current):
+    """
+    Linhas de `current` novas ou com alguma coluna diferente em `previous`, mais uma linha 'removido'
+    (com os últimos valores) para cada atleta de `previous` que saiu do mercado.
+    """
+    anterior = previous.reindex(current.index)
+    iguais = ((anterior == current) | (anterior.isna() & current.isna())).all(axis=1)
+    mudou = current[~iguais.to_numpy()].assign(removido=False)
+    saiu = previous.loc[previous.index.difference(current.index)].assign(removido=True)
+    return pd.concat([mudou, saiu]) if len(saiu) else mudou
+
+def _partition(base, temporada, rodada):
+    return os.path.join(base, f"temporada={int(temporada)}", f"rodada={int(rodada)}")
+
+def _write_parquet(df, path):
+    """Grava o parquet (zstd) de forma atômica: leitores nunca veem um arquivo pela metade."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, compression='zstd', index=False)
+    os.replace(tmp_path, path)
+
+def _as_ms(instante):
+    """Instante (ms desde a época, datetime ou string ISO; sem fuso = UTC) em ms desde a época."""
+    if instante is None:
+        return None
+    if isinstance(instante, numbers.Real):
+        return int(instante)
+    ts = pd.Timestamp(instante)
+    return int((ts if ts.tzinfo else ts.tz_localize('UTC')).timestamp() * 1000)
+
+def snapshot_files(until=None):
+    """Arquivos de atletas [(ms, completo, caminho)] em ordem de coleta, opcionalmente só até o instante `until`."""
+    until_ms = _as_ms(until)
+    files = []
+    for path in glob.glob(os.path.join(ATHLETES_PATH, 'temporada=*', 'rodada=*', '*.parquet')):
+        ms, kind = os.path.basename(path)[:-len('.parquet')].split('-')
+        if until_ms is None or int(ms) <= until_ms:
+            files.append((int(ms), kind == 'completo', path))
+    return sorted(files)
+
+def market_as_of(instante=None):
+    """
+    Mercado como estava em `instante` (None = o mais recente coletado), indexado por atleta_id, com 'coletado_em'
+    (a coleta em que cada linha mudou pela última vez). Lê só o último arquivo completo até o instante e os deltas
+    seguintes. Retorna None antes da primeira coleta.
+    """
+    files = snapshot_files(instante)
+    completos = [i for i, (_, completo, _) in enumerate(files) if completo]
+    if not completos:
+        return None
+    df = pd.concat([pd.read_parquet(path) for _, _, path in files[completos[-1]:]], ignore_index=True)
+    df = df.drop_duplicates('atleta_id', keep='last')
+    df = df[~df['removido']].drop(columns='removido')
+    return df.astype(SNAPSHOT_SCHEMA).set_index('atleta_id').sort_index()
+
+def player_history(atleta_id):
+    """
+    Versões coletadas de um atleta, uma linha por mudança (a cópia sem mudanças do arquivo completo de cada rodada
+    é descartada), em ordem de coleta, com temporada e rodada. O filtro por atleta_id vai para a leitura dos parquets.
+    """
+    cols = ['coletado_em', 'temporada', 'rodada'] + SNAPSHOT_COLS + ['removido']
+    files = [path for _, _, path in snapshot_files()]
+    if not files:
+        return pd.DataFrame(columns=cols)
+    dataset = ds.dataset(files, format='parquet', partitioning='hive', partition_base_dir=ATHLETES_PATH)
+    df = dataset.to_table(filter=ds.field('atleta_id') == int(atleta_id)).to_pandas()
+    df = df.sort_values('coletado_em', kind='stable').reset_index(drop=True)
+    valores = df[TRACKED_COLS + ['removido']]
+    mudou = ~((valores == valores.shift()) | (valores.isna() & valores.shift().isna())).all(axis=1)
+    return df[mudou.to_numpy()][cols].reset_index(drop=True)
+
+def status_history():
+    """Todas as mudanças de /mercado/status coletadas, em ordem de coleta."""
+    files = sorted(glob.glob(os.path.join(STATUS_PATH, 'temporada=*', 'rodada=*', '*.parquet')))
+    if not files:
+        return None
+    return pd.concat([pd.read_parquet(path) for path in files], ignore_index=True).sort_values('coletado_em', kind='stable')
+
+def is_fresh(path, max_age=MARKET_SNAPSHOT_MAX_AGE):
+    """
+    Se o arquivo existe e foi gravado há no máximo `max_age` segundos (None = sem limite). O coletor renova a data
+    de modificação dos arquivos mais recentes a cada coleta, mesmo sem mudanças: arquivo velho = coletor parado.
+    """
+    try:
+        return max_age is None or time.time() - os.path.getmtime(path) <= max_age
+    except OSError:
+        return False
+
+def read_latest_market(path=MARKET_LATEST_FILE, max_age=MARKET_SNAPSHOT_MAX_AGE):
+    """
+    Mercado completo da última coleta (lista de dicts no formato de /atletas/mercado), ou None se não houver coleta
+    ou se ela for mais antiga que `max_age` segundos (coletor parado).
+    """
+    if not is_fresh(path, max_age):
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except OSError:
+        return None
+    return df[SNAPSHOT_COLS].to_dict('records') if len(df) else None
+
+def read_latest_status(path=MARKET_STATUS_LATEST_FILE, max_age=MARKET_SNAPSHOT_MAX_AGE):
+    """Último /mercado/status coletado, ou None se não houver coleta recente (ver read_latest_market)."""
+    if not is_fresh(path, max_age):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['corpo']
+    except (OSError, ValueError, KeyError):
+        return None
+
+class MarketCollector:
+    """Estado do coletor entre consultas: o último mercado e o último status gravados."""
+
+    def __init__(self, base_url=CARTOLA_BASE_URL):
+        self.base_url = base_url
+        market = market_as_of()
+        self.market = None if market is None else market[TRACKED_COLS]
+        self.status = read_latest_status(max_age=None)
+
+    def collect(self):
+        """
+        Faz uma coleta: consulta os dois endpoints (revalidando o cache HTTP) e grava o que mudou.
+        Retorna um resumo da coleta, ou None se a API não respondeu.
+        """
+        status = fetch_json('/mercado/status', ttl=0, base_url=self.base_url)
+        payload = fetch_json('/atletas/mercado', ttl=0, base_url=self.base_url)
+        if not isinstance(status, dict) or not isinstance(payload, dict) or not payload.get('atletas'):
+            return None
+
+        agora = pd.Timestamp.now(tz='UTC').floor('ms')
+        ms = int(agora.timestamp() * 1000)
+        temporada, rodada = status.get('temporada', agora.year), status.get('rodada_atual', 0)
+        market = market_snapshot(payload['atletas'])
+
+        particao = _partition(ATHLETES_PATH, temporada, rodada)
+        if self.market is None or not glob.glob(os.path.join(particao, '*-completo.parquet')):
+            kind, rows = 'completo', market.assign(removido=False)
+        else:
+            kind, rows = 'delta', changed_rows(self.market, market)
+        if len(rows):
+            _write_parquet(rows.reset_index().assign(coletado_em=agora), os.path.join(particao, f"{ms}-{kind}.parquet"))
+        if len(rows) or not os.path.exists(MARKET_LATEST_FILE):
+            _write_parquet(market.reset_index().assign(coletado_em=agora), MARKET_LATEST_FILE)
+        else:
+            # Nada mudou: só a data de modificação anda, e as páginas continuam considerando o arquivo atual
+            os.utime(MARKET_LATEST_FILE)
+        self.market = market
+
+        status_mudou = status != self.status
+        if status_mudou:
+            linha = pd.json_normalize(status, sep='_').assign(coletado_em=agora)
+            _write_parquet(linha, os.path.join(_partition(STATUS_PATH, temporada, rodada), f"{ms}.parquet"))
+            self.status = status
+        tmp_path = f"{MARKET_STATUS_LATEST_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'coletado_em': agora.isoformat(), 'corpo': status}, f, ensure_ascii=False)
+        os.replace(tmp_path, MARKET_STATUS_LATEST_FILE)
+
+        return {'coletado_em': agora, 'temporada': temporada, 'rodada': rodada, 'tipo': kind,
+                'linhas': len(rows), 'status_mudou': status_mudou}
+
+    def run(self, interval=COLLECTOR_INTERVAL, iterations=None):
+        """Coleta a cada `interval` segundos (para sempre, ou `iterations` vezes)."""
+        n = 0
+        while iterations is None or n < iterations:
+            inicio = time.monotonic()
+            resumo = self.collect()
+            if resumo is None:
+                print("AVISO: API do Cartola indisponível; nova tentativa na próxima coleta.")
+            else:
+                print(f"[{resumo['coletado_em']:%Y-%m-%d %H:%M:%S}] {resumo['temporada']}/rodada {resumo['rodada']}: "
+                      f"{resumo['linhas']} linha(s) gravada(s) ({resumo['tipo']})"
+                      + (" | status do mercado mudou" if resumo['status_mudou'] else ""))
+            n += 1
+            if iterations is None or n < iterations:
+                time.sleep(max(0.0, interval - (time.monotonic() - inicio)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coleta periódica do mercado do Cartola (só as linhas que mudam).")
+    parser.add_argument('--intervalo', type=float, default=COLLECTOR_INTERVAL, help="Segundos entre coletas.")
+    parser.add_argument('--coletas', type=int, default=None, help="Número de coletas (padrão: até Ctrl+C).")
+    parser.add_argument('--url', default=CARTOLA_BASE_URL, help="URL base da API (ex.: o servidor fake).")
+    args = parser.parse_args()
+    print(f"Coletando {args.url} a cada {args.intervalo:.0f}s em '{MARKET_SNAPSHOT_PATH}' (Ctrl+C para encerrar)")
+    try:
+        MarketCollector(args.url).run(args.intervalo, args.coletas)
+    except KeyboardInterrupt:
+        pass
@@ -1,20 +1,93 @@
 import os
 
 # --- Configurações da API ---
-CARTOLA_BASE_URL = 'https://api.cartolafc.globo.com'
+# Pode apontar para o servidor local de testes (python -m src.cartola_fake) via variável de ambiente
+CARTOLA_BASE_URL = os.environ.get('CARTOLA_BASE_URL', 'https://api.cartolafc.globo.com')
+# Timeout de conexão e de leitura (segundos) de cada requisição
+API_TIMEOUT = (3.05, 10)
+# Novas tentativas em falhas de conexão e respostas 429/5xx, com espera exponencial (0.5s, 1s, 2s...)
+API_RETRIES = 3
+API_BACKOFF = 0.5
+# Conexões mantidas no pool da sessão e requisições simultâneas no modo em lote
+API_POOL_SIZE = 16
+API_CONCURRENCY = 8
 
 # --- Caminho Raiz do Projeto ---
 # Pega o caminho do diretório do arquivo (src) e sobe um nível para a raiz do projeto
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 # --- Paths para os Dados ---
-RAW_DATA_PATH = os.path.join(ROOT_DIR, 'dados_cartola/raw')
-INTERMEDIATE_DATA_PATH = os.path.join(ROOT_DIR, 'dados_cartola/02_intermediate')
-VISUALIZATION_DATA_PATH = os.path.join(ROOT_DIR, 'dados_cartola/03_visualizacoes')
+# O diretório de dados pode ser trocado por variável de ambiente (ex.: benchmarks com dados sintéticos)
+DATA_DIR = os.environ.get('ESCALAI_DATA_DIR', os.path.join(ROOT_DIR, 'dados_cartola'))
+RAW_DATA_PATH = os.path.join(DATA_DIR, 'raw')
+INTERMEDIATE_DATA_PATH = os.path.join(DATA_DIR, '02_intermediate')
+VISUALIZATION_DATA_PATH = os.path.join(DATA_DIR, '03_visualizacoes')
+# Cache em disco das respostas da API, compartilhado entre processos (não versionado)
+API_CACHE_PATH = os.environ.get('ESCALAI_API_CACHE', os.path.join(DATA_DIR, 'cache_api'))
+# Coletas do mercado ao vivo (src/coletor.py): mudanças por temporada/rodada e o mercado e o status mais recentes
+MARKET_SNAPSHOT_PATH = os.path.join(DATA_DIR, 'mercado')
+MARKET_LATEST_FILE = os.path.join(MARKET_SNAPSHOT_PATH, 'ultimo_mercado.parquet')
+MARKET_STATUS_LATEST_FILE = os.path.join(MARKET_SNAPSHOT_PATH, 'ultimo_status.json')
 
 # --- Nomes de Arquivos de Saída ---
-CONSOLIDATED_OUTPUT_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'dados_consolidados.parquet')
+# Dataset particionado no formato hive (ano=AAAA/rodada_id=N), com um arquivo por arquivo bruto de origem
+CONSOLIDATED_DATASET_PATH = os.path.join(INTERMEDIATE_DATA_PATH, 'dados_consolidados')
+RAW_MANIFEST_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'manifesto_raw.json')
+# Cópias em Arrow IPC (sem compressão) das saídas, mapeadas em memória pelas páginas e compartilhadas entre processos
+ARROW_STORE_PATH = os.path.join(DATA_DIR, 'arrow')
+ARROW_CONSOLIDATED_FILE = os.path.join(ARROW_STORE_PATH, 'dados_consolidados.arrow')
+MEMORY_REPORT_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'relatorio_memoria.json')
+# Resultado da validação de cada arquivo bruto e de cada temporada (lido pela etapa 02), e os arquivos recusados
+VALIDATION_REPORT_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'relatorio_validacao.json')
+QUARANTINE_PATH = os.path.join(INTERMEDIATE_DATA_PATH, 'quarentena')
 AGGREGATED_OUTPUT_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'dados_agregados_por_atleta.parquet')
+# Demais tabelas do cubo de agregação (etapa 05): atleta por temporada, clube por temporada e posição por rodada
+AGGREGATED_SEASON_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'agregado_atleta_temporada.parquet')
+AGGREGATED_CLUB_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'agregado_clube_temporada.parquet')
+AGGREGATED_POSITION_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'agregado_posicao_rodada.parquet')
+# Scouts da rodada (diferença entre acumulados consecutivos), uma linha por (atleta_id, ano, rodada_id)
+SCOUTS_ROUND_OUTPUT_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'scouts_por_rodada.parquet')
+# Forma recente por atleta (última temporada), mais o estado incremental por (atleta_id, ano) que a mantém
+FORM_OUTPUT_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'forma_atletas.parquet')
+FORM_STATE_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'estado_forma.parquet')
+FORM_ROUNDS_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'estado_forma_rodadas.json')
+# Índice de similaridade (vetores de scouts por jogo normalizados por posição) e as somas por temporada que o mantêm
+SIMILARITY_INDEX_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'indice_similaridade.parquet')
+SIMILARITY_STATE_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'estado_similaridade.parquet')
+SIMILARITY_SEASONS_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'estado_similaridade_temporadas.json')
+# Previsão de pontos da próxima rodada (etapa 09), o modelo com métricas e tempos, e as features em cache por temporada
+PREDICTIONS_OUTPUT_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'previsao_pontos.parquet')
+PREDICTION_MODEL_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'modelo_previsao.json')
+PREDICTION_FEATURES_PATH = os.path.join(INTERMEDIATE_DATA_PATH, 'features_previsao')
+PREDICTION_FEATURES_STATE_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'features_previsao_temporadas.json')
+# Simulação de estratégias de escalação (scripts/simular_estrategias.py): linhas por rodada e resumo por temporada
+SIMULATION_ROUNDS_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'simulacao_rodadas.parquet')
+SIMULATION_SUMMARY_FILE = os.path.join(INTERMEDIATE_DATA_PATH, 'simulacao_resumo.parquet')
+OUTLIERS_OUTPUT_FILE = os.path.join(VISUALIZATION_DATA_PATH, 'outliers_pontuacao.parquet')
+DESCRIPTIVE_STATS_FILE = os.path.join(VISUALIZATION_DATA_PATH, 'estatisticas_descritivas.json')
+# Tabelas pré-agregadas dos gráficos da etapa 4: boxplot de pontos por posição (estatísticas e outliers),
+# histograma 2D de preço vs. pontos e a reta de regressão por posição
+BOXPLOT_STATS_FILE = os.path.join(VISUALIZATION_DATA_PATH, 'boxplot_pontos_posicao.parquet')
+BOXPLOT_OUTLIERS_FILE = os.path.join(VISUALIZATION_DATA_PATH, 'boxplot_outliers_posicao.parquet')
+DENSITY_FILE = os.path.join(VISUALIZATION_DATA_PATH, 'densidade_preco_pontos.parquet')
+REGRESSION_FILE = os.path.join(VISUALIZATION_DATA_PATH, 'regressao_preco_pontos.parquet')
+# Exemplo de limpeza exibido na página de análise exploratória: uma linha de um arquivo bruto, antes e depois
+CLEANING_SAMPLE_FILE = os.path.join(VISUALIZATION_DATA_PATH, 'exemplo_limpeza.json')
+CLEANING_SAMPLE = {'arquivo': os.path.join('2025', 'rodada-11.csv'), 'atleta_id': 50317, 'colunas': ['apelido', 'CA', 'FC', 'FS']}
+
+# Estado do orquestrador: impressão digital das entradas de cada etapa na última execução bem-sucedida
+PIPELINE_STATE_FILE = os.path.join(DATA_DIR, 'pipeline_estado.json')
+# Relatório das execuções do pipeline (uma linha JSON por etapa de cada execução) e quantas execuções manter
+RUN_REPORT_FILE = os.path.join(DATA_DIR, 'relatorio_execucoes.jsonl')
+RUN_REPORT_MAX_RUNS = 200
+
+# --- Janela de temporadas da ingestão ---
+# 'todos' (todas as temporadas de dados_cartola/raw), um número N (as N mais recentes) ou um intervalo 'AAAA-AAAA'
+INGESTION_YEARS = os.environ.get('ESCALAI_ANOS', '4')
+
+# --- Paralelismo da ingestão ---
+# Número de processos usados para ler os arquivos brutos (padrão: todos os núcleos)
+INGESTION_WORKERS = int(os.environ.get('ESCALAI_INGESTION_WORKERS', os.cpu_count() or 1))
 
 # --- Listas de Colunas para Limpeza ---
 NUMERIC_COLS = ['pontos_num', 'preco_num', 'variacao_num', 'media_num', 'jogos_num']
@@ -22,3 +95,124 @@ SCOUT_COLS = [
     'A', 'CA', 'CV', 'DD', 'DP', 'DS', 'FC', 'FD', 'FF', 'FS', 
     'FT', 'G', 'GC', 'GS', 'I', 'PC', 'PE', 'PP', 'PS', 'RB', 'SG', 'V'
 ]
+ID_COLS = ['atleta_id', 'rodada_id', 'clube_id', 'posicao_id', 'status_id']
+# Apenas as colunas de texto usadas pelo pipeline (nome, slug, foto e o índice sem nome não são lidos)
+TEXT_COLS = ['apelido', 'clube.nome']
+
+# Colunas do dataset consolidado (todas as partições têm o mesmo schema)
+CONSOLIDATED_COLS = ID_COLS + TEXT_COLS + NUMERIC_COLS + SCOUT_COLS + ['ano']
+# Colunas codificadas no caminho das partições, e não dentro dos arquivos
+PARTITION_COLS = ['ano', 'rodada_id']
+
+# Schema compacto do dataset consolidado (coluna -> dtype do pandas), aplicado na ingestão.
+# Scouts são contagens inteiras; textos repetidos em toda linha jogador-rodada viram categorias.
+CONSOLIDATED_SCHEMA = {
+    'atleta_id': 'int32',
+    'rodada_id': 'int16',
+    'clube_id': 'int16',
+    'posicao_id': 'category',
+    'status_id': 'int8',
+    'apelido': 'category',
+    'clube.nome': 'category',
+    'pontos_num': 'float32',
+    'preco_num': 'float32',
+    'variacao_num': 'float32',
+    'media_num': 'float32',
+    'jogos_num': 'int16',
+    **{col: 'int16' for col in SCOUT_COLS},
+    'ano': 'int16',
+}
+
+# --- Validação da Ingestão ---
+# Regras aplicadas a cada arquivo bruto na leitura (src/validacao.py). Um problema de severidade 'erro' põe o
+# arquivo em quarentena (fora do dataset consolidado); 'aviso' só entra no relatório de validação.
+VALIDATION_REQUIRED_COLS = ['atleta_id', 'rodada_id', 'posicao_id', 'pontos_num', 'preco_num']
+# Colunas que não deveriam vir em branco (scouts em branco são o formato dos arquivos para zero e não contam)
+VALIDATION_NOT_NULL_COLS = NUMERIC_COLS
+# Chave de uma linha jogador-rodada
+VALIDATION_KEY = ['atleta_id', 'ano', 'rodada_id']
+# Faixas aceitas (mínimo, máximo; None = sem limite) depois da limpeza. Scouts são acumulados na temporada.
+VALIDATION_RANGES = {
+    'atleta_id': (1, None),
+    'rodada_id': (1, 38),
+    'pontos_num': (-30, 60),
+    'preco_num': (0, 100),
+    'variacao_num': (-30, 30),
+    'media_num': (-30, 60),
+    'jogos_num': (0, 38),
+    **{col: (0, None) for col in SCOUT_COLS},
+}
+# Status conhecidos (0 = status sem código numérico no arquivo)
+VALIDATION_STATUS_IDS = [0, 2, 3, 5, 6, 7]
+# Rodadas de uma temporada completa
+VALIDATION_SEASON_ROUNDS = 38
+VALIDATION_SEVERITY = {
+    'colunas_ausentes': 'erro',
+    'sem_linhas': 'erro',
+    'fora_da_faixa': 'erro',
+    'nulos': 'aviso',
+    'duplicados': 'aviso',
+    'posicao_desconhecida': 'aviso',
+    'status_desconhecido': 'aviso',
+}
+
+# --- Detecção de Outliers ---
+OUTLIER_METHODS = ['iqr', 'mad', 'zscore']
+OUTLIER_METHOD = 'iqr'
+# Colunas que definem os grupos dos limites (ex.: ['posicao_id', 'ano'] para limites por temporada)
+OUTLIER_GROUP_COLS = ['posicao_id']
+
+# --- Forma Recente ---
+# Número de jogos da janela móvel e span da média móvel exponencial (alpha = 2 / (span + 1))
+FORM_WINDOW = 5
+FORM_EWMA_SPAN = 5
+
+# --- Similaridade de Atletas ---
+# Mínimo de jogos no histórico para um atleta entrar no índice (menos jogos dão taxas de scouts instáveis)
+SIMILARITY_MIN_GAMES = 5
+
+# --- Previsão de Pontos ---
+# Janelas (em rodadas) das médias móveis de pontos usadas como features
+PREDICTION_WINDOWS = [3, 5]
+# Regularização da regressão ridge (sobre features padronizadas)
+PREDICTION_RIDGE_ALPHA = 10.0
+# Últimas rodadas da temporada mais recente separadas para validar o modelo antes do ajuste final
+PREDICTION_HOLDOUT_ROUNDS = 5
+
+# --- Otimizador de Escalação ---
+# Jogadores por posição em cada formação do Cartola (sempre 1 goleiro e 1 técnico)
+FORMATIONS = {
+    '3-4-3': {'gol': 1, 'lat': 0, 'zag': 3, 'mei': 4, 'ata': 3, 'tec': 1},
+    '3-5-2': {'gol': 1, 'lat': 0, 'zag': 3, 'mei': 5, 'ata': 2, 'tec': 1},
+    '4-3-3': {'gol': 1, 'lat': 2, 'zag': 2, 'mei': 3, 'ata': 3, 'tec': 1},
+    '4-4-2': {'gol': 1, 'lat': 2, 'zag': 2, 'mei': 4, 'ata': 2, 'tec': 1},
+    '4-5-1': {'gol': 1, 'lat': 2, 'zag': 2, 'mei': 5, 'ata': 1, 'tec': 1},
+    '5-3-2': {'gol': 1, 'lat': 2, 'zag': 3, 'mei': 3, 'ata': 2, 'tec': 1},
+    '5-4-1': {'gol': 1, 'lat': 2, 'zag': 3, 'mei': 4, 'ata': 1, 'tec': 1},
+}
+# 'pontos': média de pontos; 'risco': média - RISK_AVERSION * desvio padrão; 'valor': pontos por cartoleta;
+# 'previsao': pontos previstos para a próxima rodada (etapa 09)
+OPTIMIZER_OBJECTIVES = ['pontos', 'risco', 'valor', 'previsao']
+RISK_AVERSION = 0.5
+# Status do mercado aceitos na escalação (7 = Provável)
+LINEUP_STATUS_IDS = [7]
+
+# --- Simulação de Estratégias ---
+# Patrimônio inicial (cartoletas) de cada temporada simulada
+SIMULATION_START_BUDGET = 100.0
+# Processos da simulação (uma temporada por processo; padrão: todos os núcleos)
+SIMULATION_WORKERS = int(os.environ.get('ESCALAI_SIMULATION_WORKERS', os.cpu_count() or 1))
+
+# --- Coletor do Mercado ---
+# Segundos entre coletas de /atletas/mercado e /mercado/status
+COLLECTOR_INTERVAL = int(os.environ.get('ESCALAI_COLETOR_INTERVALO', '300'))
+# Idade máxima (segundos) da última coleta para as páginas a usarem no lugar da API
+MARKET_SNAPSHOT_MAX_AGE = 3600
+
+# --- Cache de artefatos das páginas ---
+# Memória máxima (MB) dos artefatos mantidos pelo registro de src/artefatos.py, compartilhado pelas sessões
+ARTIFACT_CACHE_MB = int(os.environ.get('ESCALAI_CACHE_MB', '256'))
+
+# --- Consultas SQL (DuckDB) ---
+# Máximo de linhas devolvidas por uma consulta livre na página de consultas
+QUERY_ROW_LIMIT = 5000
@@ -0,0 +1,180 @@
+import glob
+import os
+
+import duckdb
+
+from src.config import (DATA_DIR, RAW_DATA_PATH, CONSOLIDATED_DATASET_PATH, RAW_MANIFEST_FILE, AGGREGATED_OUTPUT_FILE,
+                        AGGREGATED_SEASON_FILE, AGGREGATED_CLUB_FILE, AGGREGATED_POSITION_FILE,
+                        SCOUTS_ROUND_OUTPUT_FILE, FORM_OUTPUT_FILE, PREDICTIONS_OUTPUT_FILE, SCOUT_COLS, QUERY_ROW_LIMIT)
+
+# Camada de consultas SQL (DuckDB) sobre as saídas parquet do pipeline.
+# As views leem os arquivos no momento da consulta: filtros, agrupamentos e top-k rodam no DuckDB,
+# e só o resultado chega ao pandas. Filtros por ano/rodada_id descartam partições inteiras do dataset consolidado.
+
+# Tabelas de um arquivo parquet cada (view -> caminho)
+TABLES = {
+    'agregado': AGGREGATED_OUTPUT_FILE,
+    'agregado_temporada': AGGREGATED_SEASON_FILE,
+    'clube_temporada': AGGREGATED_CLUB_FILE,
+    'posicao_rodada': AGGREGATED_POSITION_FILE,
+    'scouts_rodada': SCOUTS_ROUND_OUTPUT_FILE,
+    'forma': FORM_OUTPUT_FILE,
+    'previsao': PREDICTIONS_OUTPUT_FILE,
+}
+
+# Opções de ranking() (nome na interface -> expressão SQL); nomes de colunas não podem ser parâmetros,
+# então só entram na consulta valores destas listas
+RANKING_GROUPS = {'clube': 'clube', 'posicao': 'posicao', 'ano': 'ano'}
+RANKING_METRICS = ['pontos', 'preco', 'variacao'] + SCOUT_COLS
+RANKING_AGGREGATIONS = {'soma': 'sum', 'media': 'avg', 'maximo': 'max'}
+# Colunas de ordenação aceitas em top_aggregated()
+AGGREGATED_ORDER_COLS = ['media_pontos', 'total_pontos', 'custo_beneficio_medio', 'jogos_disputados', 'media_preco']
+
+def _quote(path):
+    """Caminho como literal de string SQL."""
+    return "'" + path.replace("'", "''") + "'"
+
+def outputs_version():
+    """
+    Versão das saídas do pipeline: mtimes dos arquivos das views e do manifesto da ingestão
+    (que muda sempre que o dataset consolidado muda). Serve de chave para caches de consultas.
+    """
+    paths = list(TABLES.values()) + [RAW_MANIFEST_FILE]
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+
+def connect(include_raw=False):
+    """
+    Abre um banco DuckDB em memória com as views das saídas existentes do pipeline:
+    - 'consolidado': dataset particionado (ano e rodada_id vêm do caminho das partições).
+    - 'agregado', 'agregado_temporada', 'clube_temporada', 'posicao_rodada', 'scouts_rodada', 'forma' e 'previsao':
+      um parquet cada (ver TABLES).
+    - 'rodadas': uma linha por (atleta_id, ano, rodada_id), com pontos, preço e os scouts da rodada
+      (não os acumulados da temporada), quando 'scouts_rodada' existe.
+    - Com `include_raw=True`, 'bruto': os CSVs de rodada de dados_cartola/raw, com o ano do diretório.
+    Depois de criar as views, a conexão só acessa arquivos dentro de DATA_DIR (read_text, read_csv, COPY, ATTACH
+    e extensões fora dele são recusados) e a configuração fica travada: a consulta livre da página não lê
+    outros arquivos do servidor.
+    """
+    con = duckdb.connect()
+    if glob.glob(os.path.join(CONSOLIDATED_DATASET_PATH, '*', '*', '*.parquet')):
+        pattern = os.path.join(CONSOLIDATED_DATASET_PATH, '*', '*', '*.parquet')
+        con.execute(f"CREATE VIEW consolidado AS SELECT * FROM read_parquet({_quote(pattern)}, hive_partitioning = true)")
+    for name, path in TABLES.items():
+        if os.path.exists(path):
+            con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet({_quote(path)})")
+
+    views = available_views(con)
+    if 'consolidado' in views:
+        # Rodadas repetidas em dois arquivos brutos (ex.: 'rodada-0.csv' e 'rodada-1.csv' de 2022) viram uma linha
+        base = """
+            SELECT atleta_id, ano, rodada_id, any_value(apelido) AS apelido, any_value("clube.nome") AS clube,
+                   any_value(posicao_id) AS posicao, any_value(status_id) AS status_id,
+                   max(pontos_num) AS pontos, max(preco_num) AS preco, max(variacao_num) AS variacao
+            FROM consolidado GROUP BY atleta_id, ano, rodada_id
+        """
+        if 'scouts_rodada' in views:
+            scouts = ', '.join(f's."{col}"' for col in SCOUT_COLS)
+            con.execute(f"""
+                CREATE VIEW rodadas AS
+                SELECT b.*, {scouts} FROM ({base}) b
+                LEFT JOIN scouts_rodada s ON s.atleta_id = b.atleta_id AND s.ano = b.ano AND s.rodada_id = b.rodada_id
+            """)
+        else:
+            con.execute(f"CREATE VIEW rodadas AS {base}")
+
+    if include_raw:
+        pattern = os.path.join(RAW_DATA_PATH, '*', 'rodada-*.csv')
+        if glob.glob(pattern):
+            con.execute(f"""
+                CREATE VIEW bruto AS
+                SELECT *, CAST(regexp_extract(filename, '[/\\\\](\\d{{4}})[/\\\\][^/\\\\]+$', 1) AS INTEGER) AS ano
+                FROM read_csv({_quote(pattern)}, union_by_name = true, filename = true, all_varchar = true)
+            """)
+
+    # As views leem os arquivos na hora da consulta, então o acesso a DATA_DIR continua liberado
+    con.execute(f"SET allowed_directories = [{_quote(os.path.join(DATA_DIR, ''))}]")
+    con.execute("SET enable_external_access = false")
+    con.execute("SET lock_configuration = true")
+    return con
+
+def available_views(con):
+    """Nomes das views disponíveis na conexão."""
+    return sorted(row[0] for row in con.execute("SELECT view_name FROM duckdb_views() WHERE NOT internal").fetchall())
+
+def run_query(con, sql, params=None, limit=QUERY_ROW_LIMIT):
+    """
+    Executa uma consulta livre (uma única instrução SELECT) e devolve no máximo `limit` linhas em um DataFrame.
+    Levanta ValueError para outras instruções (CREATE, COPY, INSERT...) e duckdb.Error para erros de SQL
+    e para leituras de arquivos fora de DATA_DIR (ver connect).
+    """
+    statements = con.extract_statements(sql)
+    if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError("Apenas uma instrução SELECT (ou WITH ... SELECT) é aceita.")
+    return con.sql(sql, params=params).limit(limit).df()
+
+def ranking(con, metrica='pontos', agregacao='soma', agrupar_por='clube', ano=None, rodadas=None,
+            posicoes=None, k=10):
+    """
+    Top-k atletas por grupo sobre a view 'rodadas' (ex.: artilheiros por clube nas rodadas 10 a 20 de 2023:
+    metrica='G', agrupar_por='clube', ano=2023, rodadas=(10, 20), k=3).
+    - `agrupar_por=None` devolve o top-k geral.
+    - Um atleta que trocou de clube aparece em cada clube com as rodadas que jogou por ele.
+    - Só rodadas em que o atleta pontuou (pontos != 0) contam para médias e para 'jogos'.
+    """
+    if metrica not in RANKING_METRICS:
+        raise ValueError(f"Métrica inválida: '{metrica}'. Opções: {RANKING_METRICS}")
+    if agregacao not in RANKING_AGGREGATIONS:
+        raise ValueError(f"Agregação inválida: '{agregacao}'. Opções: {list(RANKING_AGGREGATIONS)}")
+    if agrupar_por is not None and agrupar_por not in RANKING_GROUPS:
+        raise ValueError(f"Agrupamento inválido: '{agrupar_por}'. Opções: {list(RANKING_GROUPS)}")
+
+    where, params = ['pontos <> 0'], {'k': int(k)}
+    if ano is not None:
+        where.append('ano = $ano')
+        params['ano'] = int(ano)
+    if rodadas is not None:
+        where.append('rodada_id BETWEEN $rodada_inicio AND $rodada_fim')
+        params['rodada_inicio'], params['rodada_fim'] = int(rodadas[0]), int(rodadas[1])
+    if posicoes:
+        where.append('list_contains($posicoes, posicao)')
+        params['posicoes'] = list(posicoes)
+
+    group = RANKING_GROUPS[agrupar_por] if agrupar_por else None
+    group_select = f'{group} AS "{agrupar_por}", ' if group else ''
+    group_by = f'{group}, ' if group else ''
+    partition = f'PARTITION BY "{agrupar_por}" ' if group else ''
+    order = f'"{agrupar_por}", ' if group else ''
+    sql = f"""
+        SELECT * FROM (
+            SELECT {group_select}atleta_id, any_value(apelido) AS apelido, any_value(posicao) AS posicao,
+                   {RANKING_AGGREGATIONS[agregacao]}("{metrica}") AS valor, count(*) AS jogos
+            FROM rodadas
+            WHERE {' AND '.join(where)}
+            GROUP BY {group_by}atleta_id
+        )
+        QUALIFY row_number() OVER ({partition}ORDER BY valor DESC, atleta_id) <= $k
+        ORDER BY {order}valor DESC, atleta_id
+    """
+    return con.execute(sql, params).df()
+
+def aggregated_summary(con, atleta_ids=None):
+    """Número de atletas e máximo de jogos disputados na tabela agregada (opcionalmente só os atleta_ids informados)."""
+    where, params = '', {}
+    if atleta_ids is not None:
+        where, params = 'WHERE list_contains($atleta_ids, atleta_id)', {'atleta_ids': [int(i) for i in atleta_ids]}
+    atletas, max_jogos = con.execute(f"SELECT count(*), max(jogos_disputados) FROM agregado {where}", params).fetchone()
+    return {'atletas': atletas, 'max_jogos': max_jogos or 0}
+
+def top_aggregated(con, ordem, min_jogos=1, atleta_ids=None, k=20):
+    """Top-k da tabela agregada por `ordem` (ver AGGREGATED_ORDER_COLS), com mínimo de jogos e filtro opcional por atleta_id."""
+    if ordem not in AGGREGATED_ORDER_COLS:
+        raise ValueError(f"Ordenação inválida: '{ordem}'. Opções: {AGGREGATED_ORDER_COLS}")
+    where, params = ['jogos_disputados >= $min_jogos'], {'min_jogos': int(min_jogos), 'k': int(k)}
+    if atleta_ids is not None:
+        where.append('list_contains($atleta_ids, atleta_id)')
+        params['atleta_ids'] = [int(i) for i in atleta_ids]
+    sql = f"""
+        SELECT * FROM agregado WHERE {' AND '.join(where)}
+        ORDER BY "{ordem}" DESC NULLS LAST, atleta_id LIMIT $k
+    """
+    return con.execute(sql, params).df()
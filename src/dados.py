@@ -1,45 +1,198 @@
 import streamlit as st
 import pandas as pd
-import plotly.io as pio
-import requests
+import json
 import os
-from src.config import CARTOLA_BASE_URL, INTERMEDIATE_DATA_PATH, VISUALIZATION_DATA_PATH
+from src.config import (INTERMEDIATE_DATA_PATH, VISUALIZATION_DATA_PATH, RUN_REPORT_FILE, DESCRIPTIVE_STATS_FILE,
+                        CLEANING_SAMPLE_FILE, SIMILARITY_INDEX_FILE, AGGREGATED_OUTPUT_FILE, FORM_OUTPUT_FILE,
+                        PREDICTIONS_OUTPUT_FILE, MARKET_LATEST_FILE)
+from src.artefatos import load_artifact
+import pyarrow.parquet as pq
+from src.armazenamento import arrow_path, open_arrow
+from src.cartola_api import fetch_json
+from src.coletor import is_fresh, read_latest_market, read_latest_status
+from src.similaridade import search_structure
+from src.indice_atletas import INDEX_AGGREGATED_COLS, market_columns, market_version, build_player_index
+from src.consultas import connect, outputs_version, available_views, run_query, ranking, aggregated_summary, top_aggregated
 
 @st.cache_data(ttl=300)
+def _fetch_mercado_status():
+    return fetch_json('/mercado/status', ttl=300)
+
 def get_mercado_status():
-    """Busca o status atual do mercado na API do Cartola."""
-    try:
-        response = requests.get(f"{CARTOLA_BASE_URL}/mercado/status")
-        return response.json() if response.status_code == 200 else None
-    except requests.exceptions.RequestException:
-        return None
+    """
+    Status atual do mercado: o da última coleta do coletor (src/coletor.py), se recente; senão,
+    busca na API do Cartola (com cache em disco e revalidação).
+    """
+    status = read_latest_status()
+    return status if status is not None else _fetch_mercado_status()
+
+def _read_parquet(path, columns=None):
+    return pd.read_parquet(path, columns=None if columns is None else list(columns))
+
+def _read_arrow(path, columns=None):
+    table = open_arrow(path)
+    return (table if columns is None else table.select(list(columns))).to_pandas()
 
-@st.cache_data
-def load_parquet_data(file_name):
-    """Carrega um arquivo Parquet do diretório intermediário."""
+def open_table(name):
+    """
+    Tabela do armazenamento Arrow (ex.: 'dados_consolidados', 'dados_agregados_por_atleta') mapeada em memória,
+    sem materializar nada: o pyarrow.Table aponta para o arquivo, cujas páginas o sistema operacional
+    compartilha entre todos os processos do Streamlit. Retorna None se a tabela não foi publicada.
+    """
+    return load_artifact(arrow_path(name), open_arrow)
+
+def load_table(name, columns=None, filters=None):
+    """
+    Materializa em pandas só as colunas e linhas pedidas de uma tabela do armazenamento Arrow (ver open_table):
+    projeção e filtro rodam sobre o arquivo mapeado, antes de to_pandas.
+    `filters` usa o formato do pyarrow, ex.: [('ano', '==', 2025), ('rodada_id', '>=', 10)].
+    Sem a cópia Arrow, lê as mesmas colunas e linhas do parquet do diretório intermediário; None se nenhum existir.
+    """
+    table = open_table(name)
+    if table is None:
+        path = os.path.join(INTERMEDIATE_DATA_PATH, os.path.splitext(os.path.basename(name))[0] + '.parquet')
+        if not os.path.exists(path):
+            return None
+        return pq.read_table(path, columns=None if columns is None else list(columns), filters=filters).to_pandas()
+    if filters:
+        table = table.filter(pq.filters_to_expression(filters))
+    return (table if columns is None else table.select(list(columns))).to_pandas()
+
+def load_parquet_data(file_name, columns=None):
+    """
+    Carrega uma tabela do diretório intermediário (via registro de artefatos, recarregada quando o arquivo muda).
+    Lê a cópia do armazenamento Arrow quando o pipeline a publicou (mapeada em memória, sem descompressão),
+    senão o próprio parquet; com `columns`, só essas colunas chegam ao pandas.
+    """
     path = os.path.join(INTERMEDIATE_DATA_PATH, file_name)
-    if not os.path.exists(path):
+    columns = None if columns is None else tuple(columns)
+    df = load_artifact(arrow_path(file_name), _read_arrow, columns)
+    if df is None:
+        df = load_artifact(path, _read_parquet, columns)
+    if df is None:
         st.error(f"Arquivo de dados não encontrado: {path}. Execute o pipeline de processamento.")
-        return None
-    return pd.read_parquet(path)
+    return df
 
-@st.cache_data
-def load_plot(file_name):
-    """Carrega uma figura Plotly a partir de um arquivo JSON."""
+def load_visualization_table(file_name, columns=None):
+    """
+    Carrega uma tabela parquet do diretório de visualizações (opcionalmente só algumas colunas), ou None se não existir.
+    `file_name` é o nome do arquivo nesse diretório ou o caminho completo (ex.: OUTLIERS_OUTPUT_FILE de src/config.py).
+    """
     path = os.path.join(VISUALIZATION_DATA_PATH, file_name)
-    if not os.path.exists(path):
-        return None
-    with open(path, 'r') as f:
-        return pio.from_json(f.read())
+    return load_artifact(path, _read_parquet, None if columns is None else tuple(columns))
 
+def load_descriptive_stats():
+    """Carrega as estatísticas descritivas gravadas pela etapa 3 (JSON orient='table'), ou None se não existirem."""
+    return load_artifact(DESCRIPTIVE_STATS_FILE, pd.read_json, orient='table')
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_cleaning_sample():
+    """Carrega o exemplo de limpeza (antes/depois) gravado pela etapa 1, ou None se não existir."""
+    return load_artifact(CLEANING_SAMPLE_FILE, _read_json)
+
+def _read_similarity_structure(path):
+    return search_structure(pd.read_parquet(path))
+
+def load_similarity_search():
+    """Estrutura de busca do índice de similaridade (etapa 08), montada uma vez por versão do índice; None se não existir."""
+    return load_artifact(SIMILARITY_INDEX_FILE, _read_similarity_structure)
 
 @st.cache_data(ttl=3600)
+def _fetch_current_season_players():
+    payload = fetch_json('/atletas/mercado', ttl=3600)
+    return payload.get('atletas', []) if isinstance(payload, dict) else []
+
 def get_current_season_players():
-    """Busca os atletas do mercado da temporada atual na API do Cartola."""
-    try:
-        response = requests.get(f"{CARTOLA_BASE_URL}/atletas/mercado")
-        if response.status_code == 200:
-            return response.json().get('atletas', [])
-        return []
-    except (requests.exceptions.RequestException, KeyError):
-        return []
+    """
+    Atletas do mercado da temporada atual: os da última coleta do coletor (src/coletor.py), lidos do disco
+    enquanto ela for recente; sem coletor rodando, busca na API do Cartola (com cache em disco e revalidação).
+    """
+    if is_fresh(MARKET_LATEST_FILE):
+        atletas = load_artifact(MARKET_LATEST_FILE, read_latest_market, max_age=None)
+        if atletas:
+            return atletas
+    return _fetch_current_season_players()
+
+@st.cache_resource(ttl=300, max_entries=1)
+def get_market_frame():
+    """
+    Mercado atual convertido uma vez em colunas (DataFrame indexado por atleta_id, compartilhado pelas sessões)
+    e a versão do seu conteúdo; o mercado é relido a cada 5 minutos, mas só um mercado alterado muda a versão.
+    """
+    market = market_columns(get_current_season_players())
+    return market, market_version(market)
+
+def _read_output(path, columns=None):
+    """Saída do pipeline pela cópia Arrow (mapeada em memória) ou pelo parquet; None se não existir."""
+    df = load_artifact(arrow_path(path), _read_arrow, columns)
+    return df if df is not None else load_artifact(path, _read_parquet, columns)
+
+@st.cache_resource(max_entries=2)
+def _player_index(versao, versao_mercado, _market):
+    aggregated = _read_output(AGGREGATED_OUTPUT_FILE, tuple(INDEX_AGGREGATED_COLS))
+    if aggregated is None:
+        return None
+    form = _read_output(FORM_OUTPUT_FILE, ('atleta_id', 'media_forma', 'std_forma', 'ewma_pontos'))
+    predictions = _read_output(PREDICTIONS_OUTPUT_FILE, ('atleta_id', 'pontos_previstos'))
+    return build_player_index(aggregated, _market, form, predictions)
+
+def load_player_index():
+    """
+    Índice de atletas por atleta_id (ver src/indice_atletas.py): {'atletas': todos, 'ativos': os do mercado atual}.
+    Remontado só quando as saídas do pipeline ou o conteúdo do mercado mudam; None sem a tabela agregada.
+    """
+    market, versao_mercado = get_market_frame()
+    return _player_index(outputs_version(), versao_mercado, market)
+
+def load_run_report():
+    """Carrega o relatório de execuções do pipeline (uma linha por etapa de cada execução), ou None se não existir."""
+    return load_artifact(RUN_REPORT_FILE, pd.read_json, lines=True, convert_dates=False)
+
+@st.cache_resource(max_entries=4)
+def get_query_engine(versao, include_raw=False):
+    """Banco DuckDB com as views das saídas do pipeline; recriado quando a versão das saídas muda (ver outputs_version)."""
+    return connect(include_raw=include_raw)
+
+def _query_cursor(versao, include_raw=False):
+    """Cursor próprio para a sessão: a conexão do DuckDB não deve ser usada por duas threads ao mesmo tempo."""
+    return get_query_engine(versao, include_raw).cursor()
+
+def list_query_views(include_raw=False):
+    """Views disponíveis para consultas (dependem das saídas já geradas pelo pipeline)."""
+    return available_views(_query_cursor(outputs_version(), include_raw))
+
+def query_sql(sql, params=None, include_raw=False):
+    """Consulta SQL livre sobre as saídas do pipeline (uma instrução SELECT; ver src.consultas.run_query)."""
+    return _query_sql(sql, params, include_raw, outputs_version())
+
+@st.cache_data(max_entries=64)
+def _query_sql(sql, params, include_raw, versao):
+    return run_query(_query_cursor(versao, include_raw), sql, params)
+
+@st.cache_data(max_entries=64)
+def _ranking(versao, **kwargs):
+    return ranking(_query_cursor(versao), **kwargs)
+
+def rank_players(**kwargs):
+    """Top-k atletas por grupo sobre as rodadas do dataset consolidado (argumentos de src.consultas.ranking)."""
+    return _ranking(outputs_version(), **kwargs)
+
+@st.cache_data(max_entries=64)
+def _aggregated_summary(versao, atleta_ids):
+    return aggregated_summary(_query_cursor(versao), atleta_ids)
+
+def load_aggregated_summary(atleta_ids=None):
+    """Número de atletas e máximo de jogos da tabela agregada, opcionalmente só para os atleta_ids informados."""
+    return _aggregated_summary(outputs_version(), None if atleta_ids is None else tuple(sorted(int(i) for i in atleta_ids)))
+
+@st.cache_data(max_entries=64)
+def _top_aggregated(versao, ordem, min_jogos, atleta_ids, k):
+    return top_aggregated(_query_cursor(versao), ordem, min_jogos, atleta_ids, k)
+
+def load_top_aggregated(ordem, min_jogos=1, atleta_ids=None, k=20):
+    """Top-k da tabela agregada por `ordem`, calculado no DuckDB (só as k linhas chegam ao pandas)."""
+    ids = None if atleta_ids is None else tuple(sorted(int(i) for i in atleta_ids))
+    return _top_aggregated(outputs_version(), ordem, min_jogos, ids, k)
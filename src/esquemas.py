@@ -0,0 +1,201 @@
+import fnmatch
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.config import NUMERIC_COLS, SCOUT_COLS, ID_COLS
+
+# Adaptadores de schema por temporada: cada layout dos dados brutos declara os arquivos que lê e o mapa
+# coluna bruta -> coluna canônica (só as colunas mapeadas são lidas). Os códigos de posição, status e clube,
+# que mudam de forma entre temporadas (e às vezes dentro de uma), são traduzidos pelos dicionários abaixo,
+# aplicados aos valores únicos de cada coluna, e não linha a linha.
+
+POS_MAP = {
+    '1': 'gol', 'gol': 'gol',
+    '2': 'lat', 'lat': 'lat',
+    '3': 'zag', 'zag': 'zag',
+    '4': 'mei', 'mei': 'mei',
+    '5': 'ata', 'ata': 'ata',
+    '6': 'tec', 'tec': 'tec'
+}
+
+# Códigos do status do atleta no Cartola; 2018 a 2020 trazem a descrição no lugar do código
+STATUS_MAP = {
+    '2': 2, 'dúvida': 2,
+    '3': 3, 'suspenso': 3,
+    '5': 5, 'contundido': 5,
+    '6': 6, 'nulo': 6,
+    '7': 7, 'provável': 7,
+}
+
+# Clubes por clube_id do Cartola: nome canônico e siglas usadas nos arquivos. 2018 traz a sigla no lugar do
+# clube_id, 2020 às vezes traz o clube_id no lugar do nome e 2025 traz a sigla no lugar do nome.
+CLUBES = {
+    262: ('Flamengo', ['FLA']),
+    263: ('Botafogo', ['BOT']),
+    264: ('Corinthians', ['COR']),
+    265: ('Bahia', ['BAH']),
+    266: ('Fluminense', ['FLU']),
+    267: ('Vasco', ['VAS']),
+    275: ('Palmeiras', ['PAL']),
+    276: ('São Paulo', ['SAO']),
+    277: ('Santos', ['SAN']),
+    280: ('Bragantino', ['BGT', 'RBB']),
+    282: ('Atlético-MG', ['CAM']),
+    283: ('Cruzeiro', ['CRU']),
+    284: ('Grêmio', ['GRE']),
+    285: ('Internacional', ['INT']),
+    286: ('Juventude', ['JUV']),
+    287: ('Vitória', ['VIT']),
+    288: ('Criciúma', ['CRI']),
+    290: ('Goiás', ['GOI']),
+    292: ('Sport', ['SPO', 'SPT']),
+    293: ('Athlético-PR', ['CAP']),
+    294: ('Coritiba', ['CFC']),
+    303: ('Ponte Preta', ['PON']),
+    314: ('Avaí', ['AVA']),
+    315: ('Chapecoense', ['CHA']),
+    316: ('Figueirense', ['FIG']),
+    317: ('Joinville', ['JEC']),
+    327: ('América-MG', ['AME']),
+    341: ('CSA', ['CSA']),
+    344: ('Santa Cruz', ['SCZ']),
+    354: ('Ceará', ['CEA']),
+    356: ('Fortaleza', ['FOR']),
+    370: ('Paraná', ['PAR']),
+    373: ('Atlético-GO', ['ACG']),
+    1371: ('Cuiabá', ['CUI']),
+    2305: ('Mirassol', ['MIR']),
+}
+# Nomes antigos ou alternativos (em minúsculas) -> clube_id
+CLUB_ALIASES = {'atlético-pr': 293, 'athletico-pr': 293, 'red bull bragantino': 280}
+
+CLUB_NAMES = {clube_id: nome for clube_id, (nome, _) in CLUBES.items()}
+CLUB_IDS_BY_NAME = {**{nome.lower(): clube_id for clube_id, (nome, _) in CLUBES.items()}, **CLUB_ALIASES}
+# Siglas ambíguas nos arquivos ficam fora de CLUBES: 'ATL', que em 2018 é tanto o Atlético-MG quanto o
+# Athlético-PR, não tem entrada aqui, e resolve_clubs decide pelo nome (consultado antes da sigla)
+CLUB_IDS_BY_ABBR = {sigla: clube_id for clube_id, (_, siglas) in CLUBES.items() for sigla in siglas}
+
+# Caracteres que aparecem quando texto UTF-8 foi lido como latin-1/cp1252 ('Ã©' no lugar de 'é')
+MOJIBAKE_MARKERS = ('Ã', 'Â')
+
+LAYOUTS = {
+    # Um CSV por rodada (2018 em diante): 'atletas.<coluna>', o nome do clube e os scouts acumulados sem prefixo
+    'rodadas_csv': {
+        'arquivos': ['rodada-*.csv'],
+        'colunas': {
+            **{f'atletas.{col}': col for col in ID_COLS + NUMERIC_COLS + ['apelido']},
+            'atletas.clube.id.full.name': 'clube.nome',
+            **{col: col for col in SCOUT_COLS},
+        },
+    },
+    # O JSON do endpoint /atletas/mercado salvo a cada rodada (2021): scouts em 'scout', clubes em 'clubes'
+    'mercado_json': {
+        'arquivos': ['Mercado_*.txt'],
+        'colunas': {col: col for col in ID_COLS + NUMERIC_COLS + ['apelido']},
+    },
+    # Um CSV por temporada com todas as rodadas (2014 a 2016); apelido e posição vêm de AAAA_jogadores.csv.
+    # A rodada 0 é só o preço de abertura e é descartada. Os scouts são os da rodada (acumulados na leitura,
+    # como nos demais layouts), e os jogos são contados por 'Participou' quando a coluna Jogos falta (2016).
+    # Rodadas sem participação vêm sem ClubeID em 2014: vale o clube do cadastro do jogador.
+    'scouts_raw': {
+        'arquivos': ['*_scouts_raw.csv'],
+        'colunas': {
+            'AtletaID': 'atleta_id', 'Rodada': 'rodada_id', 'ClubeID': 'clube_id', 'Pontos': 'pontos_num',
+            'PontosMedia': 'media_num', 'Preco': 'preco_num', 'PrecoVariacao': 'variacao_num', 'Jogos': 'jogos_num',
+            'Participou': 'participou', **{col: col for col in SCOUT_COLS},
+        },
+        'jogadores': {'ID': 'atleta_id', 'Apelido': 'apelido', 'PosicaoID': 'posicao_id', 'ClubeID': 'clube_jogador'},
+        'scouts_acumulados': False,
+    },
+}
+
+# Layouts de cada temporada; temporadas fora da tabela usam DEFAULT_LAYOUTS
+SEASON_LAYOUTS = {
+    2014: ['scouts_raw'], 2015: ['scouts_raw'], 2016: ['scouts_raw'],
+    2021: ['mercado_json'],
+}
+DEFAULT_LAYOUTS = ['rodadas_csv', 'mercado_json']
+# Opções de um layout que valem só para uma temporada (2015 já traz os scouts acumulados)
+SEASON_OVERRIDES = {2015: {'scouts_acumulados': True}}
+
+def season_layouts(year):
+    """Nomes dos layouts dos arquivos brutos de uma temporada."""
+    return SEASON_LAYOUTS.get(int(year), DEFAULT_LAYOUTS)
+
+def raw_patterns(year):
+    """Padrões (glob) dos arquivos brutos de uma temporada, segundo os seus layouts."""
+    return [pattern for layout in season_layouts(year) for pattern in LAYOUTS[layout]['arquivos']]
+
+def adapter_for_file(path):
+    """
+    Adaptador de um arquivo bruto, pela temporada do diretório e pelo nome do arquivo: (nome do layout, opções),
+    com as opções da temporada em SEASON_OVERRIDES já aplicadas. Retorna (None, None) para arquivos fora dos layouts.
+    """
+    year, name = os.path.basename(os.path.dirname(path)), os.path.basename(path)
+    layouts = season_layouts(year) if year.isdigit() else DEFAULT_LAYOUTS
+    for layout in layouts:
+        if any(fnmatch.fnmatch(name, pattern) for pattern in LAYOUTS[layout]['arquivos']):
+            overrides = SEASON_OVERRIDES.get(int(year), {}) if year.isdigit() else {}
+            return layout, {**LAYOUTS[layout], **overrides}
+    return None, None
+
+def repair_text(value):
+    """
+    Desfaz o mojibake de um texto UTF-8 lido como latin-1 ou cp1252 ('SÃ£o Paulo' -> 'São Paulo').
+    Textos sem os marcadores, ou que não voltam a ser UTF-8 válido ('Ângelo'), saem como entraram.
+    """
+    if not isinstance(value, str) or not any(marker in value for marker in MOJIBAKE_MARKERS):
+        return value
+    for encoding in ('latin-1', 'cp1252'):
+        try:
+            return value.encode(encoding).decode('utf-8')
+        except UnicodeError:
+            continue
+    return value
+
+def position_name(value):
+    """Posição por extenso ('gol', 'lat', ...) de um código ou sigla; 'desconhecida' se não reconhecida."""
+    return POS_MAP.get(str(value).strip().lower(), 'desconhecida')
+
+def status_code(value):
+    """Código numérico do status a partir do código ou da descrição; 0 se ausente ou não reconhecido."""
+    key = str(value).strip().lower()
+    if key in STATUS_MAP:
+        return STATUS_MAP[key]
+    try:
+        return int(float(key))
+    except (ValueError, OverflowError):
+        return 0
+
+def map_unique(series, mapper):
+    """
+    Aplica `mapper` (dict ou função) uma vez por valor distinto da coluna (nulos inclusive), e não por linha.
+    Retorna uma coluna categórica cujas categorias são os valores distintos do resultado.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    novos, categorias = pd.factorize(pd.Index(uniques, dtype=object).map(mapper))
+    return pd.Series(pd.Categorical.from_codes(novos[codes], categories=categorias), index=series.index)
+
+def resolve_clubs(clube_id, clube_nome):
+    """
+    clube_id numérico e nome canônico de cada linha, calculados uma vez por par (clube_id, nome) distinto:
+    - o clube_id vem do próprio valor quando numérico, senão do nome e, por fim, da sigla;
+    - o nome vem de CLUBES pelo clube_id; clubes fora da tabela mantêm o nome do arquivo, com o texto reparado.
+    Retorna (clube_id em float, NaN se desconhecido; nome como coluna categórica), alinhadas à entrada.
+    """
+    id_codes, ids = pd.factorize(clube_id.astype('string').str.strip(), use_na_sentinel=False)
+    nome_codes, nomes = pd.factorize(clube_nome.astype('string'), use_na_sentinel=False)
+    pares, inversa = np.unique(id_codes.astype('int64') * (len(nomes) + 1) + nome_codes, return_inverse=True)
+    ids = pd.Series(ids, dtype='string').take(pares // (len(nomes) + 1)).reset_index(drop=True)
+    nomes = pd.Series(nomes, dtype='string').take(pares % (len(nomes) + 1)).reset_index(drop=True)
+    nomes = nomes.map(repair_text, na_action='ignore').astype('string')
+
+    resolvido = pd.to_numeric(ids, errors='coerce')
+    resolvido = resolvido.fillna(nomes.str.lower().map(CLUB_IDS_BY_NAME).astype('float64'))
+    resolvido = resolvido.fillna(ids.str.upper().map(CLUB_IDS_BY_ABBR).astype('float64'))
+    canonico = resolvido.map(CLUB_NAMES).astype('string').fillna(nomes)
+    novos, categorias = pd.factorize(canonico)
+    return (pd.Series(resolvido.to_numpy()[inversa], index=clube_id.index),
+            pd.Series(pd.Categorical.from_codes(novos[inversa], categories=categorias), index=clube_id.index))
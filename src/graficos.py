@@ -0,0 +1,75 @@
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Monta as figuras da análise exploratória a partir das tabelas resumidas geradas por 04_exploracao.py
+
+POSITION_ORDER = ['gol', 'lat', 'zag', 'mei', 'ata', 'tec', 'desconhecida']
+
+def _position_colors(positions):
+    palette = px.colors.qualitative.Plotly
+    return {pos: palette[i % len(palette)] for i, pos in enumerate(positions)}
+
+def _ordered_positions(values):
+    present = set(values)
+    return [pos for pos in POSITION_ORDER if pos in present] + sorted(present - set(POSITION_ORDER))
+
+def build_boxplot(stats, outliers):
+    """Boxplot de pontos por posição a partir dos quartis e bigodes pré-calculados."""
+    stats = stats.set_index('posicao')
+    positions = _ordered_positions(stats.index)
+    colors = _position_colors(positions)
+
+    fig = go.Figure()
+    for pos in positions:
+        row = stats.loc[pos]
+        fig.add_trace(go.Box(
+            name=pos, x=[pos], q1=[row['q1']], median=[row['mediana']], q3=[row['q3']], mean=[row['media']],
+            lowerfence=[row['bigode_inferior']], upperfence=[row['bigode_superior']],
+            marker_color=colors[pos], legendgroup=pos, boxpoints=False,
+        ))
+        pos_outliers = outliers[outliers['posicao'] == pos]
+        fig.add_trace(go.Scatter(
+            x=[pos] * len(pos_outliers), y=pos_outliers['pontos_num'], mode='markers',
+            marker=dict(color=colors[pos], size=5, opacity=0.6), legendgroup=pos, showlegend=False,
+            hovertemplate=f"{pos}: %{{y}} pts<extra>outlier</extra>",
+        ))
+    fig.update_layout(
+        title='Distribuição de Pontos por Posição',
+        xaxis_title='Posição', yaxis_title='Pontos na Rodada',
+    )
+    return fig
+
+def build_price_points_density(density, regression, position=None):
+    """
+    Mapa de densidade de preço x pontos (histograma 2D pré-calculado) com a reta de regressão.
+    Com `position`, mostra apenas a densidade daquela posição; sem, soma todas as posições.
+    """
+    if position is not None:
+        density = density[density['posicao'] == position]
+    grid = density.groupby(['pontos', 'preco'])['n'].sum().unstack('preco')
+
+    fig = go.Figure(go.Heatmap(
+        x=grid.columns, y=grid.index, z=grid.to_numpy(), colorscale='Viridis',
+        colorbar=dict(title='Jogos'), hovertemplate="Preço: C$ %{x:.1f}<br>Pontos: %{y:.1f}<br>Jogos: %{z}<extra></extra>",
+    ))
+    if regression is not None and not regression.empty:
+        fit = regression.iloc[0]
+        x = [fit['preco_min'], fit['preco_max']]
+        fig.add_trace(go.Scatter(
+            x=x, y=[fit['intercepto'] + fit['coeficiente'] * v for v in x], mode='lines',
+            line=dict(color='#FFA500', width=3), name=f"OLS (R² = {fit['r2']:.3f})",
+        ))
+    fig.update_layout(
+        title='Relação Preço vs. Pontos (Densidade com Linha de Tendência)',
+        xaxis_title='Preço (C$)', yaxis_title='Pontos na Rodada',
+    )
+    return fig
+
+def build_run_metric(report, metric, label):
+    """Evolução de uma métrica das etapas executadas ao longo das execuções do pipeline."""
+    fig = px.line(report, x='execucao', y=metric, color='etapa', markers=True)
+    fig.update_layout(
+        title=f'{label} por Etapa ao Longo das Execuções',
+        xaxis_title='Execução', yaxis_title=label, legend_title='Etapa',
+    )
+    return fig
@@ -0,0 +1,59 @@
+import hashlib
+
+import pandas as pd
+
+from src.esquemas import POS_MAP
+
+# Índice de atletas por atleta_id: histórico agregado, forma recente, previsão e mercado atual numa tabela só.
+# O payload do mercado vira colunas uma única vez por atualização, e as junções são hash joins sobre o índice
+# atleta_id (não sobre apelidos, que se repetem e mudam). As páginas consultam linhas por atleta_id e o
+# subconjunto de ativos já separado, sem refazer junções a cada interação.
+
+# Colunas da tabela agregada que entram no índice (as demais são consultadas no DuckDB, ver src/consultas.py)
+INDEX_AGGREGATED_COLS = ['atleta_id', 'apelido', 'posicao', 'ultimo_clube', 'jogos_disputados', 'media_pontos', 'media_preco']
+MARKET_COLS = ['atleta_id', 'apelido', 'clube_id', 'posicao_id', 'status_id', 'preco_num', 'variacao_num', 'media_num', 'jogos_num']
+FORM_COLS = ['media_forma', 'std_forma', 'ewma_pontos']
+# Colunas do mercado no índice (nome no payload -> nome no índice)
+MARKET_RENAMES = {'preco_num': 'preco_atual', 'variacao_num': 'variacao_atual', 'clube_id': 'clube_id',
+                  'status_id': 'status_id', 'media_num': 'media_temporada', 'jogos_num': 'jogos_temporada'}
+
+def market_columns(atletas):
+    """Converte a lista de atletas de /atletas/mercado num DataFrame indexado por atleta_id, com a posição por extenso."""
+    market = pd.DataFrame.from_records(atletas, columns=MARKET_COLS)
+    market = market.drop_duplicates('atleta_id', keep='last').set_index('atleta_id')
+    market['posicao'] = market['posicao_id'].astype(str).str.lower().map(POS_MAP)
+    return market
+
+def market_version(market):
+    """Impressão digital do conteúdo do mercado (muda quando um preço, status ou atleta muda); None se vazio."""
+    if market.empty:
+        return None
+    return hashlib.sha1(pd.util.hash_pandas_object(market, index=True).to_numpy().tobytes()).hexdigest()
+
+def build_player_index(aggregated, market=None, form=None, predictions=None):
+    """
+    Monta o índice de atletas, uma linha por atleta_id (índice único, busca por hash):
+    - as colunas da tabela agregada (etapa 05; nas páginas, só INDEX_AGGREGATED_COLS) e, quando existirem, forma (etapa 07) e previsão (etapa 09);
+    - do mercado (market_columns): preço, variação, clube, status, média e jogos na temporada, e 'ativo'.
+      Estreantes do mercado sem histórico também entram; o apelido é o do mercado quando o atleta está ativo.
+    Retorna {'atletas': índice completo, 'ativos': só os atletas do mercado atual}.
+    """
+    index = aggregated.sort_values('jogos_disputados').drop_duplicates('atleta_id', keep='last').set_index('atleta_id')
+    if form is not None:
+        index = index.join(form.set_index('atleta_id')[FORM_COLS], how='left')
+    if predictions is not None:
+        index = index.join(predictions.set_index('atleta_id')[['pontos_previstos']], how='left')
+
+    if market is not None and not market.empty:
+        atual = market[list(MARKET_RENAMES)].rename(columns=MARKET_RENAMES)
+        index = index.join(atual.assign(ativo=True), how='outer')
+        index['apelido'] = market['apelido'].reindex(index.index).fillna(index['apelido'])
+        index['posicao'] = index['posicao'].fillna(market['posicao'].reindex(index.index))
+        index['ativo'] = index['ativo'].fillna(False).astype(bool)
+        # Colunas inteiras continuam inteiras (com <NA> para quem falta de um dos lados) depois da junção externa
+        dtypes = {**aggregated.dtypes.to_dict(), **atual.dtypes.to_dict()}
+        inteiras = [col for col, dtype in dtypes.items() if col in index and pd.api.types.is_integer_dtype(dtype)]
+        index = index.astype({col: 'Int64' for col in inteiras})
+    else:
+        index['ativo'] = False
+    return {'atletas': index, 'ativos': index[index['ativo']]}
@@ -0,0 +1,204 @@
+import codecs
+import csv
+import io
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+
+from src.config import (ROOT_DIR, CONSOLIDATED_DATASET_PATH, QUARANTINE_PATH, NUMERIC_COLS, SCOUT_COLS, ID_COLS,
+                        TEXT_COLS, CONSOLIDATED_COLS, CONSOLIDATED_SCHEMA, PARTITION_COLS)
+from src.manifesto import make_entry
+from src.esquemas import adapter_for_file, repair_text, position_name, status_code, map_unique, resolve_clubs
+from src.validacao import validate_frame
+
+# Tamanho da amostra de bytes usada para detectar a codificação e ler o cabeçalho
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Tipos explícitos na leitura; os identificadores chegam como texto porque algumas temporadas
+# usam siglas ('AME') ou descrições ('Provável') e são convertidos na limpeza.
+READ_TYPES = {
+    **{col: pa.float64() for col in NUMERIC_COLS + SCOUT_COLS},
+    **{col: pa.string() for col in ID_COLS + TEXT_COLS},
+}
+
+def detect_encoding(sample):
+    """Detecta a codificação a partir de uma amostra de bytes (UTF-8 ou latin-1)."""
+    try:
+        # Decodificador incremental: um caractere multibyte cortado no fim da amostra não é erro
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+def read_csv_columns(path, colunas):
+    """
+    Lê um CSV com o leitor do pyarrow, projetado nas colunas do mapa `colunas` (nome bruto -> nome canônico).
+    - A codificação e o cabeçalho vêm de uma única amostra dos primeiros bytes.
+    - Só as colunas mapeadas presentes no arquivo são lidas, com os tipos de READ_TYPES (texto para as demais).
+    - Retorna um DataFrame com os nomes canônicos (vazio se nenhuma coluna do mapa estiver no arquivo).
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(ENCODING_SAMPLE_SIZE)
+    encoding = detect_encoding(sample)
+
+    header = next(csv.reader(io.StringIO(sample.decode(encoding, errors='ignore'))), [])
+    wanted = {col: colunas[col] for col in header if col in colunas}
+    if not wanted:
+        return pd.DataFrame()
+
+    convert_options = pv.ConvertOptions(
+        include_columns=list(wanted),
+        column_types={raw: READ_TYPES.get(name, pa.string()) for raw, name in wanted.items()},
+        strings_can_be_null=True,
+    )
+    try:
+        table = pv.read_csv(path, read_options=pv.ReadOptions(encoding=encoding), convert_options=convert_options)
+    except pa.ArrowInvalid:
+        # A amostra pode não conter os bytes inválidos em UTF-8; só nesse caso há uma segunda leitura
+        if encoding == 'latin-1':
+            raise
+        table = pv.read_csv(path, read_options=pv.ReadOptions(encoding='latin-1'), convert_options=convert_options)
+    return table.rename_columns([wanted[col] for col in table.column_names]).to_pandas()
+
+def read_round_csv(path, adapter):
+    """Lê um arquivo 'rodada-N.csv' (uma rodada por arquivo, scouts acumulados na temporada)."""
+    return read_csv_columns(path, adapter['colunas'])
+
+def read_market_json(path, adapter):
+    """
+    Lê um arquivo bruto com o JSON do endpoint /atletas/mercado (ex.: Mercado_*.txt de 2021).
+    - Os scouts (dicionário 'scout' de cada atleta) viram colunas.
+    - O nome do clube vem do dicionário 'clubes' do próprio payload.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        payload = json.loads(raw.decode('utf-8'))
+    except UnicodeDecodeError:
+        payload = json.loads(raw.decode('latin-1'))
+
+    atletas = payload.get('atletas') or []
+    df = pd.DataFrame(atletas, columns=list(adapter['colunas'])).rename(columns=adapter['colunas'])
+    scouts = pd.DataFrame([atleta.get('scout') or {} for atleta in atletas], index=df.index)
+    df[scouts.columns.intersection(SCOUT_COLS)] = scouts[scouts.columns.intersection(SCOUT_COLS)]
+    clubes = {str(clube_id): clube.get('nome') for clube_id, clube in (payload.get('clubes') or {}).items()}
+    df['clube.nome'] = df['clube_id'].astype(str).map(clubes)
+    return df
+
+def read_season_scouts(path, adapter):
+    """
+    Lê o arquivo 'AAAA_scouts_raw.csv' de uma temporada inteira (2014 a 2016) no formato dos demais layouts:
+    - descarta a rodada 0 (preço de abertura) e junta apelido, posição e clube de 'AAAA_jogadores.csv', no mesmo
+      diretório (o clube do cadastro só completa as rodadas sem ClubeID);
+    - acumula os scouts de cada atleta ao longo das rodadas, salvo se a temporada já os traz acumulados;
+    - conta os jogos pelas rodadas com 'Participou' quando o arquivo não tem a coluna de jogos.
+    """
+    df = read_csv_columns(path, adapter['colunas'])
+    if df.empty:
+        return df
+    df['rodada_id'] = pd.to_numeric(df['rodada_id'], errors='coerce')
+    df = df[df['rodada_id'] > 0]
+    year = os.path.basename(os.path.dirname(path))
+    jogadores_path = os.path.join(os.path.dirname(path), f"{year}_jogadores.csv")
+    if os.path.exists(jogadores_path):
+        jogadores = read_csv_columns(jogadores_path, adapter['jogadores'])
+        df = df.merge(jogadores.drop_duplicates('atleta_id'), on='atleta_id', how='left')
+        if 'clube_jogador' in df:
+            df['clube_id'] = df['clube_id'].fillna(df.pop('clube_jogador'))
+
+    df = df.sort_values(['atleta_id', 'rodada_id'], kind='stable')
+    if not adapter['scouts_acumulados']:
+        scouts = df.columns.intersection(SCOUT_COLS)
+        df[scouts] = df.groupby('atleta_id', sort=False)[scouts].cumsum()
+    if 'jogos_num' not in df and 'participou' in df:
+        jogou = df['participou'].str.lower().isin(['1', 'true'])
+        df['jogos_num'] = jogou.groupby(df['atleta_id'], sort=False).cumsum()
+    return df.drop(columns='participou', errors='ignore').reset_index(drop=True)
+
+# Leitor de cada layout de src/esquemas.py
+READERS = {'rodadas_csv': read_round_csv, 'mercado_json': read_market_json, 'scouts_raw': read_season_scouts}
+
+def read_raw_file(path):
+    """
+    Lê um arquivo bruto com o adaptador do seu layout (src/esquemas.py): só as colunas mapeadas, já com os
+    nomes canônicos. Arquivos fora dos layouts conhecidos voltam vazios (e a validação os põe em quarentena).
+    """
+    layout, adapter = adapter_for_file(path)
+    if layout is None:
+        return pd.DataFrame()
+    return READERS[layout](path, adapter)
+
+def clean_frame(df, year):
+    """
+    Aplica a limpeza a um DataFrame de um único arquivo bruto.
+    - Repara a codificação dos apelidos e traduz clubes (clube_id e nome canônico), posições e status,
+      sempre sobre os valores distintos de cada coluna (ver src/esquemas.py).
+    - Preenche valores numéricos e de scouts ausentes com 0.
+    - Projeta o resultado nas colunas de CONSOLIDATED_COLS e aplica o schema compacto (CONSOLIDATED_SCHEMA),
+      para que toda partição tenha o mesmo schema.
+    """
+    df = df.reindex(columns=CONSOLIDATED_COLS)
+    df['ano'] = int(year)
+
+    # Texto antes de categoria: colunas ausentes no arquivo viram categorias de string, não de float
+    df[TEXT_COLS] = df[TEXT_COLS].astype('string')
+    df['apelido'] = map_unique(df['apelido'], repair_text)
+    df['clube_id'], df['clube.nome'] = resolve_clubs(df['clube_id'], df['clube.nome'])
+
+    # As colunas numéricas já chegam como float64 do leitor; só as de layouts genéricos precisam de conversão
+    numeric_cols = NUMERIC_COLS + SCOUT_COLS
+    for col in numeric_cols:
+        if not pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(float)
+    df[numeric_cols] = df[numeric_cols].fillna(0)
+
+    df['posicao_id'] = map_unique(df['posicao_id'], position_name)
+    df['status_id'] = map_unique(df['status_id'], status_code).astype('int8')
+    for col in ['atleta_id', 'rodada_id', 'clube_id']:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    return df.astype(CONSOLIDATED_SCHEMA)
+
+def partition_path(year, rodada, rel_raw_path):
+    """
+    Caminho (relativo ao dataset consolidado) do arquivo de uma partição hive.
+    O nome do arquivo vem do arquivo bruto de origem, então dois arquivos brutos com a mesma
+    rodada (ex.: 'rodada-0.csv' e 'rodada-1.csv' de 2022) convivem na mesma partição.
+    """
+    stem = os.path.splitext(os.path.basename(rel_raw_path))[0]
+    return os.path.join(f"ano={year}", f"rodada_id={rodada}", f"{stem}.parquet")
+
+def ingest_file(rel):
+    """
+    Lê, limpa, valida e grava as partições (ano/rodada_id) de um arquivo bruto (caminho relativo à raiz do projeto).
+    - A validação (src/validacao.py) roda sobre os DataFrames já em memória, sem reler o arquivo.
+    - Um arquivo com problema de severidade 'erro' não entra no dataset: o resultado da limpeza vai para a
+      quarentena (QUARANTINE_PATH/ano/arquivo.parquet), para inspeção.
+    Executada nos processos do pool: devolve só a entrada do manifesto (com o resultado da validação), não o DataFrame.
+    """
+    path = os.path.join(ROOT_DIR, rel)
+    year = os.path.basename(os.path.dirname(path))
+    raw = read_raw_file(path)
+    df = clean_frame(raw, year)
+    validacao = validate_frame(raw, df)
+    del raw
+
+    if validacao['status'] == 'quarentena':
+        entry = make_entry(path, [], 0)
+        if len(df):
+            quarentena = os.path.join(year, f"{os.path.splitext(os.path.basename(rel))[0]}.parquet")
+            os.makedirs(os.path.join(QUARANTINE_PATH, year), exist_ok=True)
+            df.to_parquet(os.path.join(QUARANTINE_PATH, quarentena), index=False)
+            entry['quarentena'] = quarentena
+        return rel, {**entry, 'validacao': validacao}
+
+    outputs = []
+    for rodada, df_rodada in df.groupby('rodada_id', sort=True):
+        output = partition_path(year, rodada, rel)
+        output_path = os.path.join(CONSOLIDATED_DATASET_PATH, output)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        df_rodada.drop(columns=PARTITION_COLS).to_parquet(output_path, index=False)
+        outputs.append(output)
+    return rel, {**make_entry(path, outputs, len(df)), 'validacao': validacao}
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+
+import pyarrow.parquet as pq
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, pico de RSS e CPU dos subprocessos ficam como None
+    resource = None
+
+# Medições por etapa do pipeline (tempo, CPU, memória, linhas e bytes) e o relatório de execuções em JSON-lines.
+# As etapas rodam em threads do mesmo processo: memória e bytes lidos/escritos são do processo inteiro
+# durante a etapa e incluem o que outras etapas simultâneas fizeram no mesmo intervalo.
+
+# Intervalo de amostragem do RSS (segundos)
+SAMPLE_INTERVAL = 0.05
+
+_peaks = {}
+_peaks_lock = threading.Lock()
+
+def rss_bytes():
+    """
+    RSS atual do processo (Linux, via /proc); fora do Linux, o pico do processo até agora;
+    None onde nem isso está disponível (Windows).
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _max_rss(*values):
+    """Maior dos valores de RSS conhecidos (None quando nenhum é conhecido)."""
+    known = [value for value in values if value is not None]
+    return max(known) if known else None
+
+def children_usage():
+    """(CPU em segundos, pico de RSS em MB) dos subprocessos já encerrados, ou (None, None) sem o módulo resource."""
+    if resource is None:
+        return None, None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss / 1024
+
+def io_counters():
+    """Bytes lidos e escritos pelo processo (e subprocessos já encerrados), ou (None, None) fora do Linux."""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+def start_memory_sampler(interval=SAMPLE_INTERVAL):
+    """Inicia a thread que amostra o RSS e atualiza o pico de cada etapa em andamento. Retorna o Event de parada."""
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            rss = rss_bytes()
+            with _peaks_lock:
+                for name in _peaks:
+                    _peaks[name] = _max_rss(_peaks[name], rss)
+
+    threading.Thread(target=loop, daemon=True).start()
+    return stop
+
+def measure_stage(name, func, **kwargs):
+    """
+    Executa `func(**kwargs)` (o run() de uma etapa) medindo tempo de parede, CPU da thread e dos subprocessos,
+    pico de RSS e bytes lidos/escritos. Retorna (resultado, métricas).
+    Sem o módulo resource (Windows), o pico de RSS fica None e a CPU é só a da thread da etapa.
+    """
+    with _peaks_lock:
+        _peaks[name] = rss_bytes()
+    children_cpu_before, _ = children_usage()
+    read_before, written_before = io_counters()
+    cpu_before, start = time.thread_time(), time.perf_counter()
+    try:
+        result = func(**kwargs)
+    finally:
+        elapsed, cpu = time.perf_counter() - start, time.thread_time() - cpu_before
+        children_cpu_after, children_peak = children_usage()
+        read_after, written_after = io_counters()
+        with _peaks_lock:
+            peak = _max_rss(_peaks.pop(name), rss_bytes())
+
+    children_cpu = None if children_cpu_before is None else children_cpu_after - children_cpu_before
+    metrics = {
+        'tempo_s': round(elapsed, 3),
+        'cpu_s': round(cpu + (children_cpu or 0), 3),
+        'pico_rss_mb': None if peak is None else round(peak / 2**20, 1),
+        'bytes_lidos': None if read_before is None else read_after - read_before,
+        'bytes_escritos': None if written_before is None else written_after - written_before,
+    }
+    # Etapas com subprocessos (ex.: a ingestão em paralelo): pico do maior subprocesso
+    if children_cpu:
+        metrics['pico_rss_subprocessos_mb'] = round(children_peak, 1)
+    return result, metrics
+
+def output_rows(paths):
+    """Total de linhas dos arquivos parquet (ou diretórios de parquet) da lista, pelos metadados; None se não houver."""
+    total, found = 0, False
+    for path in paths:
+        files = [path] if os.path.isfile(path) else [
+            os.path.join(d, f) for d, _, names in os.walk(path) for f in names
+        ]
+        for file in files:
+            if file.endswith('.parquet'):
+                total += pq.read_metadata(file).num_rows
+                found = True
+    return total if found else None
+
+def append_run_report(path, records, max_runs):
+    """Acrescenta os registros de uma execução ao relatório JSON-lines, mantendo só as `max_runs` execuções mais recentes."""
+    lines = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+    lines += [json.dumps(record, ensure_ascii=False) for record in records]
+
+    runs = []
+    for line in lines:
+        run_id = json.loads(line).get('execucao')
+        if run_id not in runs:
+            runs.append(run_id)
+    keep = set(runs[-max_runs:])
+    lines = [line for line in lines if json.loads(line).get('execucao') in keep]
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, path)
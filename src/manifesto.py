@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Versão do formato das partições geradas a partir dos arquivos brutos.
+# Sempre que a lógica de limpeza mudar, incremente para forçar uma reconstrução completa.
+MANIFEST_VERSION = 6
+
+def file_hash(path, chunk_size=1 << 20):
+    """Calcula o hash (BLAKE2b) do conteúdo de um arquivo, lendo em blocos."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(path):
+    """
+    Carrega o manifesto dos arquivos brutos já processados.
+    Retorna um manifesto vazio se o arquivo não existir ou se a versão for diferente da atual.
+    """
+    empty = {'versao': MANIFEST_VERSION, 'arquivos': {}}
+    if not os.path.exists(path):
+        return empty
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return empty
+    if manifest.get('versao') != MANIFEST_VERSION:
+        return empty
+    return manifest
+
+def save_manifest(manifest, path):
+    """Salva o manifesto de forma atômica (escreve em um temporário e renomeia)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def diff_files(manifest, files, root_dir):
+    """
+    Compara os arquivos encontrados com o manifesto.
+    - `files` é uma lista de caminhos absolutos.
+    - Tamanho e mtime iguais: arquivo inalterado, sem ler o conteúdo.
+    - Tamanho igual e mtime diferente: o hash decide (ex.: checkout ou rsync que só tocou o arquivo).
+    Retorna (novos_ou_alterados, removidos, mtimes_atualizados), onde os dois primeiros
+    são listas de caminhos relativos a `root_dir` e o último é um dict rel -> entrada atualizada.
+    """
+    known = manifest.get('arquivos', {})
+    changed, touched = [], {}
+    seen = set()
+
+    for path in files:
+        rel = os.path.relpath(path, root_dir)
+        seen.add(rel)
+        stat = os.stat(path)
+        entry = known.get(rel)
+        if entry is None or entry['tamanho'] != stat.st_size:
+            changed.append(rel)
+        elif entry['mtime_ns'] != stat.st_mtime_ns:
+            if file_hash(path) == entry['hash']:
+                touched[rel] = {**entry, 'mtime_ns': stat.st_mtime_ns}
+            else:
+                changed.append(rel)
+
+    removed = sorted(rel for rel in known if rel not in seen)
+    return sorted(changed), removed, touched
+
+def make_entry(path, outputs, rows):
+    """Monta a entrada do manifesto para um arquivo bruto processado."""
+    stat = os.stat(path)
+    return {
+        'tamanho': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': file_hash(path),
+        'saidas': sorted(outputs),
+        'linhas': int(rows),
+    }
+
+def path_fingerprint(path):
+    """
+    Impressão digital do conteúdo de um arquivo ou diretório (recursivo).
+    Usa apenas caminhos relativos e hashes de conteúdo, então não muda com checkout ou rsync.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                digest.update(os.path.relpath(full_path, path).encode('utf-8'))
+                digest.update(file_hash(full_path).encode('ascii'))
+    elif os.path.exists(path):
+        digest.update(file_hash(path).encode('ascii'))
+    else:
+        digest.update(b'<ausente>')
+    return digest.hexdigest()
+
+def frame_fingerprints(df, by, columns):
+    """
+    Impressão digital (BLAKE2b) do conteúdo de cada grupo de `by` em um DataFrame, independente da ordem das linhas.
+    Cada linha de `columns` vira um hash (pd.util.hash_pandas_object) e os hashes ordenados do grupo são resumidos,
+    então trocar ou redistribuir valores entre linhas muda a impressão digital, mesmo com contagem e somas iguais.
+    Retorna um dict chave do grupo -> hash hexadecimal.
+    """
+    hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return {key: hashlib.blake2b(np.sort(hashes[pos]).tobytes(), digest_size=16).hexdigest()
+            for key, pos in df.groupby(by, sort=True).indices.items()}
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from src.config import FORMATIONS, OPTIMIZER_OBJECTIVES, RISK_AVERSION, LINEUP_STATUS_IDS
+from src.esquemas import POS_MAP
+
+# Escalação ótima (11 jogadores + técnico) dentro do orçamento e da formação escolhida.
+# Programação dinâmica exata sobre o custo em centavos, posição por posição, com listas de
+# candidatos pré-calculadas sem os atletas dominados (mais caros e com nota menor que outros k).
+
+MARKET_COLS = ['atleta_id', 'apelido', 'clube_id', 'posicao_id', 'status_id', 'preco_num', 'media_num']
+# Colunas da tabela agregada usadas por lineup_candidates
+HISTORY_COLS = ['atleta_id', 'jogos_disputados', 'media_pontos', 'std_pontos']
+
+def market_frame(atletas):
+    """Converte a lista de atletas de /atletas/mercado num DataFrame, com a posição por extenso."""
+    market = pd.DataFrame.from_records(atletas, columns=MARKET_COLS)
+    market['posicao'] = market['posicao_id'].astype(str).str.lower().map(POS_MAP)
+    return market
+
+def lineup_candidates(aggregated, market, objective='pontos', risk_aversion=RISK_AVERSION, status_ids=LINEUP_STATUS_IDS,
+                      predictions=None):
+    """
+    Junta o mercado atual (preço e status) ao histórico agregado (média e desvio de pontos) por atleta_id
+    e calcula a nota de cada atleta segundo o objetivo:
+    - 'pontos': média de pontos;
+    - 'risco': média - risk_aversion * desvio padrão;
+    - 'valor': média de pontos por cartoleta;
+    - 'previsao': pontos previstos para a próxima rodada (`predictions`, da etapa 09: atleta_id e pontos_previstos).
+    Atletas sem histórico (técnicos, estreantes) ou sem previsão usam a média do mercado e desvio zero.
+    """
+    if objective not in OPTIMIZER_OBJECTIVES:
+        raise ValueError(f"Objetivo desconhecido: '{objective}'. Use um de {OPTIMIZER_OBJECTIVES}.")
+
+    df = market[market['status_id'].isin(status_ids) & market['posicao'].notna() & (market['preco_num'] > 0)]
+    # Um atleta pode ter mais de uma linha no histórico (apelidos diferentes); fica a com mais jogos
+    historico = (aggregated.sort_values('jogos_disputados')
+                 .drop_duplicates('atleta_id', keep='last')[['atleta_id', 'media_pontos', 'std_pontos']])
+    df = df.merge(historico, on='atleta_id', how='left')
+
+    media = df['media_pontos'].fillna(df['media_num']).astype(float)
+    if objective == 'pontos':
+        df['nota'] = media
+    elif objective == 'previsao':
+        if predictions is not None:
+            df = df.merge(predictions[['atleta_id', 'pontos_previstos']], on='atleta_id', how='left')
+            media = df['pontos_previstos'].astype(float).fillna(media)
+        df['nota'] = media
+    elif objective == 'risco':
+        df['nota'] = media - risk_aversion * df['std_pontos'].fillna(0).astype(float)
+    else:
+        df['nota'] = media / df['preco_num']
+    return df
+
+def prune_dominated(costs, scores, k):
+    """
+    Índices (em costs/scores) dos candidatos de uma posição com k vagas que podem estar numa escalação ótima.
+    Na ordem (custo crescente, nota decrescente), um atleta com pelo menos k anteriores de nota maior ou igual
+    é descartado: sempre sobra um deles fora do time para substituí-lo sem gastar mais nem pontuar menos.
+    """
+    order = np.lexsort((-scores, costs))
+    sorted_scores = scores[order]
+    n = len(order)
+    earlier = np.tri(n, k=-1, dtype=bool)
+    dominators = ((sorted_scores[None, :] >= sorted_scores[:, None]) & earlier).sum(axis=1)
+    return np.sort(order[dominators < k])
+
+def optimize_lineup(candidates, budget, formation='4-3-3'):
+    """
+    Escolhe a escalação de maior nota total com custo até `budget` (cartoletas) na formação dada.
+    `candidates` vem de lineup_candidates (colunas 'posicao', 'preco_num' e 'nota').
+    Retorna o DataFrame da escalação ordenado por posição, ou None se não houver escalação possível.
+    """
+    counts = {pos: k for pos, k in FORMATIONS[formation].items() if k > 0}
+    cap = int(round(budget * 100))
+    costs = np.rint(candidates['preco_num'].to_numpy(dtype=float) * 100).astype(np.int64)
+    scores = candidates['nota'].to_numpy(dtype=float)
+    positions = candidates['posicao'].to_numpy()
+
+    # best[c]: maior nota total das posições já processadas com custo exatamente c
+    best = np.full(cap + 1, -np.inf)
+    best[0] = 0.0
+    layers = []
+    for pos, k in counts.items():
+        idx = np.flatnonzero((positions == pos) & (costs <= cap))
+        idx = idx[prune_dominated(costs[idx], scores[idx], k)]
+        if len(idx) < k:
+            return None
+
+        # layer[j, c]: escolhidos j atletas desta posição, custo total c
+        layer = np.full((k + 1, cap + 1), -np.inf)
+        layer[0] = best
+        taken = np.zeros((len(idx), k, cap + 1), dtype=bool)
+        for t, i in enumerate(idx):
+            w = costs[i]
+            option = layer[:-1, :cap + 1 - w] + scores[i]
+            better = option > layer[1:, w:]
+            layer[1:, w:][better] = option[better]
+            taken[t, :, w:] = better
+        best = layer[k]
+        layers.append((idx, taken))
+
+    c = int(np.argmax(best))
+    if not np.isfinite(best[c]):
+        return None
+
+    chosen = []
+    for idx, taken in reversed(layers):
+        j = taken.shape[1]
+        for t in range(len(idx) - 1, -1, -1):
+            if j > 0 and taken[t, j - 1, c]:
+                chosen.append(idx[t])
+                c -= costs[idx[t]]
+                j -= 1
+
+    lineup = candidates.iloc[chosen].copy()
+    lineup['posicao'] = pd.Categorical(lineup['posicao'], categories=list(counts), ordered=True)
+    return lineup.sort_values(['posicao', 'nota'], ascending=[True, False]).reset_index(drop=True)
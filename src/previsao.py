@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from src.config import SCOUT_COLS, PREDICTION_WINDOWS, PREDICTION_RIDGE_ALPHA
+from src.esquemas import POS_MAP
+
+# Previsão dos pontos da próxima rodada de cada atleta.
+# Cada linha jogador-rodada vira um vetor de features calculadas só com as rodadas anteriores da mesma
+# temporada (somas acumuladas e deslocamentos por grupo, sem laços em Python), e o alvo é pontos_num da rodada.
+# O modelo é uma regressão ridge resolvida em forma fechada no numpy: treina em segundos na CPU e
+# pontua o mercado inteiro numa única multiplicação de matrizes.
+
+KEY_COLS = ['atleta_id', 'ano', 'rodada_id']
+POSITIONS = ['gol', 'lat', 'zag', 'mei', 'ata', 'tec']
+# Colunas de identificação de cada linha da matriz (não entram no modelo)
+INFO_COLS = KEY_COLS + ['apelido', 'clube_id', 'posicao_id', 'pontos_num', 'jogou', 'proxima']
+
+FORM_COLS = [f'media_{w}_ant' for w in PREDICTION_WINDOWS]
+SCOUT_RATE_COLS = [f'taxa_ant_{col}' for col in SCOUT_COLS]
+POSITION_COLS = [f'pos_{pos}' for pos in POSITIONS]
+FEATURE_COLS = (['jogos_ant', 'pontos_ant', 'media_temporada_ant'] + FORM_COLS +
+                ['preco_ant', 'variacao_ant', 'clube_media_ant'] + SCOUT_RATE_COLS + POSITION_COLS)
+
+def player_rounds(df, scouts):
+    """
+    Linhas jogador-rodada do dataset consolidado, uma por (atleta_id, ano, rodada_id) e ordenadas por essa chave,
+    com os scouts da rodada (etapa 06). 'jogou' segue o critério das demais etapas (pontos != 0).
+    """
+    df = df.sort_values(KEY_COLS, kind='stable').drop_duplicates(KEY_COLS, keep='last')
+    df = df.merge(scouts[KEY_COLS + SCOUT_COLS], on=KEY_COLS, how='left', validate='one_to_one')
+    df[SCOUT_COLS] = df[SCOUT_COLS].fillna(0).astype('int16')
+    pontos = df['pontos_num'].to_numpy(dtype='float64')
+    return df.assign(pontos_num=pontos, jogou=pontos != 0, proxima=False).reset_index(drop=True)
+
+def add_next_round(rows):
+    """
+    Acrescenta a cada atleta de uma temporada uma linha para a rodada seguinte à última da temporada
+    ('proxima' = True, sem pontos nem scouts), com clube, posição e preço da última rodada dele.
+    As features dessa linha são as da previsão para a próxima rodada.
+    """
+    ultima = rows.drop_duplicates('atleta_id', keep='last')
+    proxima = ultima.assign(rodada_id=rows['rodada_id'].max() + 1, pontos_num=np.nan, variacao_num=0.0,
+                            jogou=False, proxima=True)
+    proxima[SCOUT_COLS] = 0
+    proxima = proxima.astype(rows.dtypes.to_dict())
+    return pd.concat([rows, proxima], ignore_index=True).sort_values(['atleta_id', 'rodada_id'], kind='stable')
+
+def _rate(num, den):
+    return np.divide(num, den, out=np.zeros_like(num, dtype='float64'), where=den > 0)
+
+def season_features(rows):
+    """
+    Matriz de features de uma temporada (linhas de player_rounds já com add_next_round).
+    Tudo vem das rodadas anteriores da temporada em que o atleta aparece:
+    - jogos, pontos da última rodada, média da temporada e médias das últimas PREDICTION_WINDOWS rodadas;
+    - preço e variação da rodada anterior (na primeira, o preço antes da rodada: preco_num - variacao_num);
+    - média de pontos por jogo do clube nas rodadas anteriores;
+    - scouts por jogo na temporada e a posição (one-hot).
+    """
+    rows = rows.sort_values(['atleta_id', 'rodada_id'], kind='stable').reset_index(drop=True)
+    by_player = rows.groupby('atleta_id', sort=False)
+    jogou = rows['jogou'].to_numpy()
+    pontos = np.where(jogou, rows['pontos_num'].to_numpy(dtype='float64'), 0.0)
+
+    # Somas acumuladas até a rodada anterior = acumulado até a rodada - valor da rodada
+    acumulado = pd.DataFrame({'pontos': pontos, 'jogos': jogou.astype('int64')}).groupby(rows['atleta_id'].to_numpy(), sort=False).cumsum()
+    soma_ant = acumulado['pontos'].to_numpy() - pontos
+    jogos_ant = acumulado['jogos'].to_numpy() - jogou
+    features = pd.DataFrame({
+        'jogos_ant': jogos_ant.astype('float64'),
+        'pontos_ant': by_player['pontos_num'].shift(1).fillna(0).to_numpy(dtype='float64'),
+        'media_temporada_ant': _rate(soma_ant, jogos_ant),
+    })
+    anteriores = pd.DataFrame({'soma': soma_ant, 'jogos': jogos_ant}).groupby(rows['atleta_id'].to_numpy(), sort=False)
+    for w, col in zip(PREDICTION_WINDOWS, FORM_COLS):
+        antes = anteriores.shift(w, fill_value=0)
+        jogos_w = jogos_ant - antes['jogos'].to_numpy()
+        features[col] = np.where(jogos_w > 0, _rate(soma_ant - antes['soma'].to_numpy(), jogos_w), features['media_temporada_ant'])
+
+    preco = rows['preco_num'].to_numpy(dtype='float64')
+    inicial = preco - rows['variacao_num'].to_numpy(dtype='float64')
+    features['preco_ant'] = by_player['preco_num'].shift(1).to_numpy(dtype='float64')
+    features['preco_ant'] = features['preco_ant'].fillna(pd.Series(inicial))
+    features['variacao_ant'] = by_player['variacao_num'].shift(1).fillna(0).to_numpy(dtype='float64')
+
+    # Forma do clube: pontos e jogos de todos os seus atletas nas rodadas anteriores
+    clube = pd.DataFrame({'clube_id': rows['clube_id'].to_numpy(), 'rodada_id': rows['rodada_id'].to_numpy(),
+                          'pontos': pontos, 'jogos': jogou.astype('int64')})
+    clube = clube.groupby(['clube_id', 'rodada_id'], sort=True).sum()
+    clube_ant = clube.groupby(level='clube_id').cumsum() - clube
+    clube_media = pd.Series(_rate(clube_ant['pontos'].to_numpy(), clube_ant['jogos'].to_numpy()), index=clube.index)
+    chaves = pd.MultiIndex.from_arrays([rows['clube_id'].to_numpy(), rows['rodada_id'].to_numpy()])
+    features['clube_media_ant'] = clube_media.reindex(chaves).to_numpy()
+
+    scouts = rows[SCOUT_COLS].to_numpy(dtype='float64')
+    scouts_ant = pd.DataFrame(scouts).groupby(rows['atleta_id'].to_numpy(), sort=False).cumsum().to_numpy() - scouts
+    features[SCOUT_RATE_COLS] = _rate(scouts_ant, jogos_ant[:, None].astype('float64'))
+
+    posicao = rows['posicao_id'].astype(str).str.lower().map(POS_MAP).to_numpy()
+    for pos, col in zip(POSITIONS, POSITION_COLS):
+        features[col] = (posicao == pos).astype('float64')
+
+    return pd.concat([rows[INFO_COLS], features.astype('float32')], axis=1)
+
+def fit_ridge(X, y, alpha=PREDICTION_RIDGE_ALPHA):
+    """
+    Regressão ridge em forma fechada sobre as features padronizadas: (Z'Z + alpha I) w = Z'(y - média).
+    Retorna o modelo como dict de listas (serializável em JSON).
+    """
+    X = np.asarray(X, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    media = X.mean(axis=0)
+    escala = X.std(axis=0)
+    escala[escala == 0] = 1.0
+    Z = (X - media) / escala
+    pesos = np.linalg.solve(Z.T @ Z + alpha * np.eye(Z.shape[1]), Z.T @ (y - y.mean()))
+    return {'colunas': FEATURE_COLS, 'media': media.tolist(), 'escala': escala.tolist(),
+            'pesos': pesos.tolist(), 'intercepto': float(y.mean()), 'alpha': alpha}
+
+def predict(model, X):
+    """Pontos previstos para todas as linhas de X (colunas na ordem de model['colunas']) numa única chamada."""
+    X = np.asarray(X, dtype='float64')
+    return ((X - np.asarray(model['media'])) / np.asarray(model['escala'])) @ np.asarray(model['pesos']) + model['intercepto']
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from src.config import SCOUT_COLS, SIMILARITY_MIN_GAMES
+
+# Busca de atletas parecidos pelo perfil de scouts.
+# Cada atleta vira um vetor com os seus scouts por jogo, padronizados (z-score) dentro da posição:
+# um zagueiro é comparado a zagueiros pelo que faz acima ou abaixo do zagueiro médio.
+# As posições têm no máximo algumas centenas de atletas, então a busca é força bruta vetorizada
+# (uma subtração e uma soma sobre a matriz da posição), na casa do milissegundo.
+
+# Scouts por jogo (exibição) e as mesmas taxas padronizadas por posição (vetores da busca)
+RATE_COLS = [f'taxa_{col}' for col in SCOUT_COLS]
+VECTOR_COLS = [f'z_{col}' for col in SCOUT_COLS]
+INFO_COLS = ['atleta_id', 'apelido', 'posicao', 'ultimo_clube', 'jogos_disputados', 'media_pontos', 'media_preco']
+
+def build_similarity_index(scout_sums, players, min_games=SIMILARITY_MIN_GAMES):
+    """
+    Monta o índice de similaridade, uma linha por atleta.
+    - `scout_sums`: soma dos scouts da rodada (SCOUT_COLS) por atleta_id, em todas as temporadas.
+    - `players`: tabela agregada por atleta (etapa 05), de onde vêm jogos, posição, clube e preço médio.
+    - Só entram atletas com pelo menos `min_games` jogos; scouts que não variam numa posição ficam em 0.
+    """
+    df = players[players['jogos_disputados'] >= min_games].merge(scout_sums, on='atleta_id', how='inner')
+    rates = df[SCOUT_COLS].to_numpy(dtype='float64') / df['jogos_disputados'].to_numpy(dtype='float64')[:, None]
+    posicao = df['posicao'].astype(str).to_numpy()
+
+    grouped = pd.DataFrame(rates, columns=SCOUT_COLS).groupby(posicao)
+    mean = grouped.transform('mean').to_numpy()
+    std = grouped.transform('std', ddof=0).to_numpy()
+    z = np.divide(rates - mean, std, out=np.zeros_like(rates), where=std > 0)
+
+    index = df[INFO_COLS].reset_index(drop=True)
+    index['posicao'] = posicao
+    index[RATE_COLS] = rates.astype('float32')
+    index[VECTOR_COLS] = z.astype('float32')
+    return index.sort_values(['posicao', 'atleta_id']).reset_index(drop=True)
+
+def search_structure(index):
+    """
+    Estrutura de busca montada uma vez por versão do índice: a matriz de vetores (float32),
+    as linhas de cada posição e a linha de cada atleta_id.
+    """
+    return {
+        'linhas': index,
+        'vetores': index[VECTOR_COLS].to_numpy(dtype='float32'),
+        'posicoes': {pos: np.flatnonzero(index['posicao'].to_numpy() == pos) for pos in index['posicao'].unique()},
+        'linha_de': pd.Series(np.arange(len(index)), index=index['atleta_id'].to_numpy()),
+    }
+
+def similar_players(structure, atleta_id, k=10, cheaper=False, prices=None):
+    """
+    Os k atletas da mesma posição mais parecidos com `atleta_id` (distância euclidiana entre os vetores).
+    - `prices`: Series atleta_id -> preço atual (ex.: mercado ao vivo); sem preço, vale o preço médio histórico.
+    - `cheaper=True` só considera atletas mais baratos que ele.
+    Retorna None se o atleta não está no índice.
+    """
+    if atleta_id not in structure['linha_de'].index:
+        return None
+    index = structure['linhas']
+    row = structure['linha_de'][atleta_id]
+    rows = structure['posicoes'][index['posicao'].iat[row]]
+
+    vetores = structure['vetores'][rows]
+    distancia = np.sqrt(((vetores - structure['vetores'][row]) ** 2).sum(axis=1))
+    preco = index['media_preco'].to_numpy(dtype='float64')[rows]
+    if prices is not None:
+        atual = index['atleta_id'].iloc[rows].map(prices).to_numpy(dtype='float64')
+        preco = np.where(np.isnan(atual), preco, atual)
+
+    elegivel = rows != row
+    if cheaper:
+        elegivel &= preco < preco[rows == row][0]
+    candidatos = np.flatnonzero(elegivel)
+    if len(candidatos) > k:
+        candidatos = candidatos[np.argpartition(distancia[candidatos], k)[:k]]
+    candidatos = candidatos[np.argsort(distancia[candidatos], kind='stable')]
+
+    result = index.iloc[rows[candidatos]][INFO_COLS].reset_index(drop=True)
+    result['preco'] = preco[candidatos]
+    result['distancia'] = distancia[candidatos]
+    return result
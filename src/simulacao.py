@@ -0,0 +1,188 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.config import (CONSOLIDATED_DATASET_PATH, FORMATIONS, RISK_AVERSION, FORM_EWMA_SPAN, LINEUP_STATUS_IDS,
+                        SIMULATION_START_BUDGET, SIMULATION_WORKERS)
+from src.armazenamento import load_consolidated
+from src.esquemas import POS_MAP
+from src.otimizador import optimize_lineup
+
+# Simulação (backtest) de estratégias de escalação sobre as temporadas do dataset consolidado.
+# Cada temporada é refeita rodada a rodada: antes da rodada, a estratégia dá uma nota a cada atleta do mercado
+# usando só o que se sabia até a rodada anterior; o otimizador escala o time que cabe no patrimônio; depois da
+# rodada, o time soma os pontos e o patrimônio recebe a variação de preço dos escalados (regra do Cartola).
+# O estado de todos os atletas é um conjunto de vetores numpy atualizados de uma vez por rodada, e cada
+# temporada roda num processo separado.
+
+POSITIONS = ['gol', 'lat', 'zag', 'mei', 'ata', 'tec']
+COLUMNS = ['atleta_id', 'ano', 'rodada_id', 'posicao_id', 'status_id', 'pontos_num', 'preco_num', 'variacao_num']
+
+def available_seasons():
+    """Temporadas presentes no dataset consolidado (pelas partições 'ano=AAAA')."""
+    return sorted(int(os.path.basename(path).split('=')[1]) for path in glob.glob(os.path.join(CONSOLIDATED_DATASET_PATH, 'ano=*')))
+
+def season_arrays(df):
+    """
+    Converte as linhas de uma temporada em matrizes rodada x atleta (rodadas presentes nos dados, atletas por atleta_id):
+    - 'pontos' e 'variacao' da rodada, 'preco' antes da rodada (preco_num - variacao_num: o preço da linha já é o
+      de depois da rodada) e 'posicao' (índice em POSITIONS, -1 quando o atleta não está no mercado da rodada).
+    - 'status' antes da rodada: o status_id da linha da rodada anterior (o da própria linha já é o da rodada
+      seguinte, ex.: suspensos pelo cartão da rodada); 0 quando o atleta não estava no mercado anterior.
+    """
+    df = df.sort_values(['atleta_id', 'rodada_id'], kind='stable').drop_duplicates(['atleta_id', 'rodada_id'], keep='last')
+    atletas = np.unique(df['atleta_id'].to_numpy())
+    rodadas = np.unique(df['rodada_id'].to_numpy())
+    r = np.searchsorted(rodadas, df['rodada_id'].to_numpy())
+    i = np.searchsorted(atletas, df['atleta_id'].to_numpy())
+    shape = (len(rodadas), len(atletas))
+
+    pontos = np.zeros(shape)
+    pontos[r, i] = df['pontos_num'].to_numpy(dtype='float64')
+    variacao = np.zeros(shape)
+    variacao[r, i] = df['variacao_num'].to_numpy(dtype='float64')
+    preco = np.full(shape, np.nan)
+    preco[r, i] = df['preco_num'].to_numpy(dtype='float64') - variacao[r, i]
+    codes = {pos: k for k, pos in enumerate(POSITIONS)}
+    posicao = np.full(shape, -1, dtype='int8')
+    posicao[r, i] = df['posicao_id'].astype(str).str.lower().map(POS_MAP).map(codes).fillna(-1).to_numpy(dtype='int8')
+    status = np.zeros(shape, dtype='int8')
+    status[r, i] = df['status_id'].to_numpy(dtype='int8')
+    status = np.vstack([np.zeros((1, len(atletas)), dtype='int8'), status[:-1]])
+    return {'atletas': atletas, 'rodadas': rodadas, 'pontos': np.nan_to_num(pontos), 'variacao': np.nan_to_num(variacao),
+            'preco': preco, 'posicao': posicao, 'status': status}
+
+# --- Estratégias ---
+# Uma estratégia recebe o estado antes da rodada (dict de vetores, um valor por atleta) e devolve a nota de cada
+# atleta. O estado tem: 'media' e 'desvio' de pontos por jogo (temporadas anteriores + rodadas já jogadas),
+# 'jogos', 'ewma' (forma na temporada), 'ultimo' (pontos do último jogo), 'preco' (antes da rodada) e
+# 'variacao_ant' (última variação). Estratégias novas precisam ser funções de módulo (vão para outros processos).
+
+def media_pontos(estado):
+    """Média de pontos por jogo no histórico (o critério da página de análise agregada)."""
+    return estado['media']
+
+def custo_beneficio(estado):
+    """Média de pontos por cartoleta (o 'custo_beneficio_medio' da tabela agregada)."""
+    return np.divide(estado['media'], estado['preco'], out=np.zeros_like(estado['media']), where=estado['preco'] > 0)
+
+def forma(estado):
+    """EWMA de pontos na temporada; sem jogos na temporada, a média do histórico."""
+    return np.where(np.isnan(estado['ewma']), estado['media'], estado['ewma'])
+
+def risco(estado):
+    """Média de pontos descontada de RISK_AVERSION desvios padrão."""
+    return estado['media'] - RISK_AVERSION * estado['desvio']
+
+STRATEGIES = {'media_pontos': media_pontos, 'custo_beneficio': custo_beneficio, 'forma': forma, 'risco': risco}
+
+def strategy_name(estrategia):
+    return estrategia if isinstance(estrategia, str) else estrategia.__name__
+
+def simulate_season(season, estrategia, formacao='4-3-3', historico=None, orcamento=SIMULATION_START_BUDGET,
+                    status_ids=LINEUP_STATUS_IDS):
+    """
+    Refaz uma temporada (matrizes de season_arrays) com uma estratégia (nome em STRATEGIES ou função) e formação.
+    - `historico`: DataFrame atleta_id -> soma, soma_quad e jogos das temporadas anteriores (ponto de partida da média).
+    - A cada rodada o time é escalado de novo, entre os atletas do mercado da rodada com status em `status_ids`
+      antes dela (na primeira rodada dos dados, sem status anterior, todos), com custo até o patrimônio.
+      Sem escalação possível, o time não pontua e o patrimônio não muda.
+    Retorna um DataFrame com uma linha por rodada: pontos, pontos acumulados, custo e patrimônio depois da rodada.
+    """
+    funcao = STRATEGIES[estrategia] if isinstance(estrategia, str) else estrategia
+    n = len(season['atletas'])
+    soma, soma_quad, jogos = np.zeros(n), np.zeros(n), np.zeros(n)
+    if historico is not None:
+        prev = historico.reindex(season['atletas']).fillna(0)
+        soma, soma_quad, jogos = (prev[col].to_numpy(dtype='float64', copy=True) for col in ['soma', 'soma_quad', 'jogos'])
+    ewma, ultimo, variacao_ant = np.full(n, np.nan), np.zeros(n), np.zeros(n)
+    alpha = 2 / (FORM_EWMA_SPAN + 1)
+    nomes = np.array(POSITIONS)
+
+    patrimonio, acumulado, linhas = orcamento, 0.0, []
+    for r, rodada in enumerate(season['rodadas']):
+        media = np.divide(soma, jogos, out=np.zeros(n), where=jogos > 0)
+        var = np.divide(soma_quad - soma * media, jogos - 1, out=np.zeros(n), where=jogos > 1)
+        estado = {'media': media, 'desvio': np.sqrt(np.clip(var, 0, None)), 'jogos': jogos, 'ewma': ewma,
+                  'ultimo': ultimo, 'preco': season['preco'][r], 'variacao_ant': variacao_ant}
+        notas = np.asarray(funcao(estado), dtype='float64')
+
+        elegivel = (season['posicao'][r] >= 0) & (season['preco'][r] > 0) & np.isfinite(notas)
+        if r > 0:
+            elegivel &= np.isin(season['status'][r], status_ids)
+        idx = np.flatnonzero(elegivel)
+        candidatos = pd.DataFrame({'idx': idx, 'posicao': nomes[season['posicao'][r][idx]],
+                                   'preco_num': season['preco'][r][idx], 'nota': notas[idx]})
+        escalacao = optimize_lineup(candidatos, patrimonio, formacao)
+        escalados = escalacao['idx'].to_numpy() if escalacao is not None else np.array([], dtype=int)
+
+        pontos_rodada = season['pontos'][r]
+        pontos_time = float(pontos_rodada[escalados].sum())
+        custo = float(season['preco'][r][escalados].sum())
+        patrimonio += float(season['variacao'][r][escalados].sum())
+        acumulado += pontos_time
+        linhas.append((int(rodada), len(escalados), pontos_time, acumulado, custo, patrimonio))
+
+        # Estado depois da rodada, para todos os atletas de uma vez (mesmo critério de jogo das etapas: pontos != 0)
+        jogou = pontos_rodada != 0
+        soma += pontos_rodada
+        soma_quad += pontos_rodada ** 2
+        jogos += jogou
+        ewma = np.where(jogou, np.where(np.isnan(ewma), pontos_rodada, alpha * pontos_rodada + (1 - alpha) * ewma), ewma)
+        ultimo = np.where(jogou, pontos_rodada, ultimo)
+        presente = season['posicao'][r] >= 0
+        variacao_ant = np.where(presente, season['variacao'][r], variacao_ant)
+
+    result = pd.DataFrame(linhas, columns=['rodada_id', 'escalados', 'pontos', 'pontos_acumulados', 'custo', 'patrimonio'])
+    return result.assign(estrategia=strategy_name(estrategia), formacao=formacao)
+
+def history_before(ano):
+    """Somas de pontos, de quadrados e jogos por atleta em todas as temporadas anteriores a `ano` no dataset."""
+    df = load_consolidated(filters=[('ano', '<', ano)], columns=['atleta_id', 'ano', 'rodada_id', 'pontos_num'])
+    df = df.drop_duplicates(['atleta_id', 'ano', 'rodada_id'], keep='last')
+    df = df[df['pontos_num'] != 0]
+    pontos = df['pontos_num'].astype('float64')
+    return pontos.groupby(df['atleta_id']).agg(soma='sum', jogos='size').assign(
+        soma_quad=(pontos ** 2).groupby(df['atleta_id']).sum())
+
+def run_season(ano, estrategias, formacoes, orcamento=SIMULATION_START_BUDGET):
+    """Tarefa de um processo: carrega a temporada e o histórico anterior e simula todas as combinações da grade."""
+    season = season_arrays(load_consolidated(filters=[('ano', '==', ano)], columns=COLUMNS))
+    historico = history_before(ano)
+    resultados = [simulate_season(season, estrategia, formacao, historico, orcamento)
+                  for estrategia in estrategias for formacao in formacoes]
+    return pd.concat(resultados, ignore_index=True).assign(ano=ano)
+
+def simulate(anos=None, estrategias=None, formacoes=('4-3-3',), orcamento=SIMULATION_START_BUDGET, workers=SIMULATION_WORKERS):
+    """
+    Simula a grade estratégias x formações em cada temporada, uma temporada por processo.
+    Retorna as linhas por rodada de todas as simulações (ver simulate_season), com o ano.
+    """
+    anos = available_seasons() if anos is None else sorted(anos)
+    estrategias = list(STRATEGIES) if estrategias is None else list(estrategias)
+    for formacao in formacoes:
+        if formacao not in FORMATIONS:
+            raise ValueError(f"Formação desconhecida: '{formacao}'. Use uma de {list(FORMATIONS)}.")
+    for estrategia in estrategias:
+        if isinstance(estrategia, str) and estrategia not in STRATEGIES:
+            raise ValueError(f"Estratégia desconhecida: '{estrategia}'. Use uma de {list(STRATEGIES)} ou uma função.")
+
+    args = [(ano, estrategias, list(formacoes), orcamento) for ano in anos]
+    workers = min(workers, len(anos))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            resultados = list(pool.map(run_season, *zip(*args)))
+    else:
+        resultados = [run_season(*a) for a in args]
+    cols = ['estrategia', 'formacao', 'ano', 'rodada_id', 'escalados', 'pontos', 'pontos_acumulados', 'custo', 'patrimonio']
+    return pd.concat(resultados, ignore_index=True)[cols] if resultados else pd.DataFrame(columns=cols)
+
+def summarize(rodadas):
+    """Resumo por (estrategia, formacao, ano): rodadas, pontos totais e por rodada e patrimônio final."""
+    return rodadas.groupby(['estrategia', 'formacao', 'ano'], sort=True).agg(
+        rodadas=('pontos', 'size'), pontos_totais=('pontos', 'sum'), media_rodada=('pontos', 'mean'),
+        patrimonio_final=('patrimonio', 'last'),
+    ).reset_index()
@@ -0,0 +1,141 @@
+import collections
+import datetime
+import json
+import os
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from src.config import (CONSOLIDATED_DATASET_PATH, VALIDATION_REQUIRED_COLS, VALIDATION_NOT_NULL_COLS, VALIDATION_KEY,
+                        VALIDATION_RANGES, VALIDATION_STATUS_IDS, VALIDATION_SEASON_ROUNDS, VALIDATION_SEVERITY)
+
+# Validação declarativa da ingestão: as regras ficam em src/config.py e são verificadas em cada arquivo bruto
+# logo depois da leitura e da limpeza (ingest_file), com operações vetorizadas sobre o próprio DataFrame do
+# arquivo, sem uma segunda leitura do dataset. O resultado de cada arquivo fica na sua entrada do manifesto
+# (e vale enquanto o arquivo não mudar); o relatório junta esses resultados e as verificações por temporada.
+
+def _problem(regra, linhas, **detalhes):
+    return {'regra': regra, 'severidade': VALIDATION_SEVERITY[regra], 'linhas': int(linhas), **detalhes}
+
+def _counts(counts):
+    """Série de contagens por coluna -> dict só com as colunas com ocorrências."""
+    return {col: int(n) for col, n in counts.items() if n}
+
+def validate_frame(raw, clean):
+    """
+    Verifica um arquivo bruto: `raw` como lido (read_raw_file) e `clean` depois de clean_frame.
+    Retorna {'status': 'ok' | 'aviso' | 'quarentena', 'linhas', 'rodadas', 'problemas': [...]}; cada problema
+    traz a regra, a severidade (VALIDATION_SEVERITY), as linhas afetadas e, quando cabe, as colunas ou valores.
+    """
+    problemas = []
+    ausentes = [col for col in VALIDATION_REQUIRED_COLS if col not in raw.columns]
+    if ausentes:
+        problemas.append(_problem('colunas_ausentes', len(raw), colunas=ausentes))
+    if clean.empty:
+        problemas.append(_problem('sem_linhas', 0))
+    else:
+        # Nulos só são contados no bruto: a limpeza os preenche com 0
+        nulos = _counts(raw[raw.columns.intersection(VALIDATION_NOT_NULL_COLS)].isna().sum())
+        if nulos:
+            problemas.append(_problem('nulos', max(nulos.values()), colunas=nulos))
+
+        cols = list(VALIDATION_RANGES)
+        valores = clean[cols].to_numpy(dtype='float64')
+        minimos = np.array([-np.inf if lo is None else lo for lo, _ in VALIDATION_RANGES.values()])
+        maximos = np.array([np.inf if hi is None else hi for _, hi in VALIDATION_RANGES.values()])
+        fora = (valores < minimos) | (valores > maximos)
+        if fora.any():
+            colunas = {col: {'linhas': int(n), 'faixa': list(VALIDATION_RANGES[col]),
+                             'min': float(valores[:, i].min()), 'max': float(valores[:, i].max())}
+                       for i, (col, n) in enumerate(zip(cols, fora.sum(axis=0))) if n}
+            problemas.append(_problem('fora_da_faixa', fora.any(axis=1).sum(), colunas=colunas))
+
+        duplicados = clean.duplicated(VALIDATION_KEY).sum()
+        if duplicados:
+            problemas.append(_problem('duplicados', duplicados, chave=VALIDATION_KEY))
+        desconhecidas = (clean['posicao_id'] == 'desconhecida').sum()
+        if desconhecidas:
+            problemas.append(_problem('posicao_desconhecida', desconhecidas))
+        status = clean['status_id'][~clean['status_id'].isin(VALIDATION_STATUS_IDS)]
+        if len(status):
+            problemas.append(_problem('status_desconhecido', len(status), valores=sorted(int(v) for v in status.unique())))
+
+    severidades = {problema['severidade'] for problema in problemas}
+    return {
+        'status': 'quarentena' if 'erro' in severidades else 'aviso' if severidades else 'ok',
+        'linhas': len(clean),
+        'rodadas': sorted(int(r) for r in clean['rodada_id'].unique()),
+        'problemas': problemas,
+    }
+
+def season_checks(arquivos, dataset_path=CONSOLIDATED_DATASET_PATH):
+    """
+    Verificações por temporada a partir das entradas do manifesto (arquivos em quarentena não contam):
+    - rodadas faltando até a última rodada presente (temporada em andamento se ela for menor que 38);
+    - rodadas vindas de mais de um arquivo e, só para elas, as linhas com a chave atleta_id repetida na partição
+      (lê apenas a coluna atleta_id dessas partições).
+    """
+    rodadas = collections.defaultdict(collections.Counter)
+    for rel, entry in arquivos.items():
+        validacao = entry.get('validacao', {})
+        if validacao.get('status') != 'quarentena':
+            rodadas[int(os.path.basename(os.path.dirname(rel)))].update(validacao.get('rodadas', []))
+
+    temporadas = {}
+    for ano in sorted(rodadas):
+        presentes = rodadas[ano]
+        ultima = max(presentes)
+        repetidas = sorted(r for r, n in presentes.items() if n > 1)
+        duplicadas = {}
+        for rodada in repetidas:
+            ids = pq.read_table(os.path.join(dataset_path, f"ano={ano}", f"rodada_id={rodada}"), columns=['atleta_id'])
+            ids = ids.column('atleta_id').to_numpy()
+            duplicadas[str(rodada)] = int(len(ids) - len(np.unique(ids)))
+        temporadas[str(ano)] = {
+            'rodadas': len(presentes),
+            'ultima_rodada': ultima,
+            'em_andamento': ultima < VALIDATION_SEASON_ROUNDS,
+            'rodadas_faltando': sorted(set(range(1, ultima + 1)) - set(presentes)),
+            'rodadas_em_varios_arquivos': repetidas,
+            'linhas_duplicadas': duplicadas,
+        }
+    return temporadas
+
+def build_report(arquivos, dataset_path=CONSOLIDATED_DATASET_PATH):
+    """Relatório de validação: as regras, o resultado de cada arquivo bruto, as verificações por temporada e um resumo."""
+    resultados = {rel: entry['validacao'] for rel, entry in sorted(arquivos.items()) if 'validacao' in entry}
+    status = collections.Counter(resultado['status'] for resultado in resultados.values())
+    return {
+        'gerado_em': datetime.datetime.now().isoformat(timespec='seconds'),
+        'regras': {
+            'obrigatorias': VALIDATION_REQUIRED_COLS,
+            'nao_nulas': VALIDATION_NOT_NULL_COLS,
+            'chave': VALIDATION_KEY,
+            'faixas': {col: list(faixa) for col, faixa in VALIDATION_RANGES.items()},
+            'status_validos': VALIDATION_STATUS_IDS,
+            'severidade': VALIDATION_SEVERITY,
+        },
+        'resumo': {
+            'arquivos': len(resultados),
+            **{s: status.get(s, 0) for s in ('ok', 'aviso', 'quarentena')},
+            'linhas_aceitas': sum(r['linhas'] for r in resultados.values() if r['status'] != 'quarentena'),
+        },
+        'arquivos': resultados,
+        'temporadas': season_checks(arquivos, dataset_path),
+    }
+
+def save_report(report, path):
+    """Salva o relatório de forma atômica (escreve em um temporário e renomeia)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def load_report(path):
+    """Carrega o relatório de validação, ou None se não existir ou estiver corrompido."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
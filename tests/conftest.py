@@ -0,0 +1,84 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Os caminhos de src/config.py são lidos na importação: os testes apontam o diretório de dados para um
+# temporário antes de importar qualquer módulo do projeto, então nada em dados_cartola/ é tocado.
+TEST_DATA_DIR = tempfile.mkdtemp(prefix='escalai_testes_')
+os.environ['ESCALAI_DATA_DIR'] = TEST_DATA_DIR
+os.environ['ESCALAI_INGESTION_WORKERS'] = '1'
+os.environ['ESCALAI_ANOS'] = 'todos'
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, 'scripts'))
+
+from src.config import SCOUT_COLS  # noqa: E402
+
+CLUBS = {262: 'Flamengo', 275: 'Palmeiras', 276: 'São Paulo', 264: 'Corinthians'}
+
+def write_round(raw_dir, ano, rodada, atletas, name=None):
+    """
+    Grava um 'rodada-N.csv' no layout dos arquivos brutos de 2018 em diante (colunas 'atletas.*' e scouts
+    acumulados sem prefixo, em branco quando zerados). `atletas` é um DataFrame com atleta_id, clube_id,
+    posicao_id, status_id, pontos_num, preco_num, jogos_num e as colunas de SCOUT_COLS.
+    """
+    df = pd.DataFrame({
+        'atletas.atleta_id': atletas['atleta_id'],
+        'atletas.rodada_id': rodada,
+        'atletas.clube_id': atletas['clube_id'],
+        'atletas.posicao_id': atletas['posicao_id'],
+        'atletas.status_id': atletas['status_id'],
+        'atletas.pontos_num': atletas['pontos_num'],
+        'atletas.preco_num': atletas['preco_num'],
+        'atletas.variacao_num': 0.0,
+        'atletas.media_num': atletas['pontos_num'],
+        'atletas.jogos_num': atletas['jogos_num'],
+        'atletas.apelido': 'Atleta ' + atletas['atleta_id'].astype(str),
+        'atletas.clube.id.full.name': atletas['clube_id'].map(CLUBS),
+    })
+    scouts = atletas[SCOUT_COLS].astype(float)
+    df = pd.concat([df, scouts.where(scouts != 0)], axis=1)
+    season_dir = os.path.join(raw_dir, str(ano))
+    os.makedirs(season_dir, exist_ok=True)
+    path = os.path.join(season_dir, name or f"rodada-{rodada}.csv")
+    df.to_csv(path, index=False)
+    return path
+
+def make_season(rng, n_atletas, n_rodadas):
+    """Rodadas sintéticas de uma temporada: lista de DataFrames (uma por rodada) com scouts acumulados."""
+    ids = 1000 + np.arange(n_atletas)
+    clube = rng.choice(list(CLUBS), size=n_atletas)
+    posicao = rng.integers(1, 7, size=n_atletas)
+    jogou = rng.random((n_rodadas, n_atletas)) < 0.7
+    pontos = np.round(np.where(jogou, rng.normal(3, 4, size=(n_rodadas, n_atletas)), 0), 2)
+    acumulados = rng.poisson(0.4 * jogou[:, :, None], size=(n_rodadas, n_atletas, len(SCOUT_COLS))).cumsum(axis=0)
+    jogos = jogou.cumsum(axis=0)
+    rodadas = []
+    for r in range(n_rodadas):
+        rodada = pd.DataFrame({
+            'atleta_id': ids, 'clube_id': clube, 'posicao_id': posicao,
+            'status_id': rng.choice([2, 7], size=n_atletas), 'pontos_num': pontos[r],
+            'preco_num': np.round(rng.uniform(2, 15, size=n_atletas), 2), 'jogos_num': jogos[r],
+        })
+        rodadas.append(pd.concat([rodada, pd.DataFrame(acumulados[r], columns=SCOUT_COLS)], axis=1))
+    return rodadas
+
+@pytest.fixture
+def data_dir():
+    """Diretório de dados dos testes (ESCALAI_DATA_DIR), esvaziado antes de cada teste."""
+    for name in os.listdir(TEST_DATA_DIR):
+        path = os.path.join(TEST_DATA_DIR, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    return TEST_DATA_DIR
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
@@ -0,0 +1,38 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+
+analise = importlib.import_module('03_analise_descritiva')
+
+def points(posicao, valores):
+    return pd.DataFrame({'apelido': 'Atleta', 'posicao_id': posicao, 'pontos_num': np.asarray(valores, dtype=float),
+                         'ano': 2025, 'rodada_id': np.arange(1, len(valores) + 1)})
+
+def outliers_by_position(df, method):
+    result = analise.detect_outliers(df, 'pontos_num', ['posicao_id'], method)
+    return {pos: sorted(grupo['pontos_num']) for pos, grupo in result.groupby('posicao_id')}
+
+def test_mad_zero_usa_os_limites_do_iqr():
+    # Mais da metade dos pontos é zero: a mediana é 0 e o MAD também
+    valores = [0.0] * 12 + [1.0, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 30.0]
+    df = points('zag', valores)
+    assert outliers_by_position(df, 'mad') == outliers_by_position(df, 'iqr') == {'zag': [30.0]}
+
+def test_mad_e_iqr_zero_nao_marcam_outliers():
+    df = points('lat', [0.0] * 18 + [3.0, 8.0])
+    assert outliers_by_position(df, 'mad') == {}
+    lower, upper = analise.outlier_bounds(df, 'pontos_num', ['posicao_id'], 'mad')
+    assert lower.isna().all() and upper.isna().all()
+
+def test_mad_nao_nulo_usa_o_z_score_modificado():
+    rng = np.random.default_rng(0)
+    valores = np.round(rng.normal(3, 2, size=200), 1)
+    valores[:3] = [25.0, -15.0, 40.0]
+    df = pd.concat([points('mei', valores), points('zag', [0.0] * 9 + [1.0, 2.0, 3.0, 4.0, 5.0, 30.0])], ignore_index=True)
+
+    mediana = np.median(valores)
+    mad = np.median(np.abs(valores - mediana)) / 0.6745
+    esperado = sorted(v for v in valores if abs(v - mediana) > 3.5 * mad)
+    assert outliers_by_position(df, 'mad')['mei'] == esperado
+    assert outliers_by_position(df, 'mad')['zag'] == [30.0]
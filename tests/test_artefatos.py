@@ -0,0 +1,41 @@
+import importlib
+import os
+
+import pandas as pd
+import pytest
+
+from src.artefatos import load_artifact, clear_artifacts, cache_stats
+
+def test_alteracao_na_copia_nao_chega_ao_registro(tmp_path):
+    clear_artifacts()
+    path = tmp_path / 'tabela.parquet'
+    pd.DataFrame({'x': [1.0, 2.0, 3.0], 'nome': ['a', 'b', 'c']}).to_parquet(path, index=False)
+
+    df = load_artifact(str(path), pd.read_parquet)
+    df.loc[0, 'x'] = 99.0
+    df['x'] *= 10
+    df['nome'] = df['nome'].str.upper()
+    df.drop(index=1, inplace=True)
+
+    again = load_artifact(str(path), pd.read_parquet)
+    pd.testing.assert_frame_equal(again, pd.DataFrame({'x': [1.0, 2.0, 3.0], 'nome': ['a', 'b', 'c']}))
+    assert cache_stats()['acertos'] >= 1
+
+def test_arquivo_alterado_e_relido(tmp_path):
+    clear_artifacts()
+    path = tmp_path / 'tabela.parquet'
+    pd.DataFrame({'x': [1]}).to_parquet(path, index=False)
+    assert load_artifact(str(path), pd.read_parquet)['x'].tolist() == [1]
+
+    pd.DataFrame({'x': [2, 3]}).to_parquet(path, index=False)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    assert load_artifact(str(path), pd.read_parquet)['x'].tolist() == [2, 3]
+    os.remove(path)
+    assert load_artifact(str(path), pd.read_parquet) is None
+
+@pytest.mark.skipif(int(pd.__version__.split('.')[0]) >= 3, reason="copy-on-write é sempre ativo no pandas 3")
+def test_importar_nao_altera_opcoes_globais():
+    import src.artefatos as artefatos
+    before = pd.get_option('mode.copy_on_write')
+    importlib.reload(artefatos)
+    assert pd.get_option('mode.copy_on_write') == before
@@ -0,0 +1,81 @@
+import json
+import os
+import time
+
+import pytest
+
+import src.cartola_api as cartola_api
+from src.cartola_api import fetch_json, fetch_many
+from src.cartola_fake import start_server
+
+@pytest.fixture
+def server(data_dir, monkeypatch):
+    """Servidor fake com mercado sintético numa porta livre; sem espera entre as novas tentativas do cliente."""
+    monkeypatch.setattr(cartola_api, 'API_BACKOFF', 0)
+    server = start_server(port=0, source=None)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def age_cache(url, seconds):
+    """Envelhece a entrada em cache da URL (a idade é contada pelo mtime do arquivo)."""
+    path = cartola_api._cache_path(url)
+    mtime = os.path.getmtime(path) - seconds
+    os.utime(path, (mtime, mtime))
+    return path
+
+def test_ttl_responde_do_cache_sem_requisicao(server):
+    first = fetch_json('/mercado/status', ttl=60, base_url=server.base_url)
+    again = fetch_json('/mercado/status', ttl=60, base_url=server.base_url)
+    assert again == first and first['rodada_atual'] == 1
+    assert server.request_counts['/mercado/status'] == 1
+
+def test_304_renova_o_mtime_do_cache(server):
+    url = f"{server.base_url}/atletas/mercado"
+    body = fetch_json('/atletas/mercado', ttl=60, base_url=server.base_url)
+    path = age_cache(url, 120)
+    # O corpo em cache é marcado: se a resposta fosse 200, ele seria substituído
+    with open(path, 'r', encoding='utf-8') as f:
+        entry = json.load(f)
+    entry['corpo']['marcador'] = True
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+    age_cache(url, 120)
+
+    revalidated = fetch_json('/atletas/mercado', ttl=60, base_url=server.base_url)
+    assert server.request_counts['/atletas/mercado'] == 2
+    assert revalidated == {**body, 'marcador': True}
+    assert time.time() - os.path.getmtime(path) < 5
+
+    # Dentro do ttl de novo: nenhuma requisição
+    fetch_json('/atletas/mercado', ttl=60, base_url=server.base_url)
+    assert server.request_counts['/atletas/mercado'] == 2
+
+def test_mercado_alterado_substitui_o_cache(server):
+    url = f"{server.base_url}/atletas/mercado"
+    before = fetch_json('/atletas/mercado', ttl=60, base_url=server.base_url)
+    server.mutate_market(fraction=0.5)
+    age_cache(url, 120)
+    after = fetch_json('/atletas/mercado', ttl=60, base_url=server.base_url)
+    assert after != before
+    assert after == fetch_json('/atletas/mercado', ttl=60, base_url=server.base_url)
+
+def test_servidor_fora_do_ar_devolve_o_cache_antigo(server):
+    url = f"{server.base_url}/mercado/status"
+    body = fetch_json('/mercado/status', ttl=60, base_url=server.base_url)
+    server.shutdown()
+    server.server_close()
+    age_cache(url, 3600)
+
+    assert fetch_json('/mercado/status', ttl=60, base_url=server.base_url) == body
+    assert fetch_json('/clubes', ttl=60, base_url=server.base_url) is None
+
+def test_fetch_many_preserva_a_ordem_dos_endpoints(server):
+    server.latency = 0.02
+    endpoints = ['/partidas/3', '/clubes', '/partidas/1', '/nao_existe', '/partidas/2', '/mercado/status']
+    result = fetch_many(endpoints, ttl=60, base_url=server.base_url, concurrency=4)
+    assert list(result) == endpoints
+    assert [result[e]['rodada'] for e in ('/partidas/3', '/partidas/1', '/partidas/2')] == [3, 1, 2]
+    assert result['/nao_existe'] is None
+    assert result['/clubes'] == fetch_json('/clubes', ttl=60, base_url=server.base_url)
+    assert all(server.request_counts[e] == 1 for e in endpoints if e != '/nao_existe')
@@ -0,0 +1,143 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import src.cartola_api as cartola_api
+import src.coletor as coletor
+from src.cartola_fake import start_server
+from src.coletor import (MarketCollector, is_fresh, market_as_of, market_snapshot, player_history, snapshot_files,
+                         status_history, SNAPSHOT_COLS)
+from src.config import MARKET_LATEST_FILE
+
+@pytest.fixture
+def server(data_dir, monkeypatch):
+    """Servidor fake com mercado sintético numa porta livre; sem espera entre as novas tentativas do cliente."""
+    monkeypatch.setattr(cartola_api, 'API_BACKOFF', 0)
+    server = start_server(port=0, source=None)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def collect(collector):
+    """Uma coleta; a espera garante um nome de arquivo (ms da coleta) diferente do da anterior."""
+    time.sleep(0.005)
+    return collector.collect()
+
+def expected_market(server):
+    with server.lock:
+        return market_snapshot([dict(a) for a in server.market['atletas']])
+
+def test_completo_seguido_de_deltas(server):
+    collector = MarketCollector(server.base_url)
+    first = collect(collector)
+    n_atletas = len(server.market['atletas'])
+    assert first['tipo'] == 'completo' and first['linhas'] == n_atletas
+
+    # Nada mudou: nenhum arquivo novo
+    assert collect(collector)['linhas'] == 0
+    assert len(snapshot_files()) == 1
+
+    before = expected_market(server)
+    server.mutate_market(fraction=0.2)
+    after = expected_market(server)
+    n_changed = int((before != after).any(axis=1).sum())
+    delta = collect(collector)
+    assert delta['tipo'] == 'delta' and delta['linhas'] == n_changed > 0
+
+    with server.lock:
+        removed = server.market['atletas'].pop()
+        server._touch()
+    delta = collect(collector)
+    assert delta['tipo'] == 'delta' and delta['linhas'] == 1
+
+    files = snapshot_files()
+    assert [completo for _, completo, _ in files] == [True, False, False]
+    last = pd.read_parquet(files[-1][2])
+    assert last['atleta_id'].tolist() == [removed['atleta_id']] and last['removido'].all()
+
+    # Rodada nova: outro arquivo completo, na partição da rodada
+    server.advance_round()
+    novo = collect(collector)
+    assert novo['tipo'] == 'completo' and novo['rodada'] == 2 and novo['linhas'] == n_atletas - 1
+    assert os.path.basename(os.path.dirname(snapshot_files()[-1][2])) == 'rodada=2'
+
+def test_market_as_of_reconstroi_cada_instante(server):
+    collector = MarketCollector(server.base_url)
+    assert market_as_of() is None
+    states = []
+    for step in range(4):
+        resumo = collect(collector)
+        states.append((resumo['coletado_em'], expected_market(server)))
+        if step == 1:
+            with server.lock:
+                server.market['atletas'].pop(0)
+                server._touch()
+        else:
+            server.mutate_market(fraction=0.3)
+    server.advance_round()
+    resumo = collect(collector)
+    states.append((resumo['coletado_em'], expected_market(server)))
+
+    assert market_as_of(states[0][0] - pd.Timedelta('1ms')) is None
+    for instante, expected in states:
+        ms = int(instante.timestamp() * 1000)
+        for when in (instante, instante.isoformat(), ms, float(ms)):
+            got = market_as_of(when)
+            pd.testing.assert_frame_equal(got[SNAPSHOT_COLS[1:]], expected, check_index_type=False)
+    pd.testing.assert_frame_equal(market_as_of()[SNAPSHOT_COLS[1:]], states[-1][1], check_index_type=False)
+
+    # Um arquivo completo por rodada; os demais são deltas
+    assert [completo for _, completo, _ in snapshot_files()] == [True, False, False, False, True]
+
+def test_historico_do_atleta_e_do_status(server):
+    collector = MarketCollector(server.base_url)
+    collect(collector)
+    atleta = server.market['atletas'][0]
+    precos = [atleta['preco_num']]
+    for preco in (atleta['preco_num'] + 1.5, atleta['preco_num'] + 3.0):
+        # Outro atleta muda entre as coletas: a versão do primeiro não pode se repetir no histórico
+        with server.lock:
+            server.market['atletas'][1]['status_id'] = 5 if server.market['atletas'][1]['status_id'] != 5 else 7
+            server._touch()
+        collect(collector)
+        with server.lock:
+            atleta['preco_num'] = preco
+            server._touch()
+        collect(collector)
+        precos.append(preco)
+    server.advance_round()
+    collect(collector)
+
+    history = player_history(atleta['atleta_id'])
+    assert history['atleta_id'].eq(atleta['atleta_id']).all()
+    assert history['coletado_em'].is_monotonic_increasing
+    # Uma linha por mudança: a cópia do arquivo completo da rodada 2 só entra porque os jogos mudaram
+    assert history['preco_num'].tolist() == pytest.approx(precos + [precos[-1]])
+    assert history['rodada'].astype(int).tolist() == [1, 1, 1, 2]
+    assert not history['removido'].any()
+    assert player_history(-1).empty
+
+    status = status_history()
+    assert status['coletado_em'].is_monotonic_increasing
+    assert status['rodada_atual'].tolist()[-1] == 2
+    # O status só é gravado quando muda: cada linha difere da anterior
+    corpo = status.drop(columns='coletado_em')
+    assert not (corpo == corpo.shift()).all(axis=1).any()
+
+def test_is_fresh(data_dir, server):
+    assert not is_fresh(MARKET_LATEST_FILE)
+    collector = MarketCollector(server.base_url)
+    collect(collector)
+    assert is_fresh(MARKET_LATEST_FILE, max_age=60)
+    old = time.time() - 120
+    os.utime(MARKET_LATEST_FILE, (old, old))
+    assert not is_fresh(MARKET_LATEST_FILE, max_age=60)
+    assert is_fresh(MARKET_LATEST_FILE, max_age=None)
+    assert coletor.read_latest_market(max_age=60) is None
+
+    # Uma coleta sem mudanças renova a data de modificação: o coletor está vivo
+    assert collect(collector)['linhas'] == 0
+    assert is_fresh(MARKET_LATEST_FILE, max_age=60)
+    assert len(coletor.read_latest_market(max_age=60)) == len(server.market['atletas'])
@@ -0,0 +1,67 @@
+import os
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import AGGREGATED_OUTPUT_FILE, RAW_DATA_PATH
+from src.consultas import connect, run_query, aggregated_summary, top_aggregated
+
+@pytest.fixture
+def con(data_dir):
+    os.makedirs(os.path.dirname(AGGREGATED_OUTPUT_FILE), exist_ok=True)
+    pd.DataFrame({'atleta_id': [1, 2], 'media_pontos': [3.5, 7.0]}).to_parquet(AGGREGATED_OUTPUT_FILE, index=False)
+    os.makedirs(os.path.join(RAW_DATA_PATH, '2025'), exist_ok=True)
+    pd.DataFrame({'atletas.atleta_id': [1]}).to_csv(os.path.join(RAW_DATA_PATH, '2025', 'rodada-1.csv'), index=False)
+    return connect(include_raw=True)
+
+def test_views_continuam_legiveis(con):
+    assert run_query(con, "SELECT sum(media_pontos) AS total FROM agregado")['total'].iloc[0] == 10.5
+    assert len(run_query(con, "SELECT * FROM bruto")) == 1
+
+def test_arquivos_dentro_de_data_dir_sao_permitidos(con):
+    pattern = os.path.join(RAW_DATA_PATH, '2025', 'rodada-1.csv')
+    assert len(run_query(con, f"SELECT * FROM read_csv('{pattern}')")) == 1
+
+@pytest.mark.parametrize('sql', [
+    "SELECT * FROM read_text('{path}')",
+    "SELECT * FROM read_csv('{path}', header = false)",
+    "SELECT * FROM read_text('{data_dir}/../{name}')",
+])
+def test_arquivos_fora_de_data_dir_sao_recusados(con, data_dir, tmp_path, sql):
+    segredo = tmp_path / 'segredo.txt'
+    segredo.write_text("senha=123\n")
+    outside = os.path.relpath(segredo, os.path.dirname(data_dir))
+    with pytest.raises(duckdb.Error, match='Permission'):
+        run_query(con, sql.format(path=segredo, data_dir=data_dir, name=outside))
+
+def test_configuracao_travada(con):
+    with pytest.raises(duckdb.Error):
+        con.execute("SET enable_external_access = true")
+    with pytest.raises(duckdb.Error):
+        con.execute("SET allowed_directories = ['/']")
+    with pytest.raises(ValueError):
+        run_query(con, "COPY (SELECT 1) TO '/tmp/saida.csv'")
+
+def test_top_aggregated_igual_ao_pandas(data_dir):
+    rng = np.random.default_rng(0)
+    agregado = pd.DataFrame({
+        'atleta_id': np.arange(200), 'jogos_disputados': rng.integers(1, 40, size=200),
+        'media_pontos': np.round(rng.normal(3, 2, size=200), 1), 'custo_beneficio_medio': rng.random(200),
+    })
+    os.makedirs(os.path.dirname(AGGREGATED_OUTPUT_FILE), exist_ok=True)
+    agregado.to_parquet(AGGREGATED_OUTPUT_FILE, index=False)
+    con = connect()
+
+    ativos = rng.choice(200, size=80, replace=False)
+    filtrado = agregado[agregado['atleta_id'].isin(ativos) & (agregado['jogos_disputados'] >= 10)]
+    for ordem in ('media_pontos', 'custo_beneficio_medio'):
+        top = top_aggregated(con, ordem, min_jogos=10, atleta_ids=ativos, k=20)
+        esperado = filtrado.sort_values([ordem, 'atleta_id'], ascending=[False, True]).head(20)
+        assert top['atleta_id'].tolist() == esperado['atleta_id'].tolist()
+
+    resumo = aggregated_summary(con, ativos)
+    assert resumo == {'atletas': 80, 'max_jogos': agregado.loc[agregado['atleta_id'].isin(ativos), 'jogos_disputados'].max()}
+    with pytest.raises(ValueError):
+        top_aggregated(con, 'apelido; DROP TABLE x')
@@ -0,0 +1,36 @@
+import os
+
+import pandas as pd
+
+from src.config import AGGREGATED_OUTPUT_FILE
+from src.armazenamento import arrow_path, publish_arrow
+from src.artefatos import clear_artifacts
+from src.dados import load_table, load_parquet_data
+
+def write_aggregated():
+    df = pd.DataFrame({'atleta_id': range(10), 'apelido': [f'Atleta {i}' for i in range(10)],
+                       'media_pontos': [float(i) for i in range(10)], 'std_pontos': 1.0, 'jogos_disputados': 5})
+    os.makedirs(os.path.dirname(AGGREGATED_OUTPUT_FILE), exist_ok=True)
+    df.to_parquet(AGGREGATED_OUTPUT_FILE, index=False)
+    return df
+
+def test_load_table_projeta_e_filtra_com_e_sem_copia_arrow(data_dir):
+    clear_artifacts()
+    df = write_aggregated()
+    filters = [('atleta_id', 'in', [2, 5, 7])]
+    esperado = df.loc[[2, 5, 7], ['atleta_id', 'media_pontos']].reset_index(drop=True)
+
+    # Sem a cópia Arrow: lê do parquet
+    pd.testing.assert_frame_equal(load_table('dados_agregados_por_atleta', ['atleta_id', 'media_pontos'], filters), esperado)
+    publish_arrow(df, AGGREGATED_OUTPUT_FILE)
+    assert os.path.exists(arrow_path(AGGREGATED_OUTPUT_FILE))
+    pd.testing.assert_frame_equal(load_table('dados_agregados_por_atleta', ['atleta_id', 'media_pontos'], filters), esperado)
+    assert load_table('tabela_inexistente') is None
+
+def test_load_parquet_data_so_materializa_as_colunas_pedidas(data_dir):
+    clear_artifacts()
+    df = write_aggregated()
+    publish_arrow(df, AGGREGATED_OUTPUT_FILE)
+    parcial = load_parquet_data('dados_agregados_por_atleta.parquet', columns=['atleta_id', 'std_pontos'])
+    assert list(parcial.columns) == ['atleta_id', 'std_pontos']
+    assert list(load_parquet_data('dados_agregados_por_atleta.parquet').columns) == list(df.columns)
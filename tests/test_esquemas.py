@@ -0,0 +1,33 @@
+import collections
+
+import pandas as pd
+
+from src.esquemas import CLUBES, CLUB_IDS_BY_ABBR, map_unique, position_name, repair_text, resolve_clubs
+
+def test_siglas_de_clubes_sao_unicas():
+    siglas = collections.Counter(sigla for _, (_, lista) in CLUBES.items() for sigla in lista)
+    assert [sigla for sigla, n in siglas.items() if n > 1] == []
+    assert 'ATL' not in CLUB_IDS_BY_ABBR
+
+def test_resolve_clubs_pelo_id_nome_e_sigla():
+    # 2018: sigla no lugar do clube_id ('ATL' ambígua); 2020: clube_id no nome; 2025: sigla no nome
+    clube_id = pd.Series(['ATL', 'ATL', 'AME', ' 262', None, None, '2305'])
+    clube_nome = pd.Series(['Atlético-MG', 'Atlético-PR', 'América-MG', None, '276', None, 'MIR'])
+    ids, nomes = resolve_clubs(clube_id, clube_nome)
+    assert ids.tolist()[:4] == [282, 293, 327, 262]
+    assert pd.isna(ids[4]) and pd.isna(ids[5])
+    assert ids[6] == 2305
+    assert nomes.astype(object).tolist()[:4] == ['Atlético-MG', 'Athlético-PR', 'América-MG', 'Flamengo']
+    assert nomes[6] == 'Mirassol'
+
+def test_repair_text():
+    assert repair_text('SÃ£o Paulo') == 'São Paulo'
+    assert repair_text('FÃ¡bio') == 'Fábio'
+    assert repair_text('Ângelo') == 'Ângelo'
+    assert repair_text('Gabigol') == 'Gabigol'
+    assert repair_text(None) is None
+
+def test_map_unique_igual_ao_map_por_linha():
+    valores = pd.Series(['1', 'gol', 'ZAG', None, '5', '1', 'xyz', '6'] * 3)
+    esperado = valores.map(position_name)
+    assert map_unique(valores, position_name).astype(object).tolist() == esperado.tolist()
@@ -0,0 +1,89 @@
+import importlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import FORM_OUTPUT_FILE, FORM_STATE_FILE, FORM_ROUNDS_FILE, FORM_WINDOW, FORM_EWMA_SPAN
+
+forma = importlib.import_module('07_forma')
+
+def random_games(seed, n_atletas=40, anos=(2024, 2025), n_rodadas=10):
+    """Pontos por (atleta_id, ano, rodada_id); zero quando o atleta não jogou, como no dataset consolidado."""
+    rng = np.random.default_rng(seed)
+    index = pd.MultiIndex.from_product([1000 + np.arange(n_atletas), anos, range(1, n_rodadas + 1)],
+                                       names=['atleta_id', 'ano', 'rodada_id'])
+    jogou = rng.random(len(index)) < 0.6
+    pontos = np.where(jogou, np.round(rng.normal(3, 4, size=len(index)), 2), 0.0)
+    df = index.to_frame(index=False).assign(pontos_num=pontos)
+    # Atletas que só jogam uma das temporadas
+    return df[~((df['atleta_id'] % 7 == 0) & (df['ano'] == anos[-1]))].reset_index(drop=True)
+
+def reference_form(df):
+    """Forma recente recalculada do zero com pandas: janela dos últimos FORM_WINDOW jogos e EWMA sem ajuste."""
+    games = df[df['pontos_num'] != 0].sort_values(['atleta_id', 'ano', 'rodada_id'])
+    rows = []
+    for (atleta_id, ano), grupo in games.groupby(['atleta_id', 'ano']):
+        pontos = grupo['pontos_num']
+        janela = pontos.iloc[-FORM_WINDOW:]
+        rows.append({
+            'atleta_id': atleta_id, 'ano': ano, 'ultima_rodada': grupo['rodada_id'].iloc[-1],
+            'jogos_temporada': len(pontos), 'jogos_janela': len(janela), 'media_forma': janela.mean(),
+            'std_forma': janela.std(ddof=1) if len(janela) > 1 else 0.0,
+            'ewma_pontos': pontos.ewm(span=FORM_EWMA_SPAN, adjust=False).mean().iloc[-1],
+        })
+    ref = pd.DataFrame(rows).sort_values(['atleta_id', 'ano']).drop_duplicates('atleta_id', keep='last')
+    return ref.reset_index(drop=True)
+
+def run_form(df):
+    assert forma.run(df=df)
+    return pd.read_parquet(FORM_OUTPUT_FILE)
+
+def assert_same_form(result, expected):
+    pd.testing.assert_frame_equal(result.astype('float64'), expected[result.columns].astype('float64'),
+                                  check_dtype=False, atol=1e-4)
+
+def clear_state():
+    for path in (FORM_OUTPUT_FILE, FORM_STATE_FILE, FORM_ROUNDS_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_forma_incremental_igual_ao_recalculo_completo(data_dir, seed):
+    df = random_games(seed)
+    # Rodadas chegando em lotes: 1-4 das duas temporadas, depois 5-7 e, por fim, 8-10
+    for ultima in (4, 7, 10):
+        incremental = run_form(df[df['rodada_id'] <= ultima])
+
+    clear_state()
+    completo = run_form(df)
+    pd.testing.assert_frame_equal(incremental, completo)
+    assert_same_form(incremental, reference_form(df))
+
+def test_forma_refaz_temporada_com_rodada_corrigida(data_dir):
+    df = random_games(seed=5)
+    run_form(df[df['rodada_id'] <= 6])
+
+    corrigido = df.copy()
+    corrigido.loc[(corrigido['ano'] == 2025) & (corrigido['rodada_id'] == 3), 'pontos_num'] += 1.5
+    assert_same_form(run_form(corrigido), reference_form(corrigido))
+
+def test_forma_refaz_temporada_com_rodada_atrasada(data_dir):
+    df = random_games(seed=6)
+    sem_rodada_2 = df[~((df['ano'] == 2024) & (df['rodada_id'] == 2))]
+    run_form(sem_rodada_2)
+    assert_same_form(run_form(df), reference_form(df))
+
+def test_forma_refaz_temporada_com_pontos_trocados_entre_atletas(data_dir):
+    df = random_games(seed=7)
+    run_form(df)
+
+    # Dois atletas da mesma rodada trocam de pontuação: contagem e soma da rodada não mudam
+    jogos = df[(df['ano'] == 2025) & (df['rodada_id'] == 10) & (df['pontos_num'] != 0)]
+    i = jogos.index[0]
+    j = jogos.index[jogos['pontos_num'] != jogos.at[i, 'pontos_num']][0]
+    trocado = df.copy()
+    trocado.loc[[i, j], 'pontos_num'] = df.loc[[j, i], 'pontos_num'].to_numpy()
+
+    assert_same_form(run_form(trocado), reference_form(trocado))
@@ -0,0 +1,39 @@
+import importlib
+import sys
+
+import pytest
+
+import src.instrumentacao as instrumentacao
+
+@pytest.fixture
+def sem_resource(monkeypatch):
+    """Recarrega src.instrumentacao como no Windows: `import resource` falha e /proc não existe."""
+    monkeypatch.setitem(sys.modules, 'resource', None)
+    modulo = importlib.reload(instrumentacao)
+    real_open = open
+
+    def open_sem_proc(path, *args, **kwargs):
+        if str(path).startswith('/proc/'):
+            raise FileNotFoundError(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr('builtins.open', open_sem_proc)
+    yield modulo
+    monkeypatch.undo()
+    importlib.reload(instrumentacao)
+
+def test_measure_stage_sem_resource(sem_resource):
+    assert sem_resource.resource is None
+    assert sem_resource.rss_bytes() is None
+    assert sem_resource.children_usage() == (None, None)
+
+    result, metrics = sem_resource.measure_stage('etapa', lambda valor: valor * 2, valor=21)
+    assert result == 42
+    assert metrics['pico_rss_mb'] is None
+    assert metrics['cpu_s'] >= 0
+    assert metrics['bytes_lidos'] is None and 'pico_rss_subprocessos_mb' not in metrics
+
+def test_measure_stage_com_resource():
+    result, metrics = instrumentacao.measure_stage('etapa', lambda n: sum(range(n)), n=10)
+    assert result == 45
+    assert metrics['pico_rss_mb'] > 0
@@ -0,0 +1,72 @@
+import importlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_season, write_round
+from src.config import ROOT_DIR, RAW_DATA_PATH, CONSOLIDATED_DATASET_PATH, RAW_MANIFEST_FILE
+from src.manifesto import diff_files, make_entry, load_manifest
+
+limpeza = importlib.import_module('01_limpeza')
+
+def test_diff_files_classifica_novos_alterados_removidos_e_tocados(tmp_path):
+    paths = {name: tmp_path / name for name in ['igual.csv', 'tocado.csv', 'alterado.csv', 'mesmo_tamanho.csv']}
+    for name, path in paths.items():
+        path.write_text(f"conteudo de {name}\n")
+    manifest = {'arquivos': {os.path.relpath(p, tmp_path): make_entry(str(p), [], 0) for p in paths.values()}}
+    manifest['arquivos']['removido.csv'] = {'tamanho': 1, 'mtime_ns': 1, 'hash': 'x', 'saidas': [], 'linhas': 0}
+
+    stat = os.stat(paths['tocado.csv'])
+    os.utime(paths['tocado.csv'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    paths['alterado.csv'].write_text("conteudo maior que o original\n")
+    stat = os.stat(paths['mesmo_tamanho.csv'])
+    paths['mesmo_tamanho.csv'].write_text("CONTEUDO DE mesmo_tamanho.csv\n")
+    os.utime(paths['mesmo_tamanho.csv'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    novo = tmp_path / 'novo.csv'
+    novo.write_text("novo\n")
+
+    changed, removed, touched = diff_files(manifest, [str(p) for p in [*paths.values(), novo]], str(tmp_path))
+    assert changed == ['alterado.csv', 'mesmo_tamanho.csv', 'novo.csv']
+    assert removed == ['removido.csv']
+    assert list(touched) == ['tocado.csv']
+    assert touched['tocado.csv']['mtime_ns'] == os.stat(paths['tocado.csv']).st_mtime_ns
+    assert touched['tocado.csv']['hash'] == manifest['arquivos']['tocado.csv']['hash']
+
+def read_dataset():
+    df = pd.read_parquet(CONSOLIDATED_DATASET_PATH)
+    df = df.astype({'ano': int, 'rodada_id': int})
+    return df.sort_values(['ano', 'rodada_id', 'atleta_id']).reset_index(drop=True)
+
+def test_ingestao_incremental_igual_a_reconstrucao_completa(data_dir):
+    rng = np.random.default_rng(1)
+    temporadas = {ano: make_season(rng, n_atletas=30, n_rodadas=5) for ano in (2024, 2025)}
+    for ano, rodadas in temporadas.items():
+        for r, atletas in enumerate(rodadas[:4], start=1):
+            write_round(RAW_DATA_PATH, ano, r, atletas)
+    assert limpeza.run(anos='todos')
+
+    # Uma rodada nova, uma corrigida, uma removida e uma só com o mtime alterado
+    write_round(RAW_DATA_PATH, 2025, 5, temporadas[2025][4])
+    corrigida = temporadas[2024][1].assign(pontos_num=temporadas[2024][1]['pontos_num'] + 1)
+    write_round(RAW_DATA_PATH, 2024, 2, corrigida)
+    os.remove(os.path.join(RAW_DATA_PATH, '2024', 'rodada-4.csv'))
+    tocado = os.path.join(RAW_DATA_PATH, '2025', 'rodada-1.csv')
+    os.utime(tocado, ns=(os.stat(tocado).st_atime_ns, os.stat(tocado).st_mtime_ns + 10**9))
+
+    changed, removed, touched = diff_files(load_manifest(RAW_MANIFEST_FILE), limpeza.list_raw_files(['2024', '2025']), ROOT_DIR)
+    assert [os.path.basename(p) for p in changed] == ['rodada-2.csv', 'rodada-5.csv']
+    assert [os.path.basename(p) for p in removed] == ['rodada-4.csv']
+    assert [os.path.basename(p) for p in touched] == ['rodada-1.csv']
+
+    assert limpeza.run(anos='todos')
+    incremental = read_dataset()
+    assert limpeza.run(completo=True, anos='todos')
+    completo = read_dataset()
+
+    pd.testing.assert_frame_equal(incremental, completo)
+    assert sorted(incremental.groupby('ano')['rodada_id'].unique().map(list).to_dict().items()) == \
+        [(2024, [1, 2, 3]), (2025, [1, 2, 3, 4, 5])]
+    rodada_corrigida = incremental[(incremental['ano'] == 2024) & (incremental['rodada_id'] == 2)]
+    assert rodada_corrigida['pontos_num'].tolist() == pytest.approx(corrigida['pontos_num'].tolist(), abs=1e-4)
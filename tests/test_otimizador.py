@@ -0,0 +1,109 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import FORMATIONS
+from src.otimizador import optimize_lineup, prune_dominated
+
+def random_candidates(rng, formation, extra=2):
+    """Candidatos sintéticos: de k a k + extra atletas por posição da formação, preços com centavos."""
+    rows = []
+    for pos, k in FORMATIONS[formation].items():
+        for _ in range(k + rng.integers(0, extra + 1) if k else 0):
+            rows.append({'posicao': pos, 'preco_num': round(float(rng.uniform(2, 15)), 2),
+                         'nota': round(float(rng.normal(4, 3)), 2)})
+    df = pd.DataFrame(rows)
+    df['id'] = np.arange(len(df))
+    return df
+
+def brute_force(candidates, budget, formation):
+    """Maior nota total com custo até `budget` por enumeração de todas as escalações (itertools); None se nenhuma couber."""
+    cap = int(round(budget * 100))
+    costs = np.zeros(1, dtype=np.int64)
+    scores = np.zeros(1)
+    for pos, k in FORMATIONS[formation].items():
+        if k == 0:
+            continue
+        grupo = candidates[candidates['posicao'] == pos]
+        preco = np.rint(grupo['preco_num'].to_numpy() * 100).astype(np.int64)
+        nota = grupo['nota'].to_numpy()
+        combos = list(itertools.combinations(range(len(grupo)), k))
+        if not combos:
+            return None
+        combo_cost = np.array([preco[list(c)].sum() for c in combos])
+        combo_score = np.array([nota[list(c)].sum() for c in combos])
+        costs = (costs[:, None] + combo_cost[None, :]).ravel()
+        scores = (scores[:, None] + combo_score[None, :]).ravel()
+    viaveis = costs <= cap
+    return scores[viaveis].max() if viaveis.any() else None
+
+def min_cost(candidates, formation):
+    """Custo da escalação mais barata da formação (os k atletas mais baratos de cada posição)."""
+    precos = candidates.groupby('posicao')['preco_num'].apply(sorted)
+    return round(sum(sum(precos[pos][:k]) for pos, k in FORMATIONS[formation].items() if k), 2)
+
+def check_lineup(lineup, candidates, budget, formation, expected):
+    assert lineup is not None
+    assert lineup['id'].is_unique
+    assert lineup['preco_num'].sum() <= budget + 1e-9
+    contagem = lineup['posicao'].astype(str).value_counts().to_dict()
+    assert contagem == {pos: k for pos, k in FORMATIONS[formation].items() if k}
+    assert lineup['nota'].sum() == pytest.approx(expected)
+
+@pytest.mark.parametrize('seed', range(25))
+@pytest.mark.parametrize('formation', ['4-3-3', '3-5-2'])
+def test_optimize_lineup_igual_a_enumeracao(seed, formation):
+    rng = np.random.default_rng(seed)
+    candidates = random_candidates(rng, formation)
+    minimo = min_cost(candidates, formation)
+    budget = round(float(rng.uniform(minimo, minimo * 1.6)), 2)
+
+    expected = brute_force(candidates, budget, formation)
+    lineup = optimize_lineup(candidates, budget, formation)
+    check_lineup(lineup, candidates, budget, formation, expected)
+
+def test_optimize_lineup_sem_escalacao_possivel():
+    rng = np.random.default_rng(7)
+    candidates = random_candidates(rng, '4-3-3')
+    budget = round(min_cost(candidates, '4-3-3') - 0.01, 2)
+    assert brute_force(candidates, budget, '4-3-3') is None
+    assert optimize_lineup(candidates, budget, '4-3-3') is None
+
+    # Atletas de menos numa posição: nenhuma escalação, qualquer que seja o orçamento
+    sem_atacantes = candidates[candidates['posicao'] != 'ata']
+    assert optimize_lineup(sem_atacantes, 1000, '4-3-3') is None
+
+def test_optimize_lineup_orcamento_igual_ao_custo_exato():
+    rng = np.random.default_rng(11)
+    candidates = random_candidates(rng, '4-3-3')
+    melhor = optimize_lineup(candidates, 1000, '4-3-3')
+    custo = round(float(melhor['preco_num'].sum()), 2)
+
+    # Com o orçamento igual ao custo exato da melhor escalação, ela continua cabendo
+    exato = optimize_lineup(candidates, custo, '4-3-3')
+    check_lineup(exato, candidates, custo, '4-3-3', melhor['nota'].sum())
+    assert round(float(exato['preco_num'].sum()), 2) == custo
+
+    # Um centavo a menos: só escalações mais baratas, com nota igual à da enumeração
+    menos = round(custo - 0.01, 2)
+    expected = brute_force(candidates, menos, '4-3-3')
+    assert expected <= melhor['nota'].sum() + 1e-9
+    check_lineup(optimize_lineup(candidates, menos, '4-3-3'), candidates, menos, '4-3-3', expected)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_prune_dominated_preserva_o_otimo_de_cada_orcamento(seed):
+    rng = np.random.default_rng(seed)
+    n, k = int(rng.integers(3, 9)), int(rng.integers(1, 4))
+    # Custos e notas inteiros em faixas pequenas: muitos empates
+    costs = rng.integers(1, 6, size=n)
+    scores = rng.integers(0, 5, size=n).astype(float)
+    kept = prune_dominated(costs, scores, k)
+
+    def best(indices, cap):
+        combos = [c for c in itertools.combinations(indices, k) if costs[list(c)].sum() <= cap]
+        return max((scores[list(c)].sum() for c in combos), default=None)
+
+    for cap in range(0, int(costs.sum()) + 1):
+        assert best(kept, cap) == best(range(n), cap)
@@ -0,0 +1,96 @@
+import contextlib
+import importlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+
+from conftest import make_season, write_round
+from src.config import RAW_DATA_PATH, ARROW_STORE_PATH, RUN_REPORT_FILE, CLEANING_SAMPLE
+
+run_pipeline = importlib.import_module('run_pipeline')
+limpeza = importlib.import_module('01_limpeza')
+
+def last_run():
+    """Status de cada etapa na última execução registrada em RUN_REPORT_FILE."""
+    with open(RUN_REPORT_FILE, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    execucao = records[-1]['execucao']
+    return {r['etapa']: r['status'] for r in records if r['execucao'] == execucao and r['etapa'] in run_pipeline.PIPELINE_SCRIPTS}
+
+def read_arrow_dir():
+    tables = {}
+    for name in sorted(os.listdir(ARROW_STORE_PATH)):
+        with pa.memory_map(os.path.join(ARROW_STORE_PATH, name), 'r') as source:
+            tables[name] = pa.ipc.open_file(source).read_all()
+    return tables
+
+def test_checkout_sem_copias_arrow_pula_as_etapas_e_recria_as_copias(data_dir, monkeypatch):
+    # O exemplo de limpeza (uma saída da etapa 01) aponta para um arquivo e atleta dos dados sintéticos
+    monkeypatch.setattr(limpeza, 'CLEANING_SAMPLE', {**CLEANING_SAMPLE, 'arquivo': os.path.join('2025', 'rodada-6.csv'),
+                                                     'atleta_id': 1000})
+    rng = np.random.default_rng(0)
+    for ano in (2024, 2025):
+        for r, atletas in enumerate(make_season(rng, n_atletas=40, n_rodadas=6), start=1):
+            write_round(RAW_DATA_PATH, ano, r, atletas)
+
+    run_pipeline.main()
+    assert set(last_run().values()) == {'executada'}
+    originais = read_arrow_dir()
+
+    # Checkout novo: dados_cartola/arrow/ não é versionado
+    shutil.rmtree(ARROW_STORE_PATH)
+    run_pipeline.main()
+    assert set(last_run().values()) == {'pulada'}
+    restauradas = read_arrow_dir()
+    assert list(restauradas) == list(originais)
+    for name, table in originais.items():
+        assert restauradas[name].equals(table), name
+
+def test_saida_de_etapas_em_paralelo_nao_se_mistura(capsys):
+    barrier = threading.Barrier(2)
+
+    def stage(nome):
+        def run():
+            for i in range(5):
+                barrier.wait()
+                print(f"{nome} {i}")
+            return True
+        return run
+
+    output = run_pipeline.StageOutput(sys.stdout)
+    with contextlib.redirect_stdout(output), ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(run_pipeline.run_stage, output, nome, stage(nome)) for nome in ('a', 'b')]
+        print("orquestrador")
+        results = [future.result() for future in futures]
+    for nome, (success, metrics, text) in zip(('a', 'b'), results):
+        assert success and metrics['tempo_s'] >= 0
+        assert text == "".join(f"{nome} {i}\n" for i in range(5))
+    assert capsys.readouterr().out == "orquestrador\n"
+
+def test_erro_inesperado_vira_falha_com_a_mensagem_na_saida_da_etapa():
+    def run():
+        print("antes do erro")
+        raise RuntimeError("quebrou")
+
+    output = run_pipeline.StageOutput(io.StringIO())
+    with contextlib.redirect_stdout(output):
+        success, metrics, text = run_pipeline.run_stage(output, 'etapa', run)
+    assert not success and metrics is None
+    assert text.startswith("antes do erro\n") and "'etapa'" in text and "quebrou" in text
+    assert output.stream.getvalue() == ""
+
+def test_cabecalhos_das_etapas_numerados_de_1_a_n():
+    total = len(run_pipeline.PIPELINE_SCRIPTS)
+    for n, script_name in enumerate(run_pipeline.PIPELINE_SCRIPTS, start=1):
+        with open(importlib.import_module(script_name).__file__, 'r', encoding='utf-8') as f:
+            source = f.read()
+        banners = re.findall(r"--- (?:INICIANDO|SUCESSO): \[(\d+)/(\d+)\]", source)
+        assert banners and set(banners) == {(str(n), str(total))}, script_name
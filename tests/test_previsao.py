@@ -0,0 +1,61 @@
+import importlib
+import os
+import socket
+
+import numpy as np
+import pandas as pd
+
+from conftest import make_season, write_round
+from src.config import RAW_DATA_PATH, PREDICTIONS_OUTPUT_FILE, PREDICTION_FEATURES_STATE_FILE
+from src.armazenamento import load_consolidated
+
+limpeza = importlib.import_module('01_limpeza')
+scouts_rodada = importlib.import_module('06_scouts_rodada')
+previsao = importlib.import_module('09_previsao')
+
+def test_previsao_usa_so_o_historico(data_dir, monkeypatch):
+    rng = np.random.default_rng(3)
+    for ano in (2024, 2025):
+        for r, atletas in enumerate(make_season(rng, n_atletas=40, n_rodadas=8), start=1):
+            write_round(RAW_DATA_PATH, ano, r, atletas)
+    assert limpeza.run(anos='todos')
+    assert scouts_rodada.run()
+
+    # A etapa não pode depender da API: qualquer conexão de rede falha o teste
+    def sem_rede(*args, **kwargs):
+        raise AssertionError("A etapa 09 tentou acessar a rede")
+    monkeypatch.setattr(socket, 'create_connection', sem_rede)
+    monkeypatch.setattr(socket, 'getaddrinfo', sem_rede)
+    monkeypatch.setattr(socket.socket, 'connect', sem_rede)
+
+    assert previsao.run()
+    primeira = pd.read_parquet(PREDICTIONS_OUTPUT_FILE)
+    assert previsao.run()
+    pd.testing.assert_frame_equal(pd.read_parquet(PREDICTIONS_OUTPUT_FILE), primeira)
+
+    assert primeira['atleta_id'].is_unique
+    assert set(primeira['atleta_id']) == set(1000 + np.arange(40))
+    assert 'status_id' not in primeira
+    assert primeira['pontos_previstos'].notna().all()
+
+def test_previsao_refaz_temporada_com_pontos_trocados(data_dir):
+    rng = np.random.default_rng(4)
+    for ano in (2024, 2025):
+        for r, atletas in enumerate(make_season(rng, n_atletas=30, n_rodadas=6), start=1):
+            write_round(RAW_DATA_PATH, ano, r, atletas)
+    assert limpeza.run(anos='todos')
+    assert scouts_rodada.run()
+    df = load_consolidated(columns=previsao.COLUMNS)
+    assert previsao.run(df=df)
+
+    # Dois atletas trocam de pontuação numa rodada de 2024: contagem e somas da temporada não mudam
+    jogos = df.index[(df['ano'] == 2024) & (df['rodada_id'] == 3) & (df['pontos_num'] != 0)]
+    i, j = jogos[0], jogos[df.loc[jogos, 'pontos_num'] != df.at[jogos[0], 'pontos_num']][0]
+    trocado = df.copy()
+    trocado.loc[[i, j], 'pontos_num'] = df.loc[[j, i], 'pontos_num'].to_numpy()
+    assert previsao.run(df=trocado)
+    incremental = pd.read_parquet(PREDICTIONS_OUTPUT_FILE)
+
+    os.remove(PREDICTION_FEATURES_STATE_FILE)
+    assert previsao.run(df=trocado)
+    pd.testing.assert_frame_equal(incremental, pd.read_parquet(PREDICTIONS_OUTPUT_FILE))
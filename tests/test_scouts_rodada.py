@@ -0,0 +1,63 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import SCOUT_COLS
+
+scouts_rodada = importlib.import_module('06_scouts_rodada')
+
+def reference_deltas(df):
+    """Scouts da rodada calculados atleta a atleta, em Python puro: a definição que scout_deltas vetoriza."""
+    rows = []
+    for (atleta_id, ano), grupo in df.groupby(['atleta_id', 'ano'], sort=True):
+        # Rodada repetida em dois arquivos: vale o maior acumulado
+        por_rodada = grupo.groupby('rodada_id', sort=True)[SCOUT_COLS].max()
+        maximo = np.zeros(len(SCOUT_COLS))
+        rodada_anterior = 0
+        for rodada, acumulado in por_rodada.iterrows():
+            atual = np.maximum(maximo, acumulado.to_numpy())
+            rows.append({'atleta_id': atleta_id, 'ano': ano, 'rodada_id': rodada,
+                         **dict(zip(SCOUT_COLS, atual - maximo)), 'rodadas_acumuladas': rodada - rodada_anterior})
+            maximo, rodada_anterior = atual, rodada
+    return pd.DataFrame(rows)
+
+def random_cumulative(seed, n_atletas=25, n_rodadas=12):
+    """Acumulados (não negativos) com rodadas ausentes, rodadas repetidas e correções para baixo, como nos dados brutos."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for atleta_id in rng.choice(100000, size=n_atletas, replace=False):
+        for ano in (2024, 2025):
+            acumulado = np.zeros(len(SCOUT_COLS), dtype=int)
+            for rodada in range(1, n_rodadas + 1):
+                if rng.random() < 0.25:
+                    continue
+                acumulado = acumulado + rng.poisson(0.5, size=len(SCOUT_COLS))
+                linha = acumulado.copy()
+                if rng.random() < 0.1:
+                    linha[rng.integers(len(SCOUT_COLS))] -= 1
+                rows.append([atleta_id, ano, rodada, *np.maximum(linha, 0)])
+                if rng.random() < 0.1:
+                    repetida = acumulado - rng.integers(0, 2, size=len(SCOUT_COLS))
+                    rows.append([atleta_id, ano, rodada, *np.maximum(repetida, 0)])
+    df = pd.DataFrame(rows, columns=scouts_rodada.KEY_COLS + SCOUT_COLS)
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_scout_deltas_igual_a_referencia(seed):
+    df = random_cumulative(seed)
+    result = scouts_rodada.scout_deltas(df)
+    expected = reference_deltas(df)
+
+    cols = scouts_rodada.KEY_COLS + SCOUT_COLS + ['rodadas_acumuladas']
+    pd.testing.assert_frame_equal(result[cols].astype('int64').reset_index(drop=True),
+                                  expected[cols].astype('int64').reset_index(drop=True))
+    assert (result[SCOUT_COLS] >= 0).all().all()
+
+def test_scout_deltas_somam_o_maior_acumulado_da_temporada():
+    df = random_cumulative(seed=42)
+    result = scouts_rodada.scout_deltas(df)
+    somas = result.groupby(['atleta_id', 'ano'])[SCOUT_COLS].sum()
+    maximos = df.groupby(['atleta_id', 'ano'])[SCOUT_COLS].max()
+    pd.testing.assert_frame_equal(somas.astype('int64'), maximos.astype('int64'))
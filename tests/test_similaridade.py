@@ -0,0 +1,108 @@
+import importlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import (SCOUTS_ROUND_OUTPUT_FILE, AGGREGATED_OUTPUT_FILE, SIMILARITY_INDEX_FILE, SIMILARITY_STATE_FILE,
+                        SIMILARITY_SEASONS_FILE, SCOUT_COLS)
+from src.similaridade import VECTOR_COLS, search_structure, similar_players
+
+similaridade = importlib.import_module('08_similaridade')
+
+def write_inputs(scouts, n_atletas, seed=0):
+    """Grava as entradas da etapa 08: scouts da rodada e a tabela agregada por atleta."""
+    rng = np.random.default_rng(seed)
+    jogadores = pd.DataFrame({
+        'atleta_id': (1000 + np.arange(n_atletas)).astype('int32'),
+        'apelido': [f'Atleta {i}' for i in range(n_atletas)],
+        'jogos_disputados': rng.integers(3, 30, size=n_atletas),
+        'media_pontos': rng.normal(3, 2, size=n_atletas),
+        'media_preco': np.round(rng.uniform(2, 15, size=n_atletas), 2),
+        'ultimo_clube': 'Flamengo',
+        'posicao': pd.Categorical(rng.choice(['zag', 'mei', 'ata'], size=n_atletas)),
+    })
+    os.makedirs(os.path.dirname(SCOUTS_ROUND_OUTPUT_FILE), exist_ok=True)
+    scouts.to_parquet(SCOUTS_ROUND_OUTPUT_FILE, index=False)
+    jogadores.to_parquet(AGGREGATED_OUTPUT_FILE, index=False)
+
+def random_scouts(seed, n_atletas=60, anos=(2023, 2024, 2025), n_rodadas=8):
+    rng = np.random.default_rng(seed)
+    index = pd.MultiIndex.from_product([1000 + np.arange(n_atletas), anos, range(1, n_rodadas + 1)],
+                                       names=['atleta_id', 'ano', 'rodada_id'])
+    df = index.to_frame(index=False).astype({'atleta_id': 'int32', 'ano': 'int16', 'rodada_id': 'int16'})
+    df[SCOUT_COLS] = rng.poisson(0.5, size=(len(df), len(SCOUT_COLS))).astype('int16')
+    return df
+
+def run_index():
+    assert similaridade.run()
+    return pd.read_parquet(SIMILARITY_INDEX_FILE)
+
+def full_rebuild():
+    for path in (SIMILARITY_STATE_FILE, SIMILARITY_SEASONS_FILE):
+        os.remove(path)
+    return run_index()
+
+def test_indice_incremental_igual_a_reconstrucao_completa(data_dir):
+    scouts = random_scouts(seed=1)
+    write_inputs(scouts, n_atletas=60)
+    run_index()
+
+    # Correção que só move scouts: um gol passa de um atleta para outro e uma falta sofrida vira cometida,
+    # sem mudar o número de linhas nem o total de scouts da temporada
+    corrigido = scouts.copy()
+    linhas = corrigido.index[(corrigido['ano'] == 2024) & (corrigido['G'] > 0)]
+    corrigido.loc[linhas[0], 'G'] -= 1
+    corrigido.loc[linhas[0] + 1, 'G'] += 1
+    linha = corrigido.index[(corrigido['ano'] == 2024) & (corrigido['FS'] > 0)][0]
+    corrigido.loc[linha, ['FS', 'FC']] += np.array([-1, 1], dtype='int16')
+    write_inputs(corrigido, n_atletas=60)
+    incremental = run_index()
+    pd.testing.assert_frame_equal(incremental, full_rebuild())
+
+    # Temporada que sai da janela de anos é descartada do estado
+    write_inputs(corrigido[corrigido['ano'] != 2023], n_atletas=60)
+    incremental = run_index()
+    pd.testing.assert_frame_equal(incremental, full_rebuild())
+    assert 2023 not in set(pd.read_parquet(SIMILARITY_STATE_FILE)['ano'])
+
+def brute_force_similar(index, atleta_id, k, cheaper):
+    """Os k mais parecidos recalculados linha a linha, para comparar com a busca vetorizada."""
+    alvo = index[index['atleta_id'] == atleta_id].iloc[0]
+    rows = []
+    for _, linha in index[(index['posicao'] == alvo['posicao']) & (index['atleta_id'] != atleta_id)].iterrows():
+        if cheaper and not linha['media_preco'] < alvo['media_preco']:
+            continue
+        dist = np.sqrt(sum((float(linha[c]) - float(alvo[c])) ** 2 for c in VECTOR_COLS))
+        rows.append((dist, linha['atleta_id']))
+    return [atleta for _, atleta in sorted(rows)[:k]]
+
+@pytest.mark.parametrize('cheaper', [False, True])
+def test_similar_players_igual_a_busca_linha_a_linha(data_dir, cheaper):
+    write_inputs(random_scouts(seed=2), n_atletas=60)
+    index = run_index()
+    structure = search_structure(index)
+
+    for atleta_id in index['atleta_id'].iloc[::7]:
+        result = similar_players(structure, atleta_id, k=5, cheaper=cheaper)
+        assert result['atleta_id'].tolist() == brute_force_similar(index, atleta_id, 5, cheaper)
+        assert result['distancia'].is_monotonic_increasing
+        if cheaper:
+            preco = index.loc[index['atleta_id'] == atleta_id, 'media_preco'].iloc[0]
+            assert (result['preco'] < preco).all()
+
+def test_similar_players_mais_baratos_pelo_preco_atual(data_dir):
+    write_inputs(random_scouts(seed=3), n_atletas=60)
+    index = run_index()
+    structure = search_structure(index)
+    atleta_id = index['atleta_id'].iloc[0]
+    mesma_posicao = index.loc[index['posicao'] == index['posicao'].iloc[0], 'atleta_id']
+
+    # Preço do mercado: o atleta custa 10 e só metade dos colegas de posição custa menos
+    prices = pd.Series(np.where(np.arange(len(mesma_posicao)) % 2 == 0, 5.0, 20.0), index=mesma_posicao.to_numpy())
+    prices[atleta_id] = 10.0
+    result = similar_players(structure, atleta_id, k=50, cheaper=True, prices=prices)
+    assert set(result['atleta_id']) == set(prices.index[prices < 10.0])
+    assert (result['preco'] == 5.0).all()
+    assert similar_players(structure, 1, k=5) is None
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.simulacao as simulacao
+from src.simulacao import STRATEGIES, season_arrays, simulate_season
+
+N_ATLETAS, N_RODADAS = 48, 8
+
+def synthetic_season(seed=0):
+    """Linhas (COLUMNS) de uma temporada sintética: 8 atletas por posição, alguns fora do mercado em algumas rodadas."""
+    rng = np.random.default_rng(seed)
+    ids = 500 + np.arange(N_ATLETAS)
+    linhas = []
+    for rodada in range(1, N_RODADAS + 1):
+        presente = rng.random(N_ATLETAS) < 0.9
+        variacao = np.round(rng.normal(0, 1, N_ATLETAS), 2)
+        linhas.append(pd.DataFrame({
+            'atleta_id': ids, 'ano': 2025, 'rodada_id': rodada,
+            'posicao_id': [str(i % 6 + 1) for i in range(N_ATLETAS)],
+            'status_id': rng.choice([7, 7, 7, 2], size=N_ATLETAS),
+            'pontos_num': np.round(np.where(rng.random(N_ATLETAS) < 0.8, rng.normal(3, 4, N_ATLETAS), 0), 2),
+            # preco_num é o preço depois da rodada: preço de antes + variação
+            'preco_num': np.round(rng.uniform(2, 12, N_ATLETAS) + variacao, 2),
+            'variacao_num': variacao,
+        })[presente])
+    return pd.concat(linhas, ignore_index=True)
+
+def recorder(nome, notas):
+    """Envolve uma estratégia, guardando a nota que ela dá em cada rodada."""
+    def estrategia(estado):
+        nota = STRATEGIES[nome](estado)
+        notas.append(np.array(nota, dtype='float64', copy=True))
+        return nota
+    estrategia.__name__ = nome
+    return estrategia
+
+def run(df, nome, historico=None):
+    notas = []
+    result = simulate_season(season_arrays(df), recorder(nome, notas), historico=historico)
+    return result, notas
+
+@pytest.mark.parametrize('nome', list(STRATEGIES))
+def test_nota_da_rodada_so_usa_rodadas_anteriores(nome):
+    df = synthetic_season()
+    historico = pd.DataFrame({'soma': [30.0, 12.0], 'soma_quad': [300.0, 80.0], 'jogos': [6, 4]}, index=[500, 501])
+    base, notas_base = run(df, nome, historico)
+    assert len(notas_base) == N_RODADAS
+
+    rng = np.random.default_rng(1)
+    for corte in range(1, N_RODADAS + 1):
+        # Muda pontos e variação da rodada `corte` em diante, mantendo o preço de antes de cada rodada
+        futuro = df.copy()
+        depois = futuro['rodada_id'] >= corte
+        delta = np.round(rng.normal(0, 2, depois.sum()), 2)
+        futuro.loc[depois, 'pontos_num'] = np.round(rng.normal(5, 6, depois.sum()), 2)
+        futuro.loc[depois, 'variacao_num'] += delta
+        futuro.loc[depois, 'preco_num'] += delta
+        result, notas = run(futuro, nome, historico)
+
+        for r in range(corte):
+            np.testing.assert_allclose(notas[r], notas_base[r], err_msg=f"rodada {r + 1} com corte {corte}")
+        # As escalações até a rodada `corte` (inclusive) não mudam, nem o resultado das rodadas anteriores
+        antes = result['rodada_id'] < corte
+        pd.testing.assert_frame_equal(result[antes], base[antes])
+        assert result.loc[result['rodada_id'] == corte, 'custo'].tolist() == pytest.approx(
+            base.loc[base['rodada_id'] == corte, 'custo'].tolist())
+
+def test_patrimonio_muda_pela_variacao_dos_escalados(monkeypatch):
+    df = synthetic_season(seed=2)
+    season = season_arrays(df)
+    escalacoes = []
+
+    def optimize(candidatos, orcamento, formacao):
+        escalacao = optimize_lineup(candidatos, orcamento, formacao)
+        escalacoes.append((orcamento, escalacao))
+        return escalacao
+
+    optimize_lineup = simulacao.optimize_lineup
+    monkeypatch.setattr(simulacao, 'optimize_lineup', optimize)
+    result = simulate_season(season, 'media_pontos', orcamento=100.0)
+
+    assert len(escalacoes) == N_RODADAS
+    patrimonio = 100.0
+    for (orcamento, escalacao), linha in zip(escalacoes, result.itertuples()):
+        assert orcamento == pytest.approx(patrimonio)
+        # Sem escalação possível (poucos prováveis no mercado), o time não pontua e o patrimônio não muda
+        escalados = season['atletas'][escalacao['idx'].to_numpy()] if escalacao is not None else []
+        assert len(escalados) == linha.escalados in (0, 12)
+        rodada = df[(df['rodada_id'] == linha.rodada_id) & df['atleta_id'].isin(escalados)]
+        assert len(rodada) == len(escalados)
+        assert linha.custo == pytest.approx((rodada['preco_num'] - rodada['variacao_num']).sum())
+        assert linha.custo <= patrimonio + 1e-9
+        assert linha.pontos == pytest.approx(rodada['pontos_num'].sum())
+        assert linha.patrimonio - patrimonio == pytest.approx(rodada['variacao_num'].sum())
+        patrimonio = linha.patrimonio
+    assert (result['escalados'] == 12).sum() >= N_RODADAS // 2
+    assert patrimonio != 100.0
@@ -0,0 +1,103 @@
+import importlib
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_season, write_round
+from src.config import (RAW_DATA_PATH, CONSOLIDATED_DATASET_PATH, VALIDATION_REPORT_FILE, QUARANTINE_PATH,
+                        ARROW_STORE_PATH)
+from src.validacao import load_report, season_checks
+
+limpeza = importlib.import_module('01_limpeza')
+verificacao = importlib.import_module('02_verificacao')
+
+def dataset_rounds():
+    df = pd.read_parquet(CONSOLIDATED_DATASET_PATH, columns=['ano', 'rodada_id', 'atleta_id'])
+    return df.astype({'ano': int, 'rodada_id': int})
+
+@pytest.fixture
+def season(data_dir):
+    """Temporada 2025 com 6 rodadas: a 2 fora da faixa, a 4 sem a coluna preco_num e a 3 em dois arquivos."""
+    rodadas = make_season(np.random.default_rng(3), n_atletas=20, n_rodadas=6)
+    for r, atletas in enumerate(rodadas, start=1):
+        write_round(RAW_DATA_PATH, 2025, r, atletas)
+    fora = rodadas[1].copy()
+    fora.loc[0, 'pontos_num'] = 100.0
+    write_round(RAW_DATA_PATH, 2025, 2, fora)
+    path = os.path.join(RAW_DATA_PATH, '2025', 'rodada-4.csv')
+    pd.read_csv(path).drop(columns='atletas.preco_num').to_csv(path, index=False)
+    write_round(RAW_DATA_PATH, 2025, 3, rodadas[2].head(5), name='rodada-3-parcial.csv')
+    return rodadas
+
+def test_arquivos_invalidos_vao_para_a_quarentena(season):
+    assert limpeza.run(anos='todos')
+
+    report = load_report(VALIDATION_REPORT_FILE)
+    arquivos = {os.path.basename(rel): resultado for rel, resultado in report['arquivos'].items()}
+    assert arquivos['rodada-2.csv']['status'] == 'quarentena'
+    assert [p['regra'] for p in arquivos['rodada-2.csv']['problemas'] if p['severidade'] == 'erro'] == ['fora_da_faixa']
+    assert 'pontos_num' in arquivos['rodada-2.csv']['problemas'][0]['colunas']
+    assert arquivos['rodada-4.csv']['status'] == 'quarentena'
+    ausentes = [p for p in arquivos['rodada-4.csv']['problemas'] if p['regra'] == 'colunas_ausentes']
+    assert ausentes[0]['colunas'] == ['preco_num']
+    assert report['resumo']['quarentena'] == 2
+    assert report['resumo']['ok'] + report['resumo']['aviso'] == 5
+
+    # Fora do dataset, guardados na quarentena para inspeção; as demais rodadas entram normalmente
+    df = dataset_rounds()
+    assert sorted(df['rodada_id'].unique()) == [1, 3, 5, 6]
+    assert os.path.exists(os.path.join(QUARANTINE_PATH, '2025', 'rodada-2.parquet'))
+    assert len(pd.read_parquet(os.path.join(QUARANTINE_PATH, '2025', 'rodada-2.parquet'))) == 20
+
+    # Corrigido o arquivo, a rodada sai da quarentena e entra no dataset
+    write_round(RAW_DATA_PATH, 2025, 2, season[1])
+    assert limpeza.run(anos='todos')
+    assert not os.path.exists(os.path.join(QUARANTINE_PATH, '2025', 'rodada-2.parquet'))
+    assert sorted(dataset_rounds()['rodada_id'].unique()) == [1, 2, 3, 5, 6]
+    assert load_report(VALIDATION_REPORT_FILE)['resumo']['quarentena'] == 1
+
+def test_verificacoes_por_temporada(season):
+    assert limpeza.run(anos='todos')
+    temporada = load_report(VALIDATION_REPORT_FILE)['temporadas']['2025']
+    assert temporada['rodadas_faltando'] == [2, 4]
+    assert temporada['ultima_rodada'] == 6 and temporada['em_andamento']
+    assert temporada['rodadas_em_varios_arquivos'] == [3]
+    assert temporada['linhas_duplicadas'] == {'3': 5}
+
+def test_season_checks_ignora_a_quarentena():
+    arquivos = {
+        'raw/2024/rodada-1.csv': {'validacao': {'status': 'ok', 'rodadas': [1]}},
+        'raw/2024/rodada-3.csv': {'validacao': {'status': 'aviso', 'rodadas': [3]}},
+        'raw/2024/rodada-2.csv': {'validacao': {'status': 'quarentena', 'rodadas': [2]}},
+        'raw/2023/todas.csv': {'validacao': {'status': 'ok', 'rodadas': list(range(1, 39))}},
+    }
+    temporadas = season_checks(arquivos, dataset_path='/nao/existe')
+    assert temporadas['2024']['rodadas_faltando'] == [2]
+    assert temporadas['2024']['rodadas'] == 2 and temporadas['2024']['em_andamento']
+    assert temporadas['2023']['rodadas_faltando'] == [] and not temporadas['2023']['em_andamento']
+    assert temporadas['2023']['rodadas_em_varios_arquivos'] == []
+
+def test_verificacao_so_le_o_relatorio(season, monkeypatch, capsys):
+    assert verificacao.INPUTS == [VALIDATION_REPORT_FILE]
+    assert limpeza.run(anos='todos')
+    capsys.readouterr()
+
+    # Sem o dataset: a etapa 02 não o lê
+    shutil.rmtree(CONSOLIDATED_DATASET_PATH)
+    shutil.rmtree(ARROW_STORE_PATH, ignore_errors=True)
+
+    def no_read(*args, **kwargs):
+        raise AssertionError("a etapa 02 não deve ler dados")
+
+    monkeypatch.setattr(pd, 'read_parquet', no_read)
+    monkeypatch.setattr('pyarrow.parquet.read_table', no_read)
+    assert verificacao.run()
+    out = capsys.readouterr().out
+    assert 'QUARENTENA' in out and 'rodada-2.csv' in out and 'rodada-4.csv' in out
+    assert 'rodadas faltando [2, 4]' in out and 'rodadas em mais de um arquivo [3] (5 linhas repetidas)' in out
+
+    os.remove(VALIDATION_REPORT_FILE)
+    assert not verificacao.run()